@@ -0,0 +1,6 @@
+"""
+Scripts de mesure de performance du projet.
+
+Chaque script se lance depuis la racine du dépôt, par exemple :
+``python -m benchmarks.bench_indexes``.
+"""
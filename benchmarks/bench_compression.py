@@ -0,0 +1,81 @@
+"""
+Compromis CPU / octets de la compression des réponses, par codage et niveau.
+
+Le script remplit une base SQLite temporaire (preset de benchmarks.datagen),
+récupère sans compression une page de la liste des articles (JSON) et l'export
+complet en flux (NDJSON), puis mesure pour chaque codage disponible
+(src/compression.py : gzip, et br ou zstd si leur module est installé) et chaque
+niveau : taille compressée, ratio, durée médiane de compression et débit. Les
+niveaux par défaut de COMPRESS_LEVELS sont marqués d'un astérisque.
+
+    python -m benchmarks.bench_compression --preset tiny --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.datagen import PRESETS
+from benchmarks.loadgen import local_app
+from src.compression import CODECS
+
+# Niveaux mesurés par codage, du plus rapide au plus compact
+LEVELS = {
+    "gzip": (1, 3, 6, 9),
+    "br": (0, 2, 4, 6, 9, 11),
+    "zstd": (1, 3, 6, 12, 19),
+}
+
+PAYLOADS = {
+    "liste JSON": "/articles?limit=200",
+    "flux NDJSON": "/articles?stream=1",
+}
+
+
+def measure(name: str, level: int, data: bytes, repeat: int) -> tuple:
+    """Retourne (taille compressée, durée médiane en secondes)."""
+    compress = CODECS[name].compress
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(compress(data, level))
+        durations.append(time.perf_counter() - start)
+    return size, statistics.median(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=PRESETS, default="tiny")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = local_app(args.preset)
+    client = app.test_client()
+    missing = sorted(set(LEVELS) - set(CODECS))
+    if missing:
+        print(f"Codage(s) non installé(s) : {', '.join(missing)}")
+
+    for label, url in PAYLOADS.items():
+        data = client.get(url).data
+        print(f"\n-- {label} ({url}) : {len(data)} octets")
+        print(
+            f"{'codage':<10} {'niveau':>7} {'octets':>10} {'ratio':>7} "
+            f"{'ms':>8} {'Mo/s':>8}"
+        )
+        for name, codec in CODECS.items():
+            for level in LEVELS[name]:
+                size, seconds = measure(name, level, data, args.repeat)
+                mark = "*" if level == codec.level else " "
+                print(
+                    f"{name:<10} {level:>6}{mark} {size:>10} "
+                    f"{len(data) / size:>6.1f}x {seconds * 1000:>8.2f} "
+                    f"{len(data) / seconds / 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
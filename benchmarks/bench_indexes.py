@@ -0,0 +1,140 @@
+"""
+Mesure avant/après des index sur les clés étrangères et les dates.
+
+Le script remplit une base (SQLite temporaire par défaut, ou BENCH_DATABASE_URL),
+chronomètre une série de requêtes représentatives sans les index de la révision
+0002, puis avec, et affiche les durées médianes et le plan d'exécution.
+
+    python -m benchmarks.bench_indexes --articles 20000 --commentaires 200000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.datagen import generate
+from src.models import Article, Commentaire
+
+# Requêtes représentatives : (libellé, table de :id, SQL). :id est tiré au hasard
+# parmi les identifiants de la table indiquée à chaque essai.
+QUERIES = [
+    (
+        "commentaires d'un article (par date)",
+        "articles",
+        "SELECT * FROM commentaires WHERE article_id = :id "
+        "ORDER BY date_commentaire DESC LIMIT 20",
+    ),
+    (
+        "cascade article -> commentaires",
+        "articles",
+        "SELECT id FROM commentaires WHERE article_id = :id",
+    ),
+    (
+        "cascade utilisateur -> articles",
+        "utilisateurs",
+        "SELECT id FROM articles WHERE auteur_id = :id",
+    ),
+    (
+        "cascade utilisateur -> commentaires",
+        "utilisateurs",
+        "SELECT id FROM commentaires WHERE auteur_id = :id",
+    ),
+    (
+        "articles d'une catégorie (par date)",
+        "categories",
+        "SELECT * FROM articles WHERE categorie_id = :id "
+        "ORDER BY date_publication DESC LIMIT 20",
+    ),
+]
+
+
+def drop_indexes(engine):
+    """Supprime les index de la révision 0002 (état « avant »)."""
+    with engine.begin() as conn:
+        for table in (Article.__table__, Commentaire.__table__):
+            for index in table.indexes:
+                index.drop(conn, checkfirst=True)
+
+
+def create_indexes(engine):
+    """Crée les index déclarés sur les modèles (état « après »)."""
+    with engine.begin() as conn:
+        for table in (Article.__table__, Commentaire.__table__):
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+
+def measure(engine, sql, max_id, repeat):
+    """Retourne la durée médiane (ms) de sql sur repeat identifiants aléatoires."""
+    rnd = random.Random(7)
+    durations = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), {"id": rnd.randint(1, max_id)}).fetchall()
+            durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def plan(engine, sql):
+    """Retourne le plan d'exécution de sql sur une ligne."""
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + sql), {"id": 1}).fetchall()
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--utilisateurs", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--commentaires", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_indexes.db")
+        url = f"sqlite:///{path}"
+    engine = create_engine(url)
+
+    print(f"Remplissage de {url} ...")
+    generate(
+        engine, args.utilisateurs, args.categories, args.articles, args.commentaires
+    )
+    max_ids = {
+        "utilisateurs": args.utilisateurs,
+        "categories": args.categories,
+        "articles": args.articles,
+    }
+
+    results = {}
+    for label, prepare in (("avant", drop_indexes), ("après", create_indexes)):
+        prepare(engine)
+        for name, table, sql in QUERIES:
+            results.setdefault(name, {})[label] = (
+                measure(engine, sql, max_ids[table], args.repeat),
+                plan(engine, sql),
+            )
+
+    print(f"\n{'requête':<40} {'avant (ms)':>12} {'après (ms)':>12} {'gain':>8}")
+    for name, res in results.items():
+        before, after = res["avant"][0], res["après"][0]
+        print(f"{name:<40} {before:>12.3f} {after:>12.3f} {before / after:>7.1f}x")
+    print("\nPlans d'exécution :")
+    for name, res in results.items():
+        print(f"- {name}\n    avant : {res['avant'][1]}\n    après : {res['après'][1]}")
+
+
+if __name__ == "__main__":
+    main()
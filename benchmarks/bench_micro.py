@@ -0,0 +1,112 @@
+"""
+Micro-mesures avec pytest-benchmark : sérialisation, requêtes de liste,
+création et mise à jour.
+
+La base (SQLite temporaire) est remplie par benchmarks.datagen selon
+BENCH_PRESET (``tiny`` par défaut). pytest-benchmark conserve les résultats en
+JSON et les compare à une exécution de référence :
+
+    pip install pytest-benchmark
+    pytest benchmarks/bench_micro.py --benchmark-autosave
+    pytest benchmarks/bench_micro.py --benchmark-compare \\
+        --benchmark-compare-fail=median:10%
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import select
+
+from benchmarks.datagen import PRESETS, generate
+from src.app import create_app
+from src.config import Config
+from src.filtering import Partial
+from src.models import Article, db
+from src.routes.articles import ARTICLE_QUERY
+
+ROWS = 1000
+
+
+@pytest.fixture(scope="module")
+def app():
+    tmpdir = tempfile.mkdtemp()
+    config = Config()
+    config.SQLALCHEMY_DATABASE_URI = (
+        f"sqlite:///{os.path.join(tmpdir, 'bench_micro.db')}"
+    )
+    config.SERVER_TIMING = False
+    # Un seul client enchaîne des milliers de requêtes
+    config.RATELIMIT_TYPE = "null"
+    app = create_app(config)
+    with app.app_context():
+        generate(db.engine, *PRESETS[os.getenv("BENCH_PRESET", "tiny")])
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_article_to_dict(benchmark, app):
+    with app.app_context():
+        articles = db.session.scalars(select(Article).limit(ROWS)).all()
+        benchmark(lambda: [article.to_dict() for article in articles])
+
+
+def test_article_rows_to_json(benchmark, app):
+    fields = ARTICLE_QUERY.fields
+    columns = [getattr(Article, name) for name in ["id", "version", *fields]]
+    with app.app_context():
+        rows = db.session.execute(select(*columns).limit(ROWS)).all()
+        benchmark(
+            lambda: app.json.dumpb(
+                [Partial(row, "articles", fields).to_dict() for row in rows]
+            )
+        )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/articles?limit=50",
+        "/articles?limit=50&categorie_id=1&sort=-date_publication",
+        "/articles?limit=200&fields=id,titre",
+        "/commentaires?limit=50",
+        "/articles/1?include=commentaires,categorie,utilisateur",
+    ],
+)
+def test_get(benchmark, client, url):
+    response = benchmark(client.get, url)
+    assert response.status_code == 200
+
+
+def test_create_commentaire(benchmark, client):
+    payload = {"contenu": "micro-mesure", "article_id": 1, "auteur_id": 1}
+    response = benchmark(client.post, "/commentaires", json=payload)
+    assert response.status_code == 201
+
+
+def test_create_article(benchmark, client):
+    payload = {
+        "titre": "Micro-mesure",
+        "contenu": "Contenu",
+        "categorie_id": 1,
+        "auteur_id": 1,
+    }
+    response = benchmark(client.post, "/articles", json=payload)
+    assert response.status_code == 201
+
+
+def test_update_article(benchmark, client):
+    payload = {"titre": "Micro-mesure", "categorie_id": 1, "auteur_id": 1}
+    response = benchmark(client.put, "/articles/1", json=payload)
+    assert response.status_code == 200
@@ -0,0 +1,115 @@
+"""
+Débit de sérialisation des listes : entités + to_dict() contre lignes de colonnes.
+
+Le script remplit une base (SQLite temporaire par défaut, ou BENCH_DATABASE_URL)
+puis mesure, pour les articles et les commentaires, le nombre de lignes lues et
+encodées en JSON par seconde selon trois chemins :
+
+- entités : objets ORM, to_dict() puis json de la bibliothèque standard (chemin
+  d'origine de Flask) ;
+- colonnes + json : lignes de colonnes encodées par le module json ;
+- colonnes + orjson : lignes de colonnes encodées par orjson (src/serialization.py).
+
+    python -m benchmarks.bench_serialization --articles 20000 --commentaires 100000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from benchmarks.datagen import generate
+from src.models import Article, Commentaire
+from src.routes.articles import ARTICLE_QUERY
+from src.routes.commentaires import COMMENTAIRE_QUERY
+from src.serialization import FastJSONProvider
+
+RESOURCES = [
+    ("articles", Article, ARTICLE_QUERY),
+    ("commentaires", Commentaire, COMMENTAIRE_QUERY),
+]
+
+
+def entity_path(engine, model, limit):
+    """Chemin d'origine : entités ORM, to_dict() et json (réglages de Flask)."""
+    with Session(engine) as session:
+        objs = session.scalars(select(model).limit(limit)).all()
+        items = [obj.to_dict() for obj in objs]
+    return json.dumps({"items": items}, sort_keys=True, separators=(",", ":")).encode()
+
+
+def column_path(provider, engine, model, query, limit):
+    """Lignes de colonnes, encodées directement par le fournisseur JSON."""
+    columns = [getattr(model, name) for name in ["id", "version", *query.fields]]
+    with engine.connect() as conn:
+        rows = conn.execute(select(*columns).limit(limit))
+        items = [{name: row._mapping[name] for name in query.fields} for row in rows]
+    return provider.dumpb({"items": items})
+
+
+def measure(fn, rows, repeat):
+    """Retourne le débit médian (lignes par seconde) de fn()."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return rows / statistics.median(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--utilisateurs", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--commentaires", type=int, default=100000)
+    parser.add_argument(
+        "--rows", type=int, default=10000, help="lignes lues et encodées par essai"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+        url = f"sqlite:///{path}"
+    engine = create_engine(url)
+
+    print(f"Remplissage de {url} ...")
+    generate(
+        engine, args.utilisateurs, args.categories, args.articles, args.commentaires
+    )
+    app = Flask(__name__)
+    stdlib = FastJSONProvider(app)
+    stdlib.use_orjson = False
+    providers = [("colonnes + json", stdlib)]
+    if FastJSONProvider.use_orjson:
+        providers.append(("colonnes + orjson", FastJSONProvider(app)))
+
+    print(f"\n{'chemin':<30} {'lignes/s':>12} {'gain':>8}")
+    for name, model, query in RESOURCES:
+        total = args.articles if model is Article else args.commentaires
+        rows = min(args.rows, total)
+        baseline = measure(lambda: entity_path(engine, model, rows), rows, args.repeat)
+        print(f"-- {name} ({rows} lignes)")
+        print(f"{'entités':<30} {baseline:>12.0f} {1:>7.1f}x")
+        for label, provider in providers:
+            rate = measure(
+                lambda: column_path(provider, engine, model, query, rows),
+                rows,
+                args.repeat,
+            )
+            print(f"{label:<30} {rate:>12.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Temps de démarrage : import de src.app et construction de l'application.
+
+Chaque scénario s'exécute dans un nouvel interpréteur lancé avec
+``python -X importtime``. Le script rapporte la durée du scénario (médiane de
+--repeat exécutions), la part des imports et les modules les plus coûteux. Il
+échoue si un scénario dépasse son budget (BUDGETS, ou --budget-ms) ou charge un
+module qui doit rester différé (DEFERRED).
+
+    python -m benchmarks.bench_startup --repeat 5
+    python -m benchmarks.bench_startup --budget-ms 1500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Code mesuré par scénario ; la durée est affichée par le processus lui-même.
+SCENARIOS = {
+    "import src.app": "import src.app",
+    "create_app()": "from src.app import create_app; create_app('testing')",
+}
+
+# Durée maximale de chaque scénario (ms), avec une marge pour les machines lentes
+BUDGETS = {"import src.app": 1500, "create_app()": 2000}
+
+# Modules chargés seulement à la demande : migrations (flask db) et pilotes des
+# bases non utilisées
+DEFERRED = ("flask_migrate", "alembic", "psycopg2", "asyncpg")
+
+TIMED = """
+import time
+start = time.perf_counter()
+{code}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    Retourne {module: durée cumulée (ms)} d'après la sortie de -X importtime ; la
+    clé "total" additionne les imports de premier niveau.
+    """
+    modules = {}
+    total = 0.0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # ligne d'en-tête
+        ms = int(cumulative) / 1000
+        indent = len(name) - len(name.lstrip())
+        name = name.strip()
+        modules[name] = ms
+        if indent == 1:
+            total += ms
+    modules["total"] = total
+    return modules
+
+
+def run_once(code: str) -> tuple:
+    """Exécute code dans un nouvel interpréteur ; retourne (durée ms, modules)."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TIMED.format(code=code)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(
+        result.stderr
+    )
+
+
+def measure(code: str, repeat: int = 3) -> dict:
+    """
+    Mesure code sur repeat exécutions : durées et imports médians (ms), et modules
+    chargés lors de la dernière exécution.
+    """
+    durations, imports = [], []
+    for _ in range(repeat):
+        duration, modules = run_once(code)
+        durations.append(duration)
+        imports.append(modules["total"])
+    return {
+        "duration": statistics.median(durations),
+        "imports": statistics.median(imports),
+        "modules": modules,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="modules les plus lents")
+    parser.add_argument(
+        "--budget-ms", type=float, help="budget commun à tous les scénarios"
+    )
+    args = parser.parse_args(argv)
+
+    failures = []
+    for name, code in SCENARIOS.items():
+        result = measure(code, args.repeat)
+        budget = args.budget_ms or BUDGETS[name]
+        print(
+            f"-- {name} : {result['duration']:.0f} ms "
+            f"(imports {result['imports']:.0f} ms, budget {budget:.0f} ms)"
+        )
+        modules = {k: v for k, v in result["modules"].items() if k != "total"}
+        for module, ms in sorted(modules.items(), key=lambda m: -m[1])[: args.top]:
+            print(f"   {module:<40} {ms:>8.1f} ms")
+        if result["duration"] > budget:
+            failures.append(f"{name} : {result['duration']:.0f} ms > {budget:.0f} ms")
+        loaded = sorted(set(DEFERRED) & set(modules))
+        if loaded:
+            failures.append(f"{name} : modules chargés trop tôt {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"Régression : {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
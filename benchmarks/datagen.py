@@ -0,0 +1,173 @@
+"""
+Générateur de données synthétiques pour les mesures de performance.
+
+Remplit une base par insertions groupées (executemany), par lots de ``--chunk``
+lignes produits à la demande : la mémoire reste constante, même pour des
+millions de lignes. Les données sont reproductibles (graine fixe), les dates
+réparties sur deux ans et les compteurs (nb_commentaires, nb_articles) recalculés
+à la fin.
+
+    python -m benchmarks.datagen --preset large
+    python -m benchmarks.datagen --utilisateurs 10000 --articles 1000000 \\
+        --commentaires 10000000
+
+La base est celle de BENCH_DATABASE_URL, ou un fichier SQLite temporaire.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert
+
+from src import counters
+from src.models import Article, Categorie, Commentaire, Utilisateur, db
+
+# Volumes prédéfinis : (utilisateurs, catégories, articles, commentaires)
+PRESETS = {
+    "tiny": (100, 10, 1_000, 5_000),
+    "small": (1_000, 50, 20_000, 200_000),
+    "medium": (5_000, 100, 200_000, 2_000_000),
+    "large": (10_000, 200, 1_000_000, 10_000_000),
+}
+DEFAULT_CHUNK = 10_000
+
+WORDS = (
+    "base données index requête cache réplica pool curseur page flux article "
+    "commentaire catégorie auteur performance latence débit mémoire disque "
+    "transaction verrou version compteur recherche texte python flask"
+).split()
+
+# Dates réparties sur les deux années précédant cette date
+EPOCH = datetime(2026, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+
+def _text(rnd, words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+
+def _date(rnd) -> datetime:
+    return EPOCH - timedelta(seconds=rnd.randrange(SPAN_SECONDS))
+
+
+def _rows(make_row, count: int, chunk: int):
+    """Produit les lignes 0..count-1 par lots de chunk dictionnaires."""
+    for start in range(0, count, chunk):
+        yield [make_row(i) for i in range(start, min(start + chunk, count))]
+
+
+def generate(
+    engine,
+    utilisateurs: int,
+    categories: int,
+    articles: int,
+    commentaires: int,
+    chunk: int = DEFAULT_CHUNK,
+    seed: int = 42,
+    progress=None,
+) -> None:
+    """
+    Recrée le schéma sur engine et le remplit des volumes demandés.
+
+    progress(table, lignes insérées) est appelé après chaque lot.
+    """
+    rnd = random.Random(seed)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+
+    tables = [
+        (
+            Utilisateur.__table__,
+            utilisateurs,
+            lambda i: {"nom": f"user{i}", "email": f"user{i}@example.com"},
+        ),
+        (
+            Categorie.__table__,
+            categories,
+            lambda i: {"nom": f"cat{i}", "description": _text(rnd, 8)},
+        ),
+        (
+            Article.__table__,
+            articles,
+            lambda i: {
+                "titre": f"article {i} {_text(rnd, 4)}",
+                "contenu": _text(rnd, 60),
+                "date_publication": _date(rnd),
+                "categorie_id": rnd.randint(1, categories),
+                "auteur_id": rnd.randint(1, utilisateurs),
+            },
+        ),
+        (
+            Commentaire.__table__,
+            commentaires,
+            lambda i: {
+                "contenu": _text(rnd, 12),
+                "date_commentaire": _date(rnd),
+                "article_id": rnd.randint(1, articles),
+                "auteur_id": rnd.randint(1, utilisateurs),
+            },
+        ),
+    ]
+    for table, count, make_row in tables:
+        done = 0
+        for rows in _rows(make_row, count, chunk):
+            # Une transaction par lot : le journal de la base reste borné.
+            with engine.begin() as conn:
+                conn.execute(insert(table), rows)
+            done += len(rows)
+            if progress is not None:
+                progress(table.name, done)
+
+    with engine.begin() as conn:
+        counters.reconcile(conn)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--utilisateurs", type=int)
+    parser.add_argument("--categories", type=int)
+    parser.add_argument("--articles", type=int)
+    parser.add_argument("--commentaires", type=int)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    volumes = dict(
+        zip(
+            ("utilisateurs", "categories", "articles", "commentaires"),
+            PRESETS[args.preset],
+        )
+    )
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        url = f"sqlite:///{path}"
+    engine = create_engine(url)
+
+    print(f"Remplissage de {url} : {volumes}")
+    start = time.perf_counter()
+
+    def progress(table, done):
+        elapsed = time.perf_counter() - start
+        print(f"\r{table:<14} {done:>12} lignes  ({elapsed:.0f} s)", end="", flush=True)
+        if done == volumes[table]:
+            print()
+
+    generate(engine, **volumes, chunk=args.chunk, seed=args.seed, progress=progress)
+    print(f"Terminé en {time.perf_counter() - start:.1f} s : {url}")
+
+
+if __name__ == "__main__":
+    main()
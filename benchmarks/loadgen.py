@@ -0,0 +1,294 @@
+"""
+Générateur de charge en boucle fermée.
+
+``--users`` utilisateurs virtuels enchaînent des requêtes pendant ``--duration``
+secondes : chacun attend la réponse avant d'envoyer la suivante, choisie dans un
+mélange pondéré de scénarios (listes, détail avec relations, recherche,
+création de commentaires). La cible est l'application dans le processus (client
+de test Flask sur une base remplie par benchmarks.datagen) ou un serveur local
+(``--url``).
+
+Le rapport donne, au total et par scénario, le débit et les latences p50, p95 et
+p99. ``--save`` l'écrit en JSON (référence) ; ``--compare`` le confronte à une
+référence et échoue si le débit baisse ou si la latence p95 augmente de plus de
+``--tolerance``.
+
+    python -m benchmarks.loadgen --preset small --users 8 --save baseline.json
+    python -m benchmarks.loadgen --preset small --users 8 --compare baseline.json
+    python -m benchmarks.loadgen --url http://127.0.0.1:5000 --users 32
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.datagen import PRESETS, WORDS, generate
+
+# Scénarios : (nom, poids, fonction(rnd, ids) -> (méthode, chemin, corps JSON))
+SCENARIOS = [
+    ("liste articles", 30, lambda rnd, ids: ("GET", "/articles?limit=20", None)),
+    (
+        "articles d'une catégorie",
+        15,
+        lambda rnd, ids: (
+            "GET",
+            f"/articles?categorie_id={rnd.choice(ids['categories'])}&limit=20",
+            None,
+        ),
+    ),
+    (
+        "article et relations",
+        20,
+        lambda rnd, ids: (
+            "GET",
+            f"/articles/{rnd.choice(ids['articles'])}"
+            "?include=commentaires,categorie,utilisateur",
+            None,
+        ),
+    ),
+    (
+        "commentaires d'un article",
+        15,
+        lambda rnd, ids: (
+            "GET",
+            f"/articles/{rnd.choice(ids['articles'])}/commentaires",
+            None,
+        ),
+    ),
+    (
+        "recherche",
+        10,
+        lambda rnd, ids: ("GET", f"/articles/search?q={rnd.choice(WORDS)}", None),
+    ),
+    (
+        "création commentaire",
+        10,
+        lambda rnd, ids: (
+            "POST",
+            "/commentaires",
+            {
+                "contenu": "commentaire de charge",
+                "article_id": rnd.choice(ids["articles"]),
+                "auteur_id": rnd.choice(ids["utilisateurs"]),
+            },
+        ),
+    ),
+]
+
+
+class ClientTarget:
+    """Application dans le processus, un client de test Flask par thread."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method: str, path: str, body=None):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.get_data()
+
+
+class HttpTarget:
+    """Serveur HTTP joignable à l'adresse base_url."""
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method: str, path: str, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"} if data else {},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+def fetch_ids(target) -> dict:
+    """Identifiants utilisables par les scénarios (premières pages des listes)."""
+    ids = {}
+    for resource in ("articles", "categories", "utilisateurs"):
+        status, body = target.request("GET", f"/{resource}?fields=id&limit=200")
+        items = json.loads(body)["items"] if status == 200 else []
+        if not items:
+            raise SystemExit(f"Aucun élément dans /{resource} : remplir la base.")
+        ids[resource] = [item["id"] for item in items]
+    return ids
+
+
+def run(target, users: int, duration: float, seed: int = 1) -> tuple:
+    """
+    Exécute la charge ; retourne ({scénario: [latences en s]}, erreurs, durée).
+    """
+    ids = fetch_ids(target)
+    names = [name for name, _, _ in SCENARIOS]
+    weights = [weight for _, weight, _ in SCENARIOS]
+    builders = {name: build for name, _, build in SCENARIOS}
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(number):
+        rnd = random.Random(seed * 1000 + number)
+        while time.perf_counter() < deadline:
+            name = rnd.choices(names, weights)[0]
+            method, path, body = builders[name](rnd, ids)
+            start = time.perf_counter()
+            try:
+                status, _ = target.request(method, path, body)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                if status is None or status >= 500:
+                    errors[name] += 1
+                else:
+                    latencies[name].append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    """Débit (requêtes/s) et latences p50/p95/p99 (ms) d'une série."""
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+    }
+    if len(latencies) >= 2:
+        q = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = q[49], q[94], q[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    summary.update(p50=p50 * 1000, p95=p95 * 1000, p99=p99 * 1000)
+    return summary
+
+
+def build_report(latencies: dict, errors: dict, elapsed: float, config: dict) -> dict:
+    everything = [value for values in latencies.values() for value in values]
+    return {
+        "config": config,
+        "total": summarize(everything, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: summarize(values, errors[name], elapsed)
+            for name, values in latencies.items()
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Retourne les régressions de report par rapport à baseline."""
+    regressions = []
+    series = {"total": (report["total"], baseline["total"])}
+    for name, summary in report["scenarios"].items():
+        if name in baseline.get("scenarios", {}):
+            series[name] = (summary, baseline["scenarios"][name])
+    for name, (current, reference) in series.items():
+        if current["throughput"] < reference["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name} : débit {current['throughput']:.1f}/s "
+                f"(référence {reference['throughput']:.1f}/s)"
+            )
+        if current["p95"] > reference["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{name} : p95 {current['p95']:.1f} ms "
+                f"(référence {reference['p95']:.1f} ms)"
+            )
+    return regressions
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{'scénario':<28} {'requêtes':>9} {'erreurs':>8} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    rows = [*report["scenarios"].items(), ("total", report["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<28} {s['requests']:>9} {s['errors']:>8} {s['throughput']:>8.1f} "
+            f"{s['p50']:>8.2f} {s['p95']:>8.2f} {s['p99']:>8.2f}"
+        )
+
+
+def local_app(preset: str):
+    """Application dans le processus, sur une base SQLite remplie selon preset."""
+    from src.app import create_app
+    from src.config import Config
+    from src.models import db
+
+    path = os.path.join(tempfile.mkdtemp(), "loadgen.db")
+    config = Config()
+    config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    # Tous les utilisateurs simulés partagent une adresse : pas de quota par client
+    config.RATELIMIT_TYPE = "null"
+    app = create_app(config)
+    with app.app_context():
+        print(f"Remplissage de {path} ({preset}) ...")
+        generate(db.engine, *PRESETS[preset])
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="serveur cible (par défaut : dans le processus)")
+    parser.add_argument("--preset", choices=PRESETS, default="tiny")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--save", help="écrit le rapport JSON dans ce fichier")
+    parser.add_argument("--compare", help="rapport JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    target = HttpTarget(args.url) if args.url else ClientTarget(local_app(args.preset))
+    print(f"Charge : {args.users} utilisateurs pendant {args.duration:.0f} s ...")
+    latencies, errors, elapsed = run(target, args.users, args.duration)
+    config = {
+        "target": args.url or f"processus ({args.preset})",
+        "users": args.users,
+        "duration": args.duration,
+    }
+    report = build_report(latencies, errors, elapsed, config)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nRapport enregistré : {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRégressions :")
+            for line in regressions:
+                print(f"- {line}")
+            sys.exit(1)
+        print(f"\nAucune régression (tolérance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,12 @@ CREATE TABLE IF NOT EXISTS public.utilisateurs
 (
     id serial PRIMARY KEY,
     nom character varying(100) NOT NULL,
-    email character varying(150) NOT NULL UNIQUE
+    email character varying(150) NOT NULL UNIQUE,
+    nb_articles integer NOT NULL DEFAULT 0,
+    version integer NOT NULL DEFAULT 1,
+    date_modification timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
+    -- Suppression différée : ligne masquée en attendant sa purge
+    date_suppression timestamp with time zone
 );
 
 -- Table categories
@@ -13,7 +18,12 @@ CREATE TABLE IF NOT EXISTS public.categories
 (
     id serial PRIMARY KEY,
     nom character varying(100) NOT NULL UNIQUE,
-    description text
+    description text,
+    nb_articles integer NOT NULL DEFAULT 0,
+    version integer NOT NULL DEFAULT 1,
+    date_modification timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
+    -- Suppression différée : ligne masquée en attendant sa purge
+    date_suppression timestamp with time zone
 );
 
 -- Table articles
@@ -24,7 +34,15 @@ CREATE TABLE IF NOT EXISTS public.articles
     contenu text,
     date_publication timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
     categorie_id integer NOT NULL,
-    auteur_id integer NOT NULL
+    auteur_id integer NOT NULL,
+    nb_commentaires integer NOT NULL DEFAULT 0,
+    version integer NOT NULL DEFAULT 1,
+    date_modification timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
+    -- Recherche plein texte : titre (poids A) et contenu (poids B)
+    recherche tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(titre, '')), 'A')
+        || setweight(to_tsvector('french', coalesce(contenu, '')), 'B')
+    ) STORED
 );
 
 -- Table commentaires
@@ -34,22 +52,38 @@ CREATE TABLE IF NOT EXISTS public.commentaires
     contenu text NOT NULL,
     date_commentaire timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
     article_id integer NOT NULL,
-    auteur_id integer NOT NULL
+    auteur_id integer NOT NULL,
+    version integer NOT NULL DEFAULT 1,
+    date_modification timestamp with time zone DEFAULT CURRENT_TIMESTAMP
 );
 
--- Contraintes de clés étrangères
+-- Table taches (tâches de fond : suppressions différées)
+CREATE TABLE IF NOT EXISTS public.taches
+(
+    id serial PRIMARY KEY,
+    operation character varying(50) NOT NULL,
+    cible character varying(50) NOT NULL,
+    cible_id integer NOT NULL,
+    statut character varying(20) NOT NULL DEFAULT 'en_attente',
+    lignes integer NOT NULL DEFAULT 0,
+    erreur text,
+    date_creation timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
+    date_fin timestamp with time zone
+);
+
+-- Contraintes de clés étrangères : les dépendants sont supprimés par la base
 
 ALTER TABLE IF EXISTS public.articles
     ADD CONSTRAINT fk_articles_categories FOREIGN KEY (categorie_id)
     REFERENCES public.categories (id)
     ON UPDATE CASCADE
-    ON DELETE RESTRICT;
+    ON DELETE CASCADE;
 
 ALTER TABLE IF EXISTS public.articles
     ADD CONSTRAINT fk_articles_utilisateurs FOREIGN KEY (auteur_id)
     REFERENCES public.utilisateurs (id)
     ON UPDATE CASCADE
-    ON DELETE RESTRICT;
+    ON DELETE CASCADE;
 
 ALTER TABLE IF EXISTS public.commentaires
     ADD CONSTRAINT fk_commentaires_articles FOREIGN KEY (article_id)
@@ -61,6 +95,81 @@ ALTER TABLE IF EXISTS public.commentaires
     ADD CONSTRAINT fk_commentaires_utilisateurs FOREIGN KEY (auteur_id)
     REFERENCES public.utilisateurs (id)
     ON UPDATE CASCADE
-    ON DELETE RESTRICT;
+    ON DELETE CASCADE;
+
+-- Index sur les clés étrangères et les dates (suppressions en cascade,
+-- commentaires d'un article, listes paginées par date)
+
+CREATE INDEX IF NOT EXISTS ix_articles_date_publication_id
+    ON public.articles (date_publication, id);
+
+CREATE INDEX IF NOT EXISTS ix_articles_categorie_id_date_publication
+    ON public.articles (categorie_id, date_publication);
+
+CREATE INDEX IF NOT EXISTS ix_articles_auteur_id_date_publication
+    ON public.articles (auteur_id, date_publication);
+
+CREATE INDEX IF NOT EXISTS ix_commentaires_date_commentaire_id
+    ON public.commentaires (date_commentaire, id);
+
+CREATE INDEX IF NOT EXISTS ix_commentaires_article_id_date_commentaire
+    ON public.commentaires (article_id, date_commentaire);
+
+CREATE INDEX IF NOT EXISTS ix_commentaires_auteur_id
+    ON public.commentaires (auteur_id);
+
+-- Index GIN de la recherche plein texte (GET /articles/search)
+CREATE INDEX IF NOT EXISTS ix_articles_recherche
+    ON public.articles USING GIN (recherche);
+
+-- Statistiques agrégées (GET /stats/...), rafraîchies par l'application
+-- (REFRESH MATERIALIZED VIEW CONCURRENTLY, voir src/stats.py)
+
+CREATE TABLE IF NOT EXISTS public.stats_rafraichissements
+(
+    vue character varying(50) NOT NULL,
+    date_rafraichissement timestamp with time zone,
+    duree_ms integer,
+    CONSTRAINT stats_rafraichissements_pkey PRIMARY KEY (vue)
+);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.stats_categories AS
+    SELECT c.id AS categorie_id,
+           COUNT(a.id) AS nb_articles,
+           COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires,
+           MAX(a.date_publication) AS derniere_publication
+    FROM public.categories c LEFT JOIN public.articles a ON a.categorie_id = c.id
+    GROUP BY c.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_stats_categories
+    ON public.stats_categories (categorie_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.stats_utilisateurs AS
+    SELECT u.id AS utilisateur_id,
+           COUNT(a.id) AS nb_articles,
+           COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires_recus
+    FROM public.utilisateurs u LEFT JOIN public.articles a ON a.auteur_id = u.id
+    GROUP BY u.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_stats_utilisateurs
+    ON public.stats_utilisateurs (utilisateur_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.stats_activite AS
+    SELECT utilisateur_id, mois,
+           SUM(nb_articles) AS nb_articles,
+           SUM(nb_commentaires) AS nb_commentaires
+    FROM (
+        SELECT auteur_id AS utilisateur_id,
+               to_char(date_publication, 'YYYY-MM') AS mois,
+               1 AS nb_articles, 0 AS nb_commentaires
+        FROM public.articles WHERE date_publication IS NOT NULL
+        UNION ALL
+        SELECT auteur_id, to_char(date_commentaire, 'YYYY-MM'), 0, 1
+        FROM public.commentaires WHERE date_commentaire IS NOT NULL
+    ) activite
+    GROUP BY utilisateur_id, mois;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_stats_activite
+    ON public.stats_activite (utilisateur_id, mois);
 
 COMMIT;
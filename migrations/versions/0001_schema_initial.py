@@ -0,0 +1,103 @@
+"""schema initial
+
+Création des quatre tables du blog, identique à docs/script_sql.sql.
+Une base créée par ce script ou par src/create_db.py se marque avec
+``flask db stamp 0001`` avant d'appliquer les révisions suivantes.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 01:00:41.583228
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "utilisateurs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("nom", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=150), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("nom", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("nom"),
+    )
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("titre", sa.String(length=255), nullable=False),
+        sa.Column("contenu", sa.Text(), nullable=True),
+        sa.Column(
+            "date_publication",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("categorie_id", sa.Integer(), nullable=False),
+        sa.Column("auteur_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["categorie_id"],
+            ["categories.id"],
+            name="fk_articles_categories",
+            onupdate="CASCADE",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["auteur_id"],
+            ["utilisateurs.id"],
+            name="fk_articles_utilisateurs",
+            onupdate="CASCADE",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "commentaires",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("contenu", sa.Text(), nullable=False),
+        sa.Column(
+            "date_commentaire",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("auteur_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name="fk_commentaires_articles",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["auteur_id"],
+            ["utilisateurs.id"],
+            name="fk_commentaires_utilisateurs",
+            onupdate="CASCADE",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("commentaires")
+    op.drop_table("articles")
+    op.drop_table("categories")
+    op.drop_table("utilisateurs")
@@ -0,0 +1,46 @@
+"""index sur les clés étrangères et les dates
+
+Sans ces index, chaque suppression en cascade et chaque recherche des
+commentaires d'un article parcourt toute la table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 01:10:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_articles_date_publication_id", "articles", ["date_publication", "id"]),
+    (
+        "ix_articles_categorie_id_date_publication",
+        "articles",
+        ["categorie_id", "date_publication"],
+    ),
+    ("ix_articles_auteur_id", "articles", ["auteur_id"]),
+    ("ix_commentaires_date_commentaire_id", "commentaires", ["date_commentaire", "id"]),
+    (
+        "ix_commentaires_article_id_date_commentaire",
+        "commentaires",
+        ["article_id", "date_commentaire"],
+    ),
+    ("ix_commentaires_auteur_id", "commentaires", ["auteur_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,32 @@
+"""index (auteur_id, date_publication) sur articles
+
+Remplace ix_articles_auteur_id : la route /utilisateurs/<id>/articles trie
+les articles d'un auteur par date, ce que l'index composite couvre aussi.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 01:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_articles_auteur_id_date_publication",
+        "articles",
+        ["auteur_id", "date_publication"],
+    )
+    op.drop_index("ix_articles_auteur_id", table_name="articles")
+
+
+def downgrade():
+    op.create_index("ix_articles_auteur_id", "articles", ["auteur_id"])
+    op.drop_index("ix_articles_auteur_id_date_publication", table_name="articles")
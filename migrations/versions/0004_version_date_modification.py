@@ -0,0 +1,47 @@
+"""colonnes version et date_modification
+
+Base des ETag / Last-Modified et du verrouillage optimiste (If-Match) : la
+version est incrémentée par SQLAlchemy à chaque UPDATE.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLES = ["utilisateurs", "categories", "articles", "commentaires"]
+
+
+def upgrade():
+    # SQLite refuse ADD COLUMN avec une valeur par défaut non constante :
+    # la table y est alors reconstruite (mode batch).
+    recreate = "always" if op.get_bind().dialect.name == "sqlite" else "auto"
+    for table in TABLES:
+        with op.batch_alter_table(table, recreate=recreate) as batch:
+            batch.add_column(
+                sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+            )
+            batch.add_column(
+                sa.Column(
+                    "date_modification",
+                    sa.TIMESTAMP(timezone=True),
+                    server_default=sa.func.now(),
+                    nullable=True,
+                )
+            )
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("date_modification")
+            batch.drop_column("version")
@@ -0,0 +1,81 @@
+"""recherche plein texte sur les articles
+
+PostgreSQL : colonne tsvector générée ``recherche`` et index GIN.
+SQLite : table virtuelle FTS5 ``articles_fts`` et triggers de synchronisation,
+remplie à partir des articles existants.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+POSTGRESQL = [
+    """
+    ALTER TABLE articles ADD COLUMN recherche tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(titre, '')), 'A')
+        || setweight(to_tsvector('french', coalesce(contenu, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_articles_recherche ON articles USING GIN (recherche)",
+]
+
+SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        titre, contenu, content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF titre, contenu
+    ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRESQL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in SQLITE:
+            op.execute(statement)
+        op.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_articles_recherche", table_name="articles")
+        op.drop_column("articles", "recherche")
+    elif dialect == "sqlite":
+        for trigger in ("articles_fts_au", "articles_fts_ad", "articles_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS articles_fts")
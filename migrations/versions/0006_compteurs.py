@@ -0,0 +1,46 @@
+"""compteurs dénormalisés
+
+Articles.nb_commentaires, categories.nb_articles et utilisateurs.nb_articles,
+initialisés à partir des données existantes (voir src/counters.py).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# (table, colonne, table enfant, clé étrangère)
+COUNTERS = [
+    ("articles", "nb_commentaires", "commentaires", "article_id"),
+    ("categories", "nb_articles", "articles", "categorie_id"),
+    ("utilisateurs", "nb_articles", "articles", "auteur_id"),
+]
+
+
+def upgrade():
+    # Valeur par défaut constante : ADD COLUMN suffit, y compris sous SQLite.
+    for table, column, child, foreign_key in COUNTERS:
+        op.add_column(
+            table,
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.execute(
+            f"UPDATE {table} SET {column} = "
+            f"(SELECT count(*) FROM {child} WHERE {child}.{foreign_key} = {table}.id)"
+        )
+
+
+def downgrade():
+    # DROP COLUMN natif (SQLite >= 3.35) : une reconstruction de la table
+    # articles supprimerait les triggers de la recherche plein texte.
+    for table, column, _, _ in reversed(COUNTERS):
+        op.drop_column(table, column)
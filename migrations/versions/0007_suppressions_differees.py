@@ -0,0 +1,49 @@
+"""suppressions différées
+
+Colonne date_suppression des utilisateurs et des catégories, table taches des
+tâches de fond (voir src/jobs.py).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 05:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TABLES = ["utilisateurs", "categories"]
+
+
+def upgrade():
+    # Colonne nullable sans valeur par défaut : ADD COLUMN suffit sous SQLite.
+    for table in TABLES:
+        op.add_column(table, sa.Column("date_suppression", sa.TIMESTAMP(timezone=True)))
+    op.create_table(
+        "taches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("operation", sa.String(length=50), nullable=False),
+        sa.Column("cible", sa.String(length=50), nullable=False),
+        sa.Column("cible_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "statut", sa.String(length=20), nullable=False, server_default="en_attente"
+        ),
+        sa.Column("lignes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("erreur", sa.Text()),
+        sa.Column(
+            "date_creation", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column("date_fin", sa.TIMESTAMP(timezone=True)),
+    )
+
+
+def downgrade():
+    op.drop_table("taches")
+    for table in reversed(TABLES):
+        op.drop_column(table, "date_suppression")
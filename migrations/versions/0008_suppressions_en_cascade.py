@@ -0,0 +1,112 @@
+"""suppressions en cascade par la base
+
+Toutes les clés étrangères passent en ON DELETE CASCADE : supprimer une ligne
+supprime ses dépendants en une seule instruction, sans les charger (voir
+cascade_delete() dans src/bulk.py).
+
+Une base créée par src/create_db.py avant la révision 0001, puis marquée
+``flask db stamp 0001``, porte des clés étrangères au nom choisi par le SGBD
+(``articles_categorie_id_fkey`` sous PostgreSQL, sans nom sous SQLite) : leur
+nom réel est lu dans la base avant de les supprimer.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 06:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# (table, contrainte, colonne, table référencée, ON DELETE avant cette révision)
+FOREIGN_KEYS = [
+    ("articles", "fk_articles_categories", "categorie_id", "categories", "RESTRICT"),
+    ("articles", "fk_articles_utilisateurs", "auteur_id", "utilisateurs", "RESTRICT"),
+    ("commentaires", "fk_commentaires_articles", "article_id", "articles", "CASCADE"),
+    (
+        "commentaires",
+        "fk_commentaires_utilisateurs",
+        "auteur_id",
+        "utilisateurs",
+        "RESTRICT",
+    ),
+]
+
+# Triggers de la recherche plein texte (révision 0005), supprimés avec l'ancienne
+# table articles lorsque SQLite la reconstruit.
+SQLITE_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF titre, contenu
+    ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+]
+
+
+# Nom donné par le mode batch (SQLite) à une clé étrangère reflétée sans nom :
+# celui de FOREIGN_KEYS.
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(referred_table_name)s"}
+
+
+def _existing_names(table: str) -> dict:
+    """{colonne: nom de sa clé étrangère dans la base}, None si elle n'en a pas."""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        tuple(fk["constrained_columns"]): fk["name"]
+        for fk in inspector.get_foreign_keys(table)
+    }
+
+
+def _set_ondelete(cascade: bool) -> None:
+    # SQLite ne sait pas modifier une contrainte : les tables sont reconstruites
+    # (mode batch), les clés étrangères étant désactivées par migrations/env.py.
+    for table in ("articles", "commentaires"):
+        existing = _existing_names(table)
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch:
+            for owner, name, column, target, before in FOREIGN_KEYS:
+                if owner != table:
+                    continue
+                batch.drop_constraint(
+                    existing.get((column,)) or name, type_="foreignkey"
+                )
+                batch.create_foreign_key(
+                    name,
+                    target,
+                    [column],
+                    ["id"],
+                    onupdate="CASCADE",
+                    ondelete="CASCADE" if cascade else before,
+                )
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def upgrade():
+    _set_ondelete(cascade=True)
+
+
+def downgrade():
+    _set_ondelete(cascade=False)
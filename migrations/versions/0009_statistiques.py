@@ -0,0 +1,133 @@
+"""statistiques agrégées
+
+Table stats_rafraichissements et vues de statistiques (voir src/stats.py) :
+vues matérialisées sous PostgreSQL, tables de synthèse sous SQLite. Elles sont
+vides jusqu'au premier calcul.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 07:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# Copie figée des requêtes de src/models.py à cette révision. Ne sont comptés que
+# les articles dont ni la catégorie ni l'auteur n'attendent leur suppression, et
+# leurs commentaires d'auteurs non marqués.
+ARTICLES = """(
+    SELECT sa.* FROM articles sa
+    JOIN categories sac ON sac.id = sa.categorie_id
+    JOIN utilisateurs sau ON sau.id = sa.auteur_id
+    WHERE sac.date_suppression IS NULL AND sau.date_suppression IS NULL
+)"""
+COMMENTAIRES = f"""(
+    SELECT sc.* FROM commentaires sc
+    JOIN {ARTICLES} sca ON sca.id = sc.article_id
+    JOIN utilisateurs scu ON scu.id = sc.auteur_id
+    WHERE scu.date_suppression IS NULL
+)"""
+
+POSTGRESQL_VIEWS = {
+    "stats_categories": (
+        f"""
+        SELECT c.id AS categorie_id,
+               COUNT(a.id) AS nb_articles,
+               COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires,
+               MAX(a.date_publication) AS derniere_publication
+        FROM categories c LEFT JOIN {ARTICLES} a ON a.categorie_id = c.id
+        GROUP BY c.id
+        """,
+        "categorie_id",
+    ),
+    "stats_utilisateurs": (
+        f"""
+        SELECT u.id AS utilisateur_id,
+               COUNT(a.id) AS nb_articles,
+               COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires_recus
+        FROM utilisateurs u LEFT JOIN {ARTICLES} a ON a.auteur_id = u.id
+        GROUP BY u.id
+        """,
+        "utilisateur_id",
+    ),
+    "stats_activite": (
+        f"""
+        SELECT utilisateur_id, mois,
+               SUM(nb_articles) AS nb_articles,
+               SUM(nb_commentaires) AS nb_commentaires
+        FROM (
+            SELECT auteur_id AS utilisateur_id,
+                   to_char(date_publication, 'YYYY-MM') AS mois,
+                   1 AS nb_articles, 0 AS nb_commentaires
+            FROM {ARTICLES} a WHERE date_publication IS NOT NULL
+            UNION ALL
+            SELECT auteur_id, to_char(date_commentaire, 'YYYY-MM'), 0, 1
+            FROM {COMMENTAIRES} cm WHERE date_commentaire IS NOT NULL
+        ) activite
+        GROUP BY utilisateur_id, mois
+        """,
+        "utilisateur_id, mois",
+    ),
+}
+
+SQLITE_TABLES = {
+    "stats_categories": """
+        CREATE TABLE stats_categories (
+            categorie_id INTEGER PRIMARY KEY,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires INTEGER NOT NULL,
+            derniere_publication DATETIME
+        )
+    """,
+    "stats_utilisateurs": """
+        CREATE TABLE stats_utilisateurs (
+            utilisateur_id INTEGER PRIMARY KEY,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires_recus INTEGER NOT NULL
+        )
+    """,
+    "stats_activite": """
+        CREATE TABLE stats_activite (
+            utilisateur_id INTEGER NOT NULL,
+            mois VARCHAR(7) NOT NULL,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires INTEGER NOT NULL,
+            PRIMARY KEY (utilisateur_id, mois)
+        )
+    """,
+}
+
+
+def upgrade():
+    op.create_table(
+        "stats_rafraichissements",
+        sa.Column("vue", sa.String(length=50), primary_key=True),
+        sa.Column("date_rafraichissement", sa.TIMESTAMP(timezone=True)),
+        sa.Column("duree_ms", sa.Integer()),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        # WITH NO DATA : calculées au premier rafraîchissement, pas pendant la
+        # migration
+        for name, (query, key) in POSTGRESQL_VIEWS.items():
+            op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query} WITH NO DATA")
+            op.execute(f"CREATE UNIQUE INDEX ix_{name} ON {name} ({key})")
+    else:
+        for statement in SQLITE_TABLES.values():
+            op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for name in reversed(list(POSTGRESQL_VIEWS)):
+            op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
+    else:
+        for name in reversed(list(SQLITE_TABLES)):
+            op.execute(f"DROP TABLE IF EXISTS {name}")
+    op.drop_table("stats_rafraichissements")
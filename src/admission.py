@@ -0,0 +1,122 @@
+"""
+Contrôle d'admission : refuser vite plutôt que laisser les requêtes s'empiler.
+
+Quand la base ne suit plus, chaque requête supplémentaire attend une connexion
+du pool jusqu'à DB_POOL_TIMEOUT (30 s) avant d'échouer, et retarde les autres.
+Le contrôleur répond aussitôt ``503 Service Unavailable`` (avec ``Retry-After``)
+à une nouvelle requête lorsque :
+    - ADMISSION_MAX_CONCURRENCY requêtes sont déjà en cours dans le processus
+      (0 : pas de limite) ;
+    - l'attente d'une connexion dépasse ADMISSION_MAX_POOL_WAIT secondes (0 :
+      jamais) sur la base principale ou un réplica : plus longue attente en
+      cours ou moyenne de la dernière seconde (voir WaitTracker, src/pool.py).
+
+Les requêtes déjà admises se terminent normalement. Les refus sont comptés par
+``http_requests_shed_total`` (raison ``concurrence`` ou ``attente_pool``) et les
+requêtes en cours exposées par ``http_requests_in_flight`` (voir GET /metrics,
+lui-même jamais refusé).
+"""
+
+import threading
+
+from flask import current_app, g, jsonify, request
+
+from src.metrics import Counter, Gauge
+from src.models import db
+
+# Blueprints toujours admis
+EXEMPT_BLUEPRINTS = ("metrics",)
+
+REQUESTS_SHED = Counter(
+    "http_requests_shed",
+    "Requêtes refusées (503) par le contrôle d'admission, par raison.",
+)
+
+
+class InFlight:
+    """Nombre de requêtes admises et pas encore terminées, thread-safe."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, limit: int) -> bool:
+        """Admet une requête, sauf si limit (> 0) requêtes sont déjà en cours."""
+        with self._lock:
+            if limit and self.count >= limit:
+                return False
+            self.count += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.count -= 1
+
+
+class AdmissionControl:
+    """
+    Extension Flask du contrôle d'admission.
+
+    S'initialise comme le cache : ``admission.init_app(app)`` dans create_app().
+    Les seuils sont relus à chaque requête.
+    """
+
+    def init_app(self, app) -> None:
+        """Installe le contrôle avant et après chaque requête."""
+        app.config.setdefault("ADMISSION_MAX_CONCURRENCY", 0)
+        app.config.setdefault("ADMISSION_MAX_POOL_WAIT", 0.5)
+        app.config.setdefault("ADMISSION_RETRY_AFTER", 1)
+        app.extensions["admission"] = InFlight()
+        app.before_request(self.admit)
+        app.teardown_request(self.release)
+
+    def pool_wait(self) -> float:
+        """Attente actuelle d'une connexion (secondes), la pire des pools suivis."""
+        engines = [db.engine]
+        replica_set = current_app.extensions.get("read_replicas")
+        if replica_set is not None:
+            engines.extend(replica_set.engines.values())
+        waits = [getattr(engine.pool, "waits", None) for engine in engines]
+        return max((w.current() for w in waits if w is not None), default=0.0)
+
+    def admit(self):
+        """Refuse la requête (503) si le processus ou la base sont saturés."""
+        if request.blueprint in EXEMPT_BLUEPRINTS:
+            return None
+        config = current_app.config
+        max_wait = config["ADMISSION_MAX_POOL_WAIT"]
+        if max_wait and self.pool_wait() > max_wait:
+            return self.reject("attente_pool")
+        if not current_app.extensions["admission"].acquire(
+            config["ADMISSION_MAX_CONCURRENCY"]
+        ):
+            return self.reject("concurrence")
+        g.admitted = True
+        return None
+
+    def reject(self, reason: str):
+        REQUESTS_SHED.inc(reason=reason)
+        response = jsonify({"error": "Service surchargé, réessayez plus tard."})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(
+            current_app.config["ADMISSION_RETRY_AFTER"]
+        )
+        return response
+
+    def release(self, exc=None) -> None:
+        """Libère la place d'une requête admise, même en cas d'erreur."""
+        if g.pop("admitted", False):
+            current_app.extensions["admission"].release()
+
+
+def _in_flight():
+    """Requêtes en cours de l'application courante."""
+    if not current_app:
+        return None
+    return current_app.extensions["admission"].count
+
+
+Gauge("http_requests_in_flight", "Requêtes HTTP admises en cours.", _in_flight)
+
+
+admission = AdmissionControl()
@@ -0,0 +1,337 @@
+"""
+Opérations groupées (création, mise à jour, suppression) sur les ressources.
+
+Un lot est validé avec une seule requête ``IN`` par table référencée (clés
+étrangères, unicité, existence des identifiants), puis écrit en une seule
+transaction par ``INSERT ... RETURNING`` / ``UPDATE`` en executemany. Les clés
+(identifiants, clés étrangères, champs uniques) sont d'abord converties au type de
+leur colonne. Les éléments invalides sont ignorés et signalés un par un dans la
+réponse, avec leur index.
+"""
+
+from flask import abort, current_app, jsonify, request
+from sqlalchemy import BigInteger, bindparam, delete, insert, select, update
+
+from src import counters
+from src.cache import cache
+from src.feed import feed
+from src.models import db, parents_actifs, Supprimable
+
+MAX_ITEMS = 1000
+
+
+def to_key(column, value):
+    """
+    Convertit value au type Python de column pour servir de clé, ou lève
+    ValueError (booléen, chaîne non numérique ou entier hors limites pour une
+    colonne entière, nombre pour une colonne texte) : la base ne reçoit ainsi
+    jamais de valeur qu'elle refuserait (DataError sous PostgreSQL).
+    """
+    python_type = column.type.python_type
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(value)
+    if python_type is not int:
+        if not isinstance(value, python_type):
+            raise ValueError(value)
+        return value
+    key = int(value)
+    limit = 2**63 if isinstance(column.type, BigInteger) else 2**31
+    if not -limit <= key < limit:
+        raise ValueError(value)
+    return key
+
+
+class BulkResource:
+    """
+    Description d'une ressource pour les opérations groupées.
+
+    Attributs:
+        model : Modèle SQLAlchemy concerné.
+        fields : Champs acceptés à la création et à la mise à jour.
+        required : Champs obligatoires à la création.
+        required_message : Erreur renvoyée si un champ obligatoire manque.
+        foreign_keys : {champ: (modèle référencé, message d'erreur)}.
+        unique : Champs soumis à une contrainte d'unicité.
+    """
+
+    def __init__(
+        self,
+        model,
+        fields: list,
+        required: list,
+        required_message: str,
+        foreign_keys: dict = None,
+        unique: list = (),
+    ) -> None:
+        self.model = model
+        self.fields = fields
+        self.required = required
+        self.required_message = required_message
+        self.foreign_keys = foreign_keys or {}
+        self.unique = list(unique)
+
+    def keys(self, items: list, field: str, column, message: str, errors: dict):
+        """
+        Convertit item[field] au type de column (voir to_key) pour les éléments
+        qui le fournissent, une valeur invalide étant signalée par message.
+
+        Retourne les (index, élément) convertis.
+        """
+        converted = []
+        for index, item in items:
+            if field not in item:
+                continue
+            try:
+                item[field] = to_key(column, item[field])
+            except ValueError:
+                errors.setdefault(index, message)
+                continue
+            converted.append((index, item))
+        return converted
+
+    def existing(self, column, values) -> set:
+        """
+        Retourne, en une requête, les valeurs de values (clés converties par
+        to_key) présentes dans column (hors lignes en attente de suppression,
+        elles ou l'un de leurs parents).
+        """
+        values = set(values)
+        if not values:
+            return set()
+        model = column.class_
+        stmt = select(column).where(column.in_(values), *parents_actifs(model))
+        if issubclass(model, Supprimable):
+            stmt = stmt.where(model.date_suppression.is_(None))
+        return set(db.session.scalars(stmt))
+
+    def check_values(self, items: list, errors: dict) -> None:
+        """
+        Refuse, comme à la création, un champ obligatoire vide et une valeur nulle
+        pour une colonne NOT NULL, avant toute écriture.
+        """
+        columns = self.model.__table__.c
+        for index, item in items:
+            for field, value in item.items():
+                if (field in self.required and value in (None, "")) or (
+                    value is None and not columns[field].nullable
+                ):
+                    errors.setdefault(index, f"Valeur requise pour {field}.")
+                    break
+
+    def check_types(self, items: list, errors: dict) -> None:
+        """
+        Refuse une valeur qui n'est pas du type Python de sa colonne (objet,
+        liste, nombre pour un texte...). Les clés sont converties à part (to_key).
+        """
+        columns = self.model.__table__.c
+        for index, item in items:
+            for field, value in item.items():
+                if field == "id" or field in self.foreign_keys or value is None:
+                    continue
+                python_type = columns[field].type.python_type
+                # bool est une sous-classe d'int
+                if not isinstance(value, python_type) or (
+                    isinstance(value, bool) and python_type is not bool
+                ):
+                    errors.setdefault(index, f"Valeur invalide pour {field}.")
+                    break
+
+    def check_references(self, items: list, errors: dict) -> None:
+        """Vérifie les clés étrangères des éléments, une requête par table."""
+        for field, (target, message) in self.foreign_keys.items():
+            converted = self.keys(items, field, target.id, message, errors)
+            found = self.existing(target.id, (item[field] for _, item in converted))
+            for index, item in converted:
+                if item[field] not in found:
+                    errors.setdefault(index, message)
+
+    def check_unique(self, items: list, errors: dict) -> None:
+        """Vérifie l'unicité des champs, dans le lot comme en base."""
+        for field in self.unique:
+            column = getattr(self.model, field)
+            message = f"Valeur invalide pour {field}."
+            converted = self.keys(items, field, column, message, errors)
+            values = {item[field] for _, item in converted}
+            stmt = select(column, self.model.id).where(column.in_(values))
+            taken = dict(db.session.execute(stmt).all()) if values else {}
+            seen = set()
+            for index, item in converted:
+                value = item[field]
+                owner = taken.get(value)
+                if (owner is not None and owner != item.get("id")) or value in seen:
+                    errors.setdefault(index, f"Valeur déjà utilisée pour {field}.")
+                seen.add(value)
+
+
+def get_items() -> list:
+    """Lit le corps de la requête : une liste JSON d'objets, de taille bornée."""
+    data = request.get_json()
+    if not isinstance(data, list) or not data:
+        abort(400, description="Une liste JSON non vide est attendue.")
+    maximum = current_app.config.get("BULK_MAX_ITEMS", MAX_ITEMS)
+    if len(data) > maximum:
+        abort(400, description=f"Au plus {maximum} éléments par lot.")
+    return data
+
+
+def bulk_response(key: str, done: list, errors: dict):
+    """Construit la réponse : 201/200 si tout a réussi, 207 sinon, 400 si rien."""
+    body = {
+        key: done,
+        "errors": [{"index": i, "error": e} for i, e in sorted(errors.items())],
+    }
+    if not errors:
+        status = 201 if key == "created" else 200
+    elif done:
+        status = 207
+    else:
+        status = 400
+    return jsonify(body), status
+
+
+def bulk_create(resource: BulkResource):
+    """Crée les éléments valides du lot en un seul INSERT ... RETURNING."""
+    data = get_items()
+    errors = {}
+    items = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not all(
+            item.get(f) for f in resource.required
+        ):
+            errors[index] = resource.required_message
+            continue
+        items.append((index, {f: item[f] for f in resource.fields if f in item}))
+
+    resource.check_types(items, errors)
+    resource.check_references(items, errors)
+    resource.check_unique(items, errors)
+    rows = [item for index, item in items if index not in errors]
+
+    created = []
+    if rows:
+        model = resource.model
+        stmt = insert(model).returning(model, sort_by_parameter_order=True)
+        created = db.session.scalars(stmt, rows).all()
+        tables = counters.inserted(model, created)
+        db.session.commit()
+        cache.invalidate(model.__tablename__, *tables)
+        feed.invalidate(model.__tablename__)
+    return bulk_response("created", [obj.to_dict() for obj in created], errors)
+
+
+def bulk_update(resource: BulkResource):
+    """Met à jour les éléments valides du lot (chacun identifié par son id)."""
+    model = resource.model
+    data = get_items()
+    errors = {}
+    items = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or item.get("id") is None:
+            errors[index] = "Identifiant requis."
+            continue
+        items.append(
+            (index, {f: item[f] for f in ["id", *resource.fields] if f in item})
+        )
+    items = resource.keys(items, "id", model.id, "Identifiant invalide.", errors)
+
+    found = resource.existing(model.id, (item["id"] for _, item in items))
+    for index, item in items:
+        if item["id"] not in found:
+            errors[index] = f"{model.__name__} with id {item['id']} not found."
+    resource.check_values(items, errors)
+    resource.check_types(items, errors)
+    resource.check_references(items, errors)
+    resource.check_unique(items, errors)
+    rows = [item for index, item in items if index not in errors and len(item) > 1]
+    ids = [item["id"] for index, item in items if index not in errors]
+
+    updated = []
+    if ids:
+        tables = counters.reassigned(model, rows)
+        # Un UPDATE exécuté en executemany par ensemble de champs modifiés ; la
+        # version est incrémentée comme le ferait l'ORM (ETag, If-Match).
+        table = model.__table__
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for group in groups.values():
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values(version=table.c.version + 1)
+            )
+            params = [
+                {"_id": row["id"], **{k: v for k, v in row.items() if k != "id"}}
+                for row in group
+            ]
+            db.session.execute(stmt, params)
+        db.session.commit()
+        cache.invalidate(model.__tablename__, *tables)
+        feed.invalidate(model.__tablename__)
+        updated = db.session.scalars(
+            select(model).where(model.id.in_(ids)).order_by(model.id)
+        ).all()
+    return bulk_response("updated", [obj.to_dict() for obj in updated], errors)
+
+
+def release_counters(model, where, parent=None) -> set:
+    """
+    Décrémente les compteurs des lignes parentes conservées, pour les lignes de
+    model vérifiant where et leurs dépendants (relations en cascade « delete »).
+
+    Retourne le nom des tables touchées.
+    """
+    tables = {model.__tablename__}
+    for relationship in model.__mapper__.relationships:
+        if relationship.cascade.delete:
+            child = relationship.mapper.class_
+            (foreign_key,) = relationship.remote_side
+            parents = foreign_key.in_(select(model.id).where(where))
+            tables |= release_counters(child, parents, model)
+    return tables | counters.deleted(model, where, parent)
+
+
+def cascade_delete(model, where) -> set:
+    """
+    Supprime les lignes de model vérifiant where par un seul DELETE ensembliste :
+    la base supprime leurs dépendants (clés étrangères ON DELETE CASCADE), sans
+    les charger. Les compteurs sont décrémentés au préalable.
+
+    Retourne le nom des tables touchées.
+    """
+    tables = release_counters(model, where)
+    db.session.execute(
+        delete(model).where(where), execution_options={"synchronize_session": False}
+    )
+    return tables
+
+
+def bulk_delete(resource: BulkResource):
+    """Supprime, en une transaction, les éléments dont les ids sont fournis."""
+    model = resource.model
+    data = request.get_json()
+    ids = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        abort(400, description='Un objet {"ids": [...]} non vide est attendu.')
+    maximum = current_app.config.get("BULK_MAX_ITEMS", MAX_ITEMS)
+    if len(ids) > maximum:
+        abort(400, description=f"Au plus {maximum} éléments par lot.")
+
+    errors = {}
+    keys = {}
+    for index, pk in enumerate(ids):
+        try:
+            keys[index] = to_key(model.id, pk)
+        except ValueError:
+            errors[index] = "Identifiant invalide."
+    found = resource.existing(model.id, keys.values())
+    for index, pk in keys.items():
+        if pk not in found:
+            errors[index] = f"{model.__name__} with id {pk} not found."
+    deleted = sorted(found)
+    if deleted:
+        tables = cascade_delete(model, model.id.in_(deleted))
+        db.session.commit()
+        cache.invalidate(*tables)
+        feed.invalidate(model.__tablename__)
+    return bulk_response("deleted", deleted, errors)
@@ -0,0 +1,236 @@
+"""
+Cache des réponses des routes de lecture.
+
+Chaque réponse GET est mise en cache sous une clé formée de la route, de la
+chaîne de requête et de la « génération » des espaces de noms dont elle dépend
+(en pratique, les tables lues), de la base lue (principale ou réplica) et du
+codage négocié avec le client : le corps est conservé déjà compressé (voir
+src/compression.py). Les routes d'écriture
+invalident un espace de noms en incrémentant sa génération : les anciennes
+entrées ne sont plus jamais lues et disparaissent d'elles-mêmes (éviction LRU ou
+TTL). Un client qui vient d'écrire lit la principale (voir src/replicas.py) sans
+passer par le cache, qui pourrait lui rendre un corps lu sur un réplica en retard.
+
+Backends disponibles via CACHE_TYPE :
+    null : pas de cache (par défaut) ;
+    simple : LRU en mémoire du processus, borné en taille et en durée ;
+    redis : serveur compatible Redis (CACHE_REDIS_URL), partagé entre workers.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from src.compression import compression
+from src.replicas import current_replica, pinned_to_primary
+from src.resp import RedisClient, RedisError
+from src.streaming import wants_stream
+
+# En-têtes conservés avec le corps d'une réponse mise en cache
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Encoding", "Vary")
+
+
+class NullCache:
+    """Backend inactif : aucune réponse n'est conservée."""
+
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value: bytes, timeout: int) -> None:
+        pass
+
+    def generation(self, namespace: str) -> int:
+        return 0
+
+    def bump(self, namespace: str) -> None:
+        pass
+
+
+class LRUCache:
+    """
+    Cache en mémoire, thread-safe, borné en nombre d'entrées et en durée de vie.
+
+    Attributs:
+        max_entries : Nombre maximal d'entrées avant éviction de la moins récente.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, timeout: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Cache partagé stocké sur un serveur compatible Redis."""
+
+    def __init__(self, client: RedisClient, prefix: str = "blog:cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, timeout: int) -> None:
+        self.client.set(self.prefix + key, value, ex=timeout)
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace: str) -> None:
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+
+class ResponseCache:
+    """
+    Extension Flask de cache des réponses.
+
+    S'initialise comme db : ``cache.init_app(app)`` dans create_app(), puis
+    ``@cache.cached("articles")`` sur les routes GET et
+    ``cache.invalidate("articles")`` après chaque écriture.
+    """
+
+    def init_app(self, app) -> None:
+        """Choisit le backend d'après la configuration de l'application."""
+        app.config.setdefault("CACHE_TYPE", "null")
+        app.config.setdefault("CACHE_DEFAULT_TIMEOUT", 300)
+        app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+        app.config.setdefault("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+        kind = app.config["CACHE_TYPE"]
+        if kind == "null":
+            backend = NullCache()
+        elif kind == "simple":
+            backend = LRUCache(app.config["CACHE_MAX_ENTRIES"])
+        elif kind == "redis":
+            backend = RedisCache(RedisClient.from_url(app.config["CACHE_REDIS_URL"]))
+        else:
+            raise ValueError(f"CACHE_TYPE inconnu : {kind}")
+        app.extensions["response_cache"] = backend
+
+    @property
+    def backend(self):
+        """Backend de l'application courante."""
+        return current_app.extensions["response_cache"]
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Invalide toutes les réponses dépendant des espaces de noms donnés."""
+        for namespace in namespaces:
+            try:
+                self.backend.bump(namespace)
+            except (OSError, RedisError):
+                current_app.logger.warning(
+                    "Invalidation du cache impossible pour %s", namespace, exc_info=True
+                )
+
+    def cached(self, *namespaces, timeout: int = None):
+        """
+        Décorateur de route GET : sert la réponse depuis le cache si possible.
+
+        namespaces contient des noms ou des fonctions (appelées dans la requête)
+        retournant une liste de noms, pour les dépendances variables.
+        """
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if (
+                    isinstance(backend, NullCache)
+                    or wants_stream()
+                    or pinned_to_primary()
+                ):
+                    return view(*args, **kwargs)
+
+                names = []
+                for namespace in namespaces:
+                    names.extend(
+                        [namespace] if isinstance(namespace, str) else namespace()
+                    )
+                try:
+                    # La génération est lue avant la base : une écriture concurrente
+                    # ne peut pas laisser une réponse périmée sous la clé courante.
+                    generations = ",".join(
+                        f"{n}={backend.generation(n)}" for n in names
+                    )
+                    encoding = compression.negotiate() or "identity"
+                    # Un réplica en retard ne sert ses entrées qu'à ses lecteurs
+                    source = current_replica() or "primary"
+                    key = (
+                        f"{request.path}?{request.query_string.decode()}"
+                        f"|{generations}|{source}|{encoding}"
+                    )
+                    entry = backend.get(key)
+                except (OSError, RedisError):
+                    # Cache indisponible : on sert directement depuis la base.
+                    return view(*args, **kwargs)
+                if entry is not None:
+                    headers, body = entry.split(b"\n", 1)
+                    response = current_app.response_class(
+                        body, status=200, headers=json.loads(headers)
+                    )
+                    response.headers["X-Cache"] = "HIT"
+                    # Les validateurs conservés permettent de répondre 304.
+                    return response.make_conditional(request)
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    ttl = timeout or current_app.config["CACHE_DEFAULT_TIMEOUT"]
+                    if current_replica() is not None:
+                        # Lu sur un réplica en retard, le corps peut précéder une
+                        # écriture déjà invalidée : durée de vie écourtée.
+                        ttl = min(ttl, current_app.config["REPLICA_CACHE_TIMEOUT"])
+                    # Compressé une fois pour toutes les lectures de l'entrée
+                    compression.compress_response(response)
+                    headers = {
+                        name: response.headers[name]
+                        for name in CACHED_HEADERS
+                        if name in response.headers
+                    }
+                    value = json.dumps(headers).encode() + b"\n" + response.get_data()
+                    try:
+                        backend.set(key, value, ttl)
+                    except (OSError, RedisError):
+                        pass
+                    response.headers["X-Cache"] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
+
+
+cache = ResponseCache()
@@ -0,0 +1,144 @@
+"""
+Commandes d'administration : ``flask --app src.app blog <commande>``, et
+migrations : ``flask --app src.app db <commande>``.
+"""
+
+import functools
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import exc
+
+from src import counters, dump
+from src.cache import cache
+from src.feed import feed
+from src.jobs import run_pending
+from src.stats import refresh
+from src.models import db, run_sync
+
+blog_cli = AppGroup("blog", help="Commandes d'administration du blog.")
+
+
+def _sync(command):
+    """Exécute la commande par run_sync : la base peut utiliser un pilote asynchrone."""
+
+    @functools.wraps(command)
+    def wrapper(*args, **kwargs):
+        return run_sync(command, *args, **kwargs)
+
+    return wrapper
+
+
+@blog_cli.command("reconcile-counters")
+@_sync
+def reconcile_counters() -> None:
+    """Recalcule les compteurs dénormalisés et corrige ceux qui ont dérivé."""
+    repaired = counters.reconcile()
+    db.session.commit()
+    tables = {name.split(".")[0] for name, count in repaired.items() if count}
+    if tables:
+        cache.invalidate(*tables)
+    for name, count in repaired.items():
+        click.echo(f"{name} : {count} ligne(s) corrigée(s)")
+
+
+@blog_cli.command("run-jobs")
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Reprend aussi les tâches interrompues (statut en_cours).",
+)
+@_sync
+def run_jobs(resume: bool) -> None:
+    """Exécute les tâches de fond en attente (suppressions différées)."""
+    done = run_pending(resume=resume)
+    click.echo(f"{len(done)} tâche(s) exécutée(s)")
+
+
+@blog_cli.command("refresh-stats")
+@_sync
+def refresh_stats() -> None:
+    """Recalcule les vues de statistiques (à planifier, par exemple avec cron)."""
+    refresh()
+    click.echo("Statistiques recalculées")
+
+
+def _transfer_options(command):
+    """Options communes à export et import."""
+    command = click.option(
+        "--chunk",
+        type=click.IntRange(min=1),
+        default=dump.DEFAULT_CHUNK,
+        show_default=True,
+        help="Lignes par lot (hors COPY).",
+    )(command)
+    command = click.option(
+        "--table",
+        "tables",
+        multiple=True,
+        type=click.Choice(dump.TABLE_NAMES),
+        help="Table à traiter (répétable ; par défaut : toutes).",
+    )(command)
+    command = click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(dump.FORMATS),
+        default="csv",
+        show_default=True,
+    )(command)
+    return click.argument("directory", type=click.Path(file_okay=False))(command)
+
+
+@blog_cli.command("export")
+@_transfer_options
+@_sync
+def export_data(directory: str, fmt: str, tables: tuple, chunk: int) -> None:
+    """Exporte les tables dans DIRECTORY (un fichier par table)."""
+    counts = dump.export_all(directory, fmt, tables or None, chunk)
+    for name, count in counts.items():
+        click.echo(f"{name} : {count} ligne(s) exportée(s)")
+
+
+@blog_cli.command("import")
+@_transfer_options
+@_sync
+def import_data(directory: str, fmt: str, tables: tuple, chunk: int) -> None:
+    """
+    Importe les fichiers de DIRECTORY, parents avant dépendants, en une seule
+    transaction.
+    """
+    try:
+        counts = dump.import_all(directory, fmt, tables or None, chunk)
+    except (OSError, ValueError, exc.SQLAlchemyError) as e:
+        # Erreur du pilote seule : le message complet cite les paramètres du lot
+        reason = e.orig if isinstance(e, exc.DBAPIError) else e
+        raise click.ClickException(f"Import annulé : {reason}") from e
+    cache.invalidate(*counts)
+    feed.invalidate(*counts)
+    for name, count in counts.items():
+        click.echo(f"{name} : {count} ligne(s) importée(s)")
+
+
+@click.command(
+    "db",
+    context_settings={
+        "ignore_unknown_options": True,
+        "allow_extra_args": True,
+        "help_option_names": [],
+    },
+)
+@click.pass_context
+def migrate_cli(ctx) -> None:
+    """Migrations de la base (Flask-Migrate : flask db --help)."""
+    # Flask-Migrate et Alembic ne sont importés que pour ces commandes ; le groupe
+    # « db » de Flask-Migrate reçoit tels quels les arguments restants.
+    from flask_migrate import Migrate
+    from flask_migrate.cli import db as db_group
+
+    Migrate(current_app, db)
+    ctx.exit(
+        db_group.main(
+            ctx.args, prog_name=ctx.command_path, obj=ctx.obj, standalone_mode=False
+        )
+    )
@@ -0,0 +1,208 @@
+"""
+Compression des réponses selon l'en-tête ``Accept-Encoding``.
+
+Les listes d'articles sont dominées par le champ ``contenu`` : compressées, elles
+pèsent plusieurs fois moins lourd sur le réseau. Après chaque requête, le corps
+d'une réponse JSON, NDJSON, CSV ou texte est compressé avec le codage préféré du
+client parmi COMPRESS_ALGORITHMS (ordre de préférence du serveur à qualité
+égale) :
+    - zstd : module ``zstandard``, s'il est installé ;
+    - br : module ``brotli``, s'il est installé ;
+    - gzip : bibliothèque standard (zlib), toujours disponible.
+
+Un corps de moins de COMPRESS_MIN_SIZE octets est envoyé tel quel : l'en-tête
+gzip et le temps de compression coûteraient plus qu'ils ne rapportent. Les
+réponses en flux (NDJSON, voir src/streaming.py) sont compressées morceau par
+morceau, chaque morceau étant vidé (flush) pour partir aussitôt. Le niveau de
+chaque codage est réglé par COMPRESS_LEVELS (``gzip=6,br=4,zstd=3`` par défaut,
+voir benchmarks/bench_compression.py pour le compromis CPU / octets).
+
+Une réponse compressée porte ``Vary: Accept-Encoding`` et un ETag faible (le
+corps diffère selon le codage, la version désignée reste la même). Le cache des
+réponses (src/cache.py) conserve les corps déjà compressés, un par codage.
+"""
+
+import zlib
+from collections import namedtuple
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Types de contenu compressés
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+)
+
+# En-tête et fin de flux gzip autour du flux deflate
+GZIP_WBITS = 31
+
+# compress(data, level) -> bytes ; stream(level) -> compresseur en flux
+Codec = namedtuple("Codec", ["compress", "stream", "level"])
+
+
+class GzipStream:
+    """Compresseur gzip en flux : chaque morceau est vidé (Z_SYNC_FLUSH)."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    """Compresseur brotli en flux."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdStream:
+    """Compresseur zstd en flux : chaque morceau termine un bloc."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Codages connus, ceux dont le module manque étant absents de CODECS
+KNOWN_CODECS = ("zstd", "br", "gzip")
+CODECS = {
+    "gzip": Codec(
+        lambda data, level: zlib.compress(data, level, wbits=GZIP_WBITS),
+        GzipStream,
+        6,
+    )
+}
+if brotli is not None:
+    CODECS["br"] = Codec(
+        lambda data, level: brotli.compress(data, quality=level), BrotliStream, 4
+    )
+if zstandard is not None:
+    CODECS["zstd"] = Codec(
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        ZstdStream,
+        3,
+    )
+
+
+def compress_stream(chunks, compressor):
+    """Compresse au fil de l'eau les morceaux de chunks (bytes ou str)."""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+        yield compressor.finish()
+    finally:
+        # Ferme le générateur d'origine (contexte de stream_with_context)
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+class Compression:
+    """
+    Extension Flask de compression des réponses.
+
+    S'initialise comme le cache : ``compression.init_app(app)`` dans create_app().
+    Sans codage disponible dans COMPRESS_ALGORITHMS, rien n'est compressé.
+    """
+
+    def init_app(self, app) -> None:
+        """Retient les codages proposés et leur niveau d'après la configuration."""
+        app.config.setdefault("COMPRESS_ALGORITHMS", list(KNOWN_CODECS))
+        app.config.setdefault("COMPRESS_MIN_SIZE", 500)
+        app.config.setdefault("COMPRESS_LEVELS", {})
+
+        unknown = set(app.config["COMPRESS_ALGORITHMS"]) - set(KNOWN_CODECS)
+        if unknown:
+            raise ValueError(
+                f"COMPRESS_ALGORITHMS inconnu(s) : {', '.join(sorted(unknown))}"
+            )
+        levels = app.config["COMPRESS_LEVELS"]
+        # {codage: niveau}, par ordre de préférence
+        offers = {
+            name: int(levels.get(name, CODECS[name].level))
+            for name in app.config["COMPRESS_ALGORITHMS"]
+            if name in CODECS
+        }
+        app.extensions["compression"] = offers
+        if offers:
+            app.after_request(self.compress_response)
+
+    def negotiate(self):
+        """Codage retenu pour la requête courante, ou None (corps non compressé)."""
+        offers = current_app.extensions.get("compression")
+        if not offers:
+            return None
+        return request.accept_encodings.best_match(list(offers))
+
+    def compressible(self, response) -> bool:
+        """Indique si le corps de response peut être compressé."""
+        return (
+            200 <= response.status_code < 300
+            and response.status_code not in (204, 206)
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and "Content-Encoding" not in response.headers
+            and not response.direct_passthrough
+        )
+
+    def compress_response(self, response):
+        """Compresse le corps de response avec le codage négocié."""
+        if not self.compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+        codec = CODECS[encoding]
+        level = current_app.extensions["compression"][encoding]
+        if response.is_streamed:
+            response.response = compress_stream(response.response, codec.stream(level))
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+                return response
+            response.set_data(codec.compress(data, level))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+compression = Compression()
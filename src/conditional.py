@@ -0,0 +1,114 @@
+"""
+Requêtes conditionnelles : ETag, If-None-Match, Last-Modified et If-Match.
+
+Les ETag sont calculés à partir de l'identifiant et de la version (colonne
+``version`` des modèles) des lignes renvoyées, suivis de leurs compteurs
+dénormalisés, avant toute sérialisation : une réponse 304 ne coûte donc ni
+to_dict() ni encodage JSON. ``If-Match`` sur PUT et DELETE offre un verrouillage
+optimiste (412 si la ressource a été modifiée) : seule la partie version de
+l'ETag y est comparée, les compteurs changeant au gré des écritures des autres
+ressources (voir src/counters.py).
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import abort, current_app, jsonify, request
+
+from src.counters import COUNTERS
+
+# Compteurs de chaque table : {table: [colonnes]}
+COUNTED = {}
+for _counter in COUNTERS:
+    COUNTED.setdefault(_counter.parent.__tablename__, []).append(_counter.column.key)
+
+
+def entity_etag(*objs, extra: str = "") -> str:
+    """
+    ETag fort d'un ensemble d'entités, d'après leur table, id et version, suivis
+    (« version-compteurs ») des compteurs qu'elles exposent.
+
+    extra distingue des réponses portant sur les mêmes entités (curseur, etc.).
+    """
+    digest = hashlib.sha1(extra.encode())
+    counts = []
+    for obj in objs:
+        digest.update(f";{obj.__tablename__}:{obj.id}:{obj.version}".encode())
+        # Table d'une projection : « articles(id,titre) »
+        for key in COUNTED.get(obj.__tablename__.split("(")[0], ()):
+            value = getattr(obj, key, None)
+            if value is not None:
+                counts.append(f";{obj.id}:{key}={value}")
+    if not counts:
+        return digest.hexdigest()
+    counted = hashlib.sha1("".join(counts).encode()).hexdigest()[:16]
+    return f"{digest.hexdigest()}-{counted}"
+
+
+def version_tag(etag: str) -> str:
+    """Partie version d'un ETag construit par entity_etag()."""
+    return etag.split("-", 1)[0]
+
+
+def _utc(value):
+    """Rend value comparable aux dates HTTP (UTC, à la seconde près)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def not_modified(etag: str, last_modified=None):
+    """
+    Retourne une réponse 304 si les validateurs du client sont à jour, None sinon.
+
+    If-None-Match est prioritaire sur If-Modified-Since (RFC 9110).
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = _utc(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    response = current_app.response_class(status=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified=None):
+    """Ajoute les en-têtes ETag et Last-Modified à response."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _utc(last_modified)
+    return response
+
+
+def conditional_json(build, etag: str, last_modified=None):
+    """
+    Retourne 304 si le client est à jour, sinon jsonify(build()) accompagné
+    des validateurs. build n'est appelé que si le corps doit être envoyé.
+    """
+    response = not_modified(etag, last_modified)
+    if response is None:
+        response = set_validators(jsonify(build()), etag, last_modified)
+    return response
+
+
+def check_if_match(obj) -> None:
+    """Renvoie 412 si l'en-tête If-Match ne correspond pas à la version de obj."""
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return
+    # Une réponse compressée porte l'ETag sous forme faible (voir src/compression.py)
+    # pour la même version : le préfixe W/ n'est donc pas discriminant ici.
+    current = version_tag(entity_etag(obj))
+    tags = if_match.as_set(include_weak=True)
+    if not any(version_tag(tag) == current for tag in tags):
+        abort(
+            412,
+            description=(
+                f"{type(obj).__name__} with id {obj.id} a été modifié "
+                "(If-Match ne correspond plus)."
+            ),
+        )
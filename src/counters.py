@@ -0,0 +1,152 @@
+"""
+Compteurs dénormalisés : commentaires par article, articles par catégorie et
+articles par auteur.
+
+Les compteurs sont ajustés dans la transaction de chaque écriture par des UPDATE
+relatifs (``n = n + delta``), si bien que deux écritures concurrentes ne perdent
+aucune mise à jour. Un ajustement laisse la version de la ligne inchangée : le
+verrouillage optimiste (If-Match) ne protège que les modifications des clients,
+et une ressource très commentée ne devient pas un point de contention. Les
+compteurs entrent à part dans l'ETag (voir src/conditional.py) et date_modification
+avance (Last-Modified). reconcile() recalcule tous les compteurs en cas de dérive
+(``flask blog reconcile-counters``).
+"""
+
+from collections import Counter
+
+from sqlalchemy import bindparam, func, select, update
+
+from src.models import Article, Categorie, Commentaire, Utilisateur, db
+
+
+class CounterColumn:
+    """
+    Colonne column du parent, égale au nombre de lignes enfants dont la clé
+    étrangère foreign_key le désigne.
+    """
+
+    def __init__(self, column, foreign_key) -> None:
+        self.parent = column.class_
+        self.child = foreign_key.class_
+        self.column = self.parent.__table__.c[column.key]
+        self.foreign_key = foreign_key
+
+    def __str__(self) -> str:
+        return f"{self.parent.__tablename__}.{self.column.name}"
+
+    def apply(self, deltas: dict) -> bool:
+        """Ajoute deltas ({id parent: delta}) au compteur ; indique si une ligne a changé."""
+        params = [
+            {"_id": pk, "_delta": delta}
+            for pk, delta in sorted(deltas.items())
+            if pk is not None and delta
+        ]
+        if not params:
+            return False
+        table = self.parent.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({self.column: self.column + bindparam("_delta")})
+        )
+        db.session.execute(stmt, params)
+        return True
+
+
+COUNTERS = [
+    CounterColumn(Article.nb_commentaires, Commentaire.article_id),
+    CounterColumn(Categorie.nb_articles, Article.categorie_id),
+    CounterColumn(Utilisateur.nb_articles, Article.auteur_id),
+]
+
+
+def _counters(model) -> list:
+    return [counter for counter in COUNTERS if counter.child is model]
+
+
+def _value(row, key):
+    return row[key] if isinstance(row, dict) else getattr(row, key)
+
+
+def _adjust(model, changes: list) -> set:
+    """Applique des changements (ligne, +1/-1) ; retourne les tables modifiées."""
+    tables = set()
+    for counter in _counters(model):
+        deltas = Counter()
+        for row, sign in changes:
+            deltas[_value(row, counter.foreign_key.key)] += sign
+        if counter.apply(deltas):
+            tables.add(counter.parent.__tablename__)
+    return tables
+
+
+def inserted(model, rows: list) -> set:
+    """Compte les lignes rows (entités ou dicts) insérées dans model."""
+    return _adjust(model, [(row, 1) for row in rows])
+
+
+def updated(model, before: list, after: list) -> set:
+    """
+    Reporte les changements de clés étrangères de lignes mises à jour ;
+    before et after sont alignés (valeurs avant et après modification).
+    """
+    return _adjust(model, [(row, -1) for row in before] + [(row, 1) for row in after])
+
+
+def reassigned(model, rows: list) -> set:
+    """
+    Comme updated(), pour des dicts de modifications contenant chacun l'id de
+    la ligne ; les valeurs actuelles sont lues en base (à appeler avant l'UPDATE).
+    """
+    keys = [counter.foreign_key.key for counter in _counters(model)]
+    rows = [row for row in rows if any(key in row for key in keys)]
+    if not rows:
+        return set()
+    columns = [getattr(model, key) for key in keys]
+    stmt = select(model.id, *columns).where(model.id.in_([row["id"] for row in rows]))
+    current = {row["id"]: dict(row) for row in db.session.execute(stmt).mappings()}
+    before = [current[row["id"]] for row in rows]
+    return updated(model, before, [{**old, **row} for old, row in zip(before, rows)])
+
+
+def deleted(model, where, parent=None) -> set:
+    """
+    Décompte les lignes de model vérifiant where, avant leur suppression :
+    une requête groupée par compteur. Les compteurs de parent, dont les lignes
+    disparaissent avec celles-ci, sont laissés tels quels.
+    """
+    tables = set()
+    for counter in _counters(model):
+        if counter.parent is parent:
+            continue
+        foreign_key = counter.foreign_key
+        stmt = select(foreign_key, func.count()).where(where).group_by(foreign_key)
+        deltas = {pk: -count for pk, count in db.session.execute(stmt)}
+        if counter.apply(deltas):
+            tables.add(counter.parent.__tablename__)
+    return tables
+
+
+def reconcile(session=None) -> dict:
+    """
+    Recalcule tous les compteurs à partir des tables enfants, dans session
+    (par défaut db.session ; une connexion convient aussi).
+
+    Retourne, pour chaque compteur, le nombre de lignes corrigées.
+    """
+    session = db.session if session is None else session
+    repaired = {}
+    for counter in COUNTERS:
+        table = counter.parent.__table__
+        actual = (
+            select(func.count())
+            .where(counter.foreign_key == table.c.id)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(table)
+            .where(counter.column != actual)
+            .values({counter.column: actual})
+        )
+        repaired[str(counter)] = session.execute(stmt).rowcount
+    return repaired
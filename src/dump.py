@@ -0,0 +1,290 @@
+"""
+Import et export hors ligne des tables du blog (``flask blog export`` /
+``flask blog import``).
+
+Chaque table (utilisateurs, categories, articles, commentaires) correspond à un
+fichier ``<table>.csv`` ou ``<table>.ndjson`` d'un répertoire, avec toutes ses
+colonnes (identifiants, compteurs, versions et dates compris). Les tables sont
+traitées dans l'ordre de leurs clés étrangères (TABLES, déduit du schéma) : les
+parents sont importés avant leurs dépendants.
+
+La mémoire reste constante quelle que soit la taille des fichiers :
+    - PostgreSQL (pilote psycopg2) : ``COPY ... TO STDOUT`` / ``COPY ... FROM
+      STDIN``, le fichier étant lu ou écrit au fil de l'eau par le serveur ; un
+      NDJSON importé est converti en CSV à la volée, un NDJSON exporté est lu par
+      curseur côté serveur ;
+    - autres bases (SQLite) : lecture par lots de ``chunk`` lignes (yield_per),
+      écriture par ``INSERT`` en executemany de ``chunk`` lignes.
+
+Format CSV : une ligne d'en-tête (noms des colonnes), NULL écrit comme un champ
+vide sans guillemets, textes entre guillemets, dates en ISO 8601 : le format de
+``COPY ... (FORMAT csv)``. Hors PostgreSQL, un champ vide est importé comme NULL
+si la colonne l'accepte.
+
+L'import se fait en une transaction, dans des tables qui ne contiennent pas
+déjà les mêmes identifiants ; il recale ensuite les séquences d'identifiants
+(PostgreSQL) et les compteurs dénormalisés.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import insert, select, text
+
+from src import counters
+from src.models import Article, Categorie, Commentaire, Utilisateur, db
+
+FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK = 10_000
+
+# Tables exportables, parents avant dépendants
+TABLES = [
+    table
+    for table in db.metadata.sorted_tables
+    if table in {m.__table__ for m in (Utilisateur, Categorie, Article, Commentaire)}
+]
+TABLE_NAMES = [table.name for table in TABLES]
+
+
+def resolve(names=None) -> list:
+    """Tables désignées par names (toutes par défaut), dans l'ordre d'import."""
+    names = set(names or TABLE_NAMES)
+    unknown = names - set(TABLE_NAMES)
+    if unknown:
+        raise ValueError(f"Table(s) inconnue(s) : {', '.join(sorted(unknown))}")
+    return [table for table in TABLES if table.name in names]
+
+
+def path_for(directory: str, table, fmt: str) -> str:
+    """Fichier de la table dans directory."""
+    return os.path.join(directory, f"{table.name}.{fmt}")
+
+
+def csv_field(value) -> str:
+    """Champ CSV au sens de COPY : NULL vide, texte entre guillemets."""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def csv_line(values) -> str:
+    return ",".join(csv_field(value) for value in values) + "\n"
+
+
+class CsvStream:
+    """
+    Fichier en lecture produisant, au fil des appels à read(), les lignes CSV
+    de rows (séquences de valeurs) : ce que COPY FROM STDIN lit sans que tout le
+    fichier soit converti en mémoire.
+    """
+
+    def __init__(self, rows) -> None:
+        self._rows = iter(rows)
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = csv_line(row)
+            parts.append(line)
+            length += len(line)
+        data = "".join(parts)
+        if size < 0:
+            size = len(data)
+        self._pending = data[size:]
+        return data[:size]
+
+
+def _parsers(table, columns: list, empty_is_null: bool) -> list:
+    """
+    Convertit les valeurs lues (textes en CSV) selon le type de chaque colonne ;
+    avec empty_is_null, un texte vide devient NULL si la colonne l'accepte.
+    """
+
+    def parser(column):
+        python_type = column.type.python_type
+        nullable = column.nullable and empty_is_null
+
+        def parse(value):
+            if value is None or (value == "" and nullable):
+                return None
+            if python_type is datetime and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+                if value.tzinfo is not None:
+                    # Dates stockées en UTC (SQLite : sans fuseau)
+                    value = value.astimezone(timezone.utc)
+                return value
+            if python_type is int and not isinstance(value, int):
+                return int(value)
+            return value
+
+        return parse
+
+    unknown = [name for name in columns if name not in table.c]
+    if unknown:
+        raise ValueError(f"{table.name} : colonne(s) inconnue(s) {', '.join(unknown)}")
+    return [parser(table.c[name]) for name in columns]
+
+
+def _records(table, fmt: str, f):
+    """Retourne (colonnes, itérateur des lignes brutes) du fichier f."""
+    if fmt == "csv":
+        reader = csv.reader(f)
+        columns = next(reader, None) or []
+        return columns, reader
+    lines = (json.loads(line) for line in f if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return [], iter(())
+    columns = list(first)
+
+    def rows():
+        yield [first[name] for name in columns]
+        for record in lines:
+            yield [record.get(name) for name in columns]
+
+    return columns, rows()
+
+
+def _copy_cursor():
+    """Curseur psycopg2 de la transaction en cours, ou None si COPY est indisponible."""
+    connection = db.session.connection(bind_arguments={"bind": db.engine})
+    dialect = connection.dialect
+    if (dialect.name, dialect.driver) != ("postgresql", "psycopg2"):
+        return None
+    return connection.connection.cursor()
+
+
+def _quoted(table, columns) -> str:
+    preparer = db.engine.dialect.identifier_preparer
+    names = ", ".join(preparer.quote(name) for name in columns)
+    return f"{preparer.format_table(table)} ({names})"
+
+
+def export_table(table, f, fmt: str = "csv", chunk: int = DEFAULT_CHUNK) -> int:
+    """Écrit toutes les lignes de table dans f, par identifiant croissant."""
+    columns = [column.name for column in table.columns]
+    cursor = _copy_cursor() if fmt == "csv" else None
+    if cursor is not None:
+        query = select(*table.columns).order_by(*table.primary_key.columns)
+        sql = query.compile(db.engine, compile_kwargs={"literal_binds": True})
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+        return cursor.rowcount
+
+    if fmt == "csv":
+        f.write(",".join(columns) + "\n")
+    dumps = current_app.json.dumps
+    stmt = (
+        select(*table.columns)
+        .order_by(*table.primary_key.columns)
+        .execution_options(yield_per=chunk)
+    )
+    count = 0
+    result = db.session.execute(stmt, bind_arguments={"bind": db.engine})
+    for rows in result.partitions():
+        if fmt == "csv":
+            f.write("".join(csv_line(row) for row in rows))
+        else:
+            f.write("".join(dumps(dict(row._mapping)) + "\n" for row in rows))
+        count += len(rows)
+    return count
+
+
+def import_table(table, f, fmt: str = "csv", chunk: int = DEFAULT_CHUNK) -> int:
+    """
+    Insère les lignes du fichier f dans table, sans valider la transaction.
+
+    Lève ValueError si le fichier nomme une colonne inconnue.
+    """
+    columns, rows = _records(table, fmt, f)
+    if not columns:
+        return 0
+    parsers = _parsers(table, columns, empty_is_null=fmt == "csv")
+    cursor = _copy_cursor()
+    if cursor is not None:
+        source = f if fmt == "csv" else CsvStream(rows)
+        cursor.copy_expert(
+            f"COPY {_quoted(table, columns)} FROM STDIN WITH (FORMAT csv)", source
+        )
+        return cursor.rowcount
+
+    stmt = insert(table)
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(
+            {name: parse(value) for name, parse, value in zip(columns, parsers, row)}
+        )
+        if len(batch) >= chunk:
+            db.session.execute(stmt, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(stmt, batch)
+        count += len(batch)
+    return count
+
+
+def reset_sequence(table) -> None:
+    """Place la séquence des identifiants après le plus grand importé (PostgreSQL)."""
+    if db.engine.dialect.name != "postgresql":
+        return
+    name = table.name
+    db.session.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+            f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {name}"
+        )
+    )
+
+
+def export_all(directory: str, fmt: str = "csv", names=None, chunk=DEFAULT_CHUNK):
+    """Exporte les tables dans directory ; retourne {table: lignes}."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table in resolve(names):
+        with open(
+            path_for(directory, table, fmt), "w", encoding="utf-8", newline=""
+        ) as f:
+            counts[table.name] = export_table(table, f, fmt, chunk)
+    db.session.rollback()
+    return counts
+
+
+def import_all(directory: str, fmt: str = "csv", names=None, chunk=DEFAULT_CHUNK):
+    """
+    Importe en une transaction les fichiers de directory ; retourne {table:
+    lignes}. Sans names, importe les tables dont le fichier existe.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+    tables = resolve(names)
+    if names is None:
+        tables = [t for t in tables if os.path.exists(path_for(directory, t, fmt))]
+    counts = {}
+    try:
+        for table in tables:
+            with open(
+                path_for(directory, table, fmt), encoding="utf-8", newline=""
+            ) as f:
+                counts[table.name] = import_table(table, f, fmt, chunk)
+            reset_sequence(table)
+        counters.reconcile()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return counts
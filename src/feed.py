@@ -0,0 +1,381 @@
+"""
+Fil des derniers articles par catégorie.
+
+Le fil conserve, pour chaque catégorie, le résumé des FEED_SIZE articles les plus
+récents, triés par (date_publication, id) décroissants. Il est tenu à jour pas à
+pas par les routes d'écriture d'un article (création, modification, suppression)
+et reconstruit à la demande, catégorie par catégorie, lorsqu'il est vide
+(démarrage, expiration, écriture groupée) : une lecture du fil déjà chargé ne
+touche pas la base.
+
+Backends disponibles via FEED_TYPE :
+    memory : dictionnaire en mémoire du processus (par défaut). Chaque worker a
+        son propre fil : une écriture servie par un autre worker n'y apparaît
+        qu'après expiration (FEED_TIMEOUT secondes) ;
+    redis : ensembles triés d'un serveur compatible Redis (FEED_REDIS_URL),
+        partagés entre workers.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from src.models import db, parents_actifs, Article, Categorie
+from src.resp import RedisClient, RedisError
+
+# Champs du résumé d'un article dans le fil
+SUMMARY_FIELDS = ["id", "titre", "date_publication", "categorie_id", "auteur_id"]
+
+# Tables dont une écriture groupée ou une suppression en cascade vide le fil
+FEED_TABLES = ("articles", "categories", "utilisateurs")
+
+
+def summary(article) -> dict:
+    """Résumé d'un article (entité ou ligne), prêt à être encodé en JSON."""
+    data = {name: getattr(article, name) for name in SUMMARY_FIELDS}
+    if data["date_publication"] is not None:
+        data["date_publication"] = data["date_publication"].isoformat()
+    return data
+
+
+def sort_key(item: dict) -> tuple:
+    """Clé de tri du fil : les dates ISO d'une même base se comparent en texte."""
+    return (item["date_publication"] or "", item["id"])
+
+
+class MemoryFeed:
+    """
+    Fil en mémoire du processus, thread-safe.
+
+    Attributs:
+        size : Nombre d'articles conservés par catégorie.
+        timeout : Durée de vie (secondes) d'un fil chargé.
+    """
+
+    def __init__(self, size: int = 20, timeout: int = 300) -> None:
+        self.size = size
+        self.timeout = timeout
+        self._feeds = {}
+        self._categories = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        return self._version
+
+    def get(self, categorie_id: int):
+        with self._lock:
+            entry = self._feeds.get(categorie_id)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return list(entry[1])
+
+    def load(self, categorie_id: int, items: list, version: int) -> None:
+        with self._lock:
+            # Une écriture survenue pendant la lecture en base rend items périmé.
+            if version == self._version:
+                expires = time.monotonic() + self.timeout
+                self._feeds[categorie_id] = (expires, items[: self.size])
+
+    def add(self, item: dict) -> None:
+        with self._lock:
+            self._version += 1
+            entry = self._feeds.get(item["categorie_id"])
+            if entry is None:
+                return
+            items = [old for old in entry[1] if old["id"] != item["id"]]
+            items.append(item)
+            items.sort(key=sort_key, reverse=True)
+            self._feeds[item["categorie_id"]] = (entry[0], items[: self.size])
+
+    def remove(self, categorie_id: int, article_id: int) -> None:
+        with self._lock:
+            self._version += 1
+            entry = self._feeds.get(categorie_id)
+            if entry is None:
+                return
+            items = [item for item in entry[1] if item["id"] != article_id]
+            if len(items) < len(entry[1]) and len(entry[1]) == self.size:
+                # Le suivant n'est pas connu : le fil sera relu en base.
+                del self._feeds[categorie_id]
+            else:
+                self._feeds[categorie_id] = (entry[0], items)
+
+    def get_categories(self):
+        with self._lock:
+            entry = self._categories
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set_categories(self, categories: list) -> None:
+        with self._lock:
+            self._categories = (time.monotonic() + self.timeout, categories)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._feeds.clear()
+            self._categories = None
+
+
+class RedisFeed:
+    """
+    Fil partagé stocké sur un serveur compatible Redis.
+
+    Chaque catégorie est un ensemble trié : score = date de publication
+    (timestamp), membre = id sur 12 chiffres suivi du résumé JSON, pour départager
+    les dates égales par id. Un membre vide de score -inf marque le fil comme
+    chargé, même sans article. Les clés portent une génération, incrémentée par
+    reset() : les anciennes expirent d'elles-mêmes.
+    """
+
+    def __init__(
+        self,
+        client: RedisClient,
+        size: int = 20,
+        timeout: int = 300,
+        prefix: str = "blog:feed:",
+    ) -> None:
+        self.client = client
+        self.size = size
+        self.timeout = timeout
+        self.prefix = prefix
+
+    def _key(self, name) -> str:
+        generation = int(self.client.get(f"{self.prefix}generation") or 0)
+        return f"{self.prefix}{generation}:{name}"
+
+    @staticmethod
+    def _score(item: dict) -> str:
+        if item["date_publication"] is None:
+            return "-inf"
+        moment = datetime.fromisoformat(item["date_publication"])
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return repr(moment.timestamp())
+
+    @staticmethod
+    def _member(item: dict) -> bytes:
+        return b"%012d" % item["id"] + json.dumps(item).encode()
+
+    def version(self) -> int:
+        return int(self.client.get(f"{self.prefix}version") or 0)
+
+    def get(self, categorie_id: int):
+        members = self.client.execute(
+            "ZREVRANGE", self._key(categorie_id), 0, self.size
+        )
+        if not members:
+            return None
+        return [json.loads(member[12:]) for member in members if member]
+
+    def load(self, categorie_id: int, items: list, version: int) -> None:
+        if version != self.version():
+            return
+        key = self._key(categorie_id)
+        args = ["-inf", b""]
+        for item in items[: self.size]:
+            args += [self._score(item), self._member(item)]
+        self.client.delete(key)
+        self.client.execute("ZADD", key, *args)
+        self.client.execute("EXPIRE", key, self.timeout)
+
+    def _members(self, key: str, article_id: int) -> list:
+        prefix = b"%012d" % article_id
+        members = self.client.execute("ZREVRANGE", key, 0, self.size)
+        return [member for member in members if member.startswith(prefix)]
+
+    def add(self, item: dict) -> None:
+        self.client.incr(f"{self.prefix}version")
+        key = self._key(item["categorie_id"])
+        if not self.client.execute("EXISTS", key):
+            return
+        stale = self._members(key, item["id"])
+        if stale:
+            self.client.execute("ZREM", key, *stale)
+        self.client.execute("ZADD", key, self._score(item), self._member(item))
+        # Le marqueur (rang 0) et les size articles les plus récents sont gardés.
+        self.client.execute("ZREMRANGEBYRANK", key, 1, -(self.size + 1))
+
+    def remove(self, categorie_id: int, article_id: int) -> None:
+        self.client.incr(f"{self.prefix}version")
+        key = self._key(categorie_id)
+        members = self._members(key, article_id)
+        if not members:
+            return
+        if self.client.execute("ZCARD", key) > self.size:
+            self.client.delete(key)
+        else:
+            self.client.execute("ZREM", key, *members)
+
+    def get_categories(self):
+        raw = self.client.get(self._key("categories"))
+        return None if raw is None else json.loads(raw)
+
+    def set_categories(self, categories: list) -> None:
+        self.client.set(
+            self._key("categories"), json.dumps(categories), ex=self.timeout
+        )
+
+    def reset(self) -> None:
+        self.client.incr(f"{self.prefix}version")
+        self.client.incr(f"{self.prefix}generation")
+
+
+class ArticleFeed:
+    """
+    Extension Flask du fil des articles.
+
+    S'initialise comme le cache : ``feed.init_app(app)`` dans create_app(). Les
+    routes d'un article appellent ``feed.article_saved(article)`` ou
+    ``feed.article_deleted(categorie_id, article_id)`` après validation de la transaction, les
+    écritures groupées ``feed.invalidate(*tables)``.
+    """
+
+    def init_app(self, app) -> None:
+        """Choisit le backend d'après la configuration de l'application."""
+        app.config.setdefault("FEED_TYPE", "memory")
+        app.config.setdefault("FEED_SIZE", 20)
+        app.config.setdefault("FEED_TIMEOUT", 300)
+        app.config.setdefault("FEED_REDIS_URL", "redis://localhost:6379/0")
+
+        kind = app.config["FEED_TYPE"]
+        size, timeout = app.config["FEED_SIZE"], app.config["FEED_TIMEOUT"]
+        if kind == "memory":
+            backend = MemoryFeed(size, timeout)
+        elif kind == "redis":
+            client = RedisClient.from_url(app.config["FEED_REDIS_URL"])
+            backend = RedisFeed(client, size, timeout)
+        else:
+            raise ValueError(f"FEED_TYPE inconnu : {kind}")
+        app.extensions["article_feed"] = backend
+
+    @property
+    def backend(self):
+        """Backend de l'application courante."""
+        return current_app.extensions["article_feed"]
+
+    def _read(self, categorie_ids: list) -> dict:
+        """
+        Lit en base le fil des catégories données, en une requête servie par
+        l'index (categorie_id, date_publication).
+        """
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=Article.categorie_id,
+                order_by=(Article.date_publication.desc(), Article.id.desc()),
+            )
+            .label("rang")
+        )
+        columns = [getattr(Article, name) for name in SUMMARY_FIELDS]
+        ranked = (
+            select(*columns, rank)
+            .where(Article.categorie_id.in_(categorie_ids), *parents_actifs(Article))
+            .subquery()
+        )
+        stmt = (
+            select(*(ranked.c[name] for name in SUMMARY_FIELDS))
+            .where(ranked.c.rang <= self.backend.size)
+            .order_by(ranked.c.categorie_id, ranked.c.rang)
+        )
+        # Lu sur la base principale : un fil chargé depuis un réplica en retard
+        # resterait périmé jusqu'à son expiration.
+        rows = db.session.execute(stmt, bind_arguments={"bind": db.engine})
+        feeds = {categorie_id: [] for categorie_id in categorie_ids}
+        for row in rows:
+            feeds[row.categorie_id].append(summary(row))
+        return feeds
+
+    def _feeds(self, categorie_ids: list) -> dict:
+        """Fil de chaque catégorie, relu en base pour celles qui manquent."""
+        backend = self.backend
+        feeds = {}
+        try:
+            for categorie_id in categorie_ids:
+                feeds[categorie_id] = backend.get(categorie_id)
+            version = backend.version()
+        except (OSError, RedisError):
+            current_app.logger.warning("Fil indisponible", exc_info=True)
+            return self._read(categorie_ids)
+        missing = [key for key, items in feeds.items() if items is None]
+        if missing:
+            loaded = self._read(missing)
+            feeds.update(loaded)
+            try:
+                for categorie_id, items in loaded.items():
+                    backend.load(categorie_id, items, version)
+            except (OSError, RedisError):
+                current_app.logger.warning("Fil indisponible", exc_info=True)
+        return feeds
+
+    def categorie(self, categorie_id: int):
+        """Fil d'une catégorie, ou None si elle n'existe pas."""
+        if categorie_id not in (c["id"] for c in self.categories()):
+            return None
+        return self._feeds([categorie_id])[categorie_id]
+
+    def categories(self) -> list:
+        """Identifiant et nom de chaque catégorie, par identifiant croissant."""
+        backend = self.backend
+        try:
+            categories = backend.get_categories()
+        except (OSError, RedisError):
+            categories = None
+        if categories is None:
+            rows = db.session.execute(
+                select(Categorie.id, Categorie.nom)
+                .where(Categorie.date_suppression.is_(None))
+                .order_by(Categorie.id),
+                bind_arguments={"bind": db.engine},
+            )
+            categories = [{"id": row.id, "nom": row.nom} for row in rows]
+            try:
+                backend.set_categories(categories)
+            except (OSError, RedisError):
+                pass
+        return categories
+
+    def all(self) -> list:
+        """Chaque catégorie avec son fil."""
+        categories = self.categories()
+        feeds = self._feeds([c["id"] for c in categories])
+        return [{**c, "articles": feeds[c["id"]]} for c in categories]
+
+    def _apply(self, method: str, *args) -> None:
+        try:
+            getattr(self.backend, method)(*args)
+        except (OSError, RedisError):
+            # Un fil resté chargé serait périmé : on tente de le vider.
+            current_app.logger.warning("Mise à jour du fil impossible", exc_info=True)
+            self.invalidate("articles")
+
+    def article_saved(self, article, categorie_id: int = None) -> None:
+        """
+        Ajoute (ou remplace) l'article dans le fil de sa catégorie ; categorie_id
+        est son ancienne catégorie s'il en a changé.
+        """
+        if categorie_id is not None and categorie_id != article.categorie_id:
+            self._apply("remove", categorie_id, article.id)
+        self._apply("add", summary(article))
+
+    def article_deleted(self, categorie_id: int, article_id: int) -> None:
+        """Retire l'article du fil de sa catégorie."""
+        self._apply("remove", categorie_id, article_id)
+
+    def invalidate(self, *tables: str) -> None:
+        """Vide le fil si les tables modifiées en masse le concernent."""
+        if not set(tables) & set(FEED_TABLES):
+            return
+        try:
+            self.backend.reset()
+        except (OSError, RedisError):
+            current_app.logger.warning("Fil impossible à vider", exc_info=True)
+
+
+feed = ArticleFeed()
@@ -0,0 +1,165 @@
+"""
+Filtres, tri et projection des routes de liste.
+
+Exemple : ``?categorie_id=3&auteur_id=7&since=2026-01-01&sort=-date_publication
+&fields=id,titre``. Les filtres deviennent des clauses ``WHERE``, ``sort`` la clé
+de tri de la pagination par curseur et ``fields`` une sélection de colonnes.
+
+Les listes lisent des lignes de colonnes plutôt que des entités : ni identity
+map ni objets ORM à construire, et les lignes sont encodées directement en JSON.
+Sans ``fields``, la sélection comprend tous les champs de to_dict().
+"""
+
+from datetime import datetime, timezone
+
+from flask import abort, request
+
+from src.models import parents_actifs
+
+
+class Partial:
+    """
+    Ligne de colonnes d'une route de liste (tous les champs, ou ceux de ?fields=).
+
+    Se comporte comme une entité pour la pagination (attributs), l'ETag
+    (table, id, version) et la sérialisation (to_dict). Les dates sont laissées
+    telles quelles : le fournisseur JSON les écrit en ISO 8601 (src.serialization).
+    """
+
+    __slots__ = ("_row", "_fields", "__tablename__")
+
+    def __init__(self, row, tablename: str, fields: list) -> None:
+        self._row = row
+        self._fields = fields
+        self.__tablename__ = tablename
+
+    def __getattr__(self, name):
+        return getattr(self._row, name)
+
+    def to_dict(self) -> dict:
+        """Retourne les champs de la ligne, avec les clés de to_dict()."""
+        mapping = self._row._mapping
+        return {name: mapping[name] for name in self._fields}
+
+
+class ListQuery:
+    """
+    Paramètres de liste acceptés par une ressource.
+
+    Attributs:
+        model : Modèle interrogé.
+        fields : Champs sélectionnables par ?fields= (clés de to_dict()).
+        filters : Colonnes filtrables par égalité (?col=v ou ?col=v1,v2).
+        date : Colonne bornée par ?since= (incluse) et ?until= (exclue).
+        sortable : Colonnes acceptées par ?sort= ; seules celles servies par un
+            index sont proposées.
+        default_sort : Clé de tri par défaut, liste de couples (colonne, descendant).
+    """
+
+    def __init__(
+        self,
+        model,
+        fields: list,
+        default_sort: list,
+        filters: list = (),
+        date: str = None,
+        sortable: list = ("id",),
+    ) -> None:
+        self.model = model
+        self.fields = list(fields)
+        self.default_sort = default_sort
+        self.filters = {name: getattr(model, name) for name in filters}
+        self.date = getattr(model, date) if date else None
+        self.sortable = {name: getattr(model, name) for name in sortable}
+
+    def conditions(self) -> list:
+        """Traduit les filtres de la requête en clauses WHERE."""
+        clauses = []
+        for name, column in self.filters.items():
+            raw = request.args.get(name)
+            if raw is None:
+                continue
+            try:
+                values = [column.type.python_type(v) for v in raw.split(",")]
+            except ValueError:
+                abort(400, description=f"Valeur invalide pour {name}.")
+            clauses.append(
+                column == values[0] if len(values) == 1 else column.in_(values)
+            )
+        if self.date is not None:
+            since = self._parse_date("since")
+            until = self._parse_date("until")
+            if since is not None:
+                clauses.append(self.date >= since)
+            if until is not None:
+                clauses.append(self.date < until)
+        return clauses
+
+    def _parse_date(self, name: str):
+        raw = request.args.get(name)
+        if raw is None:
+            return None
+        try:
+            value = datetime.fromisoformat(raw)
+        except ValueError:
+            abort(400, description=f"Date invalide pour {name} (format ISO 8601).")
+        # Les dates sont stockées en UTC.
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def sort_keys(self) -> list:
+        """
+        Lit ?sort=champ,-champ et retourne la clé de tri correspondante,
+        complétée par l'id pour la rendre unique (pagination par curseur).
+        """
+        raw = request.args.get("sort")
+        if not raw:
+            return self.default_sort
+        keys = []
+        for name in raw.split(","):
+            descending = name.startswith("-")
+            column = self.sortable.get(name.lstrip("-"))
+            if column is None:
+                allowed = ", ".join(self.sortable)
+                abort(
+                    400, description=f"Tri impossible sur {name} (permis : {allowed})."
+                )
+            keys.append((column, descending))
+        if not any(column.key == "id" for column, _ in keys):
+            # Même sens que la dernière colonne : comparaison de tuples possible.
+            keys.append((self.model.id, keys[-1][1]))
+        return keys
+
+    def requested_fields(self) -> list:
+        """Lit ?fields= et renvoie 400 si un champ est inconnu."""
+        fields = [name for name in request.args.get("fields", "").split(",") if name]
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            abort(400, description=f"Champs inconnus : {', '.join(sorted(unknown))}.")
+        return list(dict.fromkeys(fields))
+
+    def apply(self, stmt):
+        """
+        Applique filtres, tri et projection à stmt (un select() du modèle).
+
+        Retourne (requête, clé de tri, wrap) : la requête sélectionne des
+        colonnes et wrap construit un Partial à partir de chaque ligne.
+        """
+        # Lignes dont un parent attend sa suppression masquées (voir src.jobs)
+        stmt = stmt.where(*self.conditions(), *parents_actifs(self.model))
+        keys = self.sort_keys()
+        fields = self.requested_fields() or self.fields
+
+        # id et version servent à l'ETag, les colonnes de tri au curseur.
+        names = ["id", "version", *fields, *(column.key for column, _ in keys)]
+        columns = [getattr(self.model, name) for name in dict.fromkeys(names)]
+        tablename = self.model.__tablename__
+        if fields != self.fields:
+            # Distingue l'ETag d'une projection de celui de la liste complète.
+            tablename = f"{tablename}({','.join(fields)})"
+        return (
+            stmt.with_only_columns(*columns),
+            keys,
+            lambda row: Partial(row, tablename, fields),
+        )
@@ -0,0 +1,129 @@
+"""
+Mesures par requête : durée, nombre de requêtes SQL, temps passé en base et
+lignes renvoyées.
+
+Les mesures alimentent les histogrammes exposés sur ``GET /metrics`` (par
+endpoint) et l'en-tête ``Server-Timing`` de chaque réponse, lisible dans les
+outils de développement du navigateur :
+
+    Server-Timing: db;dur=3.2;desc="4 SQL", app;dur=11.8
+
+Avec ``QUERY_COUNT_WARNING`` > 0, une requête HTTP qui exécute plus de
+requêtes SQL émet un avertissement TooManyQueriesWarning (journal et module
+warnings) : un N+1 introduit par une modification apparaît dans les tests.
+
+Le corps des réponses en flux (NDJSON) est produit après la mesure : ses
+requêtes n'y figurent pas.
+"""
+
+import time
+import warnings
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.metrics import Histogram
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Durée de traitement des requêtes HTTP, par endpoint.",
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Requêtes SQL exécutées par requête HTTP.",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Temps passé en base par requête HTTP.",
+)
+REQUEST_ROWS = Histogram(
+    "http_request_db_rows",
+    "Lignes renvoyées ou modifiées par requête HTTP (rowcount du pilote).",
+    buckets=(0, 1, 10, 50, 100, 200, 500, 1000, 5000, 10000),
+)
+
+
+class TooManyQueriesWarning(UserWarning):
+    """Une requête HTTP a dépassé QUERY_COUNT_WARNING requêtes SQL."""
+
+
+class RequestStats:
+    """Compteurs de la requête HTTP en cours (g.request_stats)."""
+
+    __slots__ = ("start", "queries", "db_time", "rows")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+
+
+def _current_stats():
+    return g.get("request_stats") if has_request_context() else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    starts = conn.info.get("query_start")
+    if stats is None or not starts:
+        return
+    stats.db_time += time.perf_counter() - starts.pop()
+    stats.queries += 1
+    # rowcount vaut -1 lorsque le pilote ne le connaît pas (SELECT sous SQLite).
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def start_request() -> None:
+    """Démarre la mesure de la requête."""
+    g.request_stats = RequestStats()
+
+
+def record_request(response):
+    """Enregistre les mesures de la requête et ajoute l'en-tête Server-Timing."""
+    stats = g.pop("request_stats", None)
+    if stats is None:
+        return response
+    duration = time.perf_counter() - stats.start
+    endpoint = request.endpoint or "<inconnu>"
+    REQUEST_LATENCY.observe(
+        duration,
+        endpoint=endpoint,
+        method=request.method,
+        status=response.status_code,
+    )
+    REQUEST_QUERIES.observe(stats.queries, endpoint=endpoint)
+    REQUEST_DB_TIME.observe(stats.db_time, endpoint=endpoint)
+    REQUEST_ROWS.observe(stats.rows, endpoint=endpoint)
+
+    if current_app.config["SERVER_TIMING"]:
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} SQL", '
+            f"app;dur={duration * 1000:.1f}"
+        )
+
+    threshold = current_app.config["QUERY_COUNT_WARNING"]
+    if threshold and stats.queries > threshold:
+        message = (
+            f"{request.method} {request.path} ({endpoint}) a exécuté "
+            f"{stats.queries} requêtes SQL (seuil : {threshold})."
+        )
+        current_app.logger.warning(message)
+        warnings.warn(message, TooManyQueriesWarning)
+    return response
+
+
+def init_app(app) -> None:
+    """Installe la mesure des requêtes sur app."""
+    app.before_request(start_request)
+    app.after_request(record_request)
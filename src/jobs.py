@@ -0,0 +1,246 @@
+"""
+Tâches de fond : suppression différée des utilisateurs et des catégories, calcul
+des statistiques (voir src/stats.py).
+
+Supprimer un auteur prolifique ou une grosse catégorie dans la requête HTTP peut
+dépasser les délais. En mode différé (en-tête ``Prefer: respond-async``, ou
+DELETE_ASYNC), la ligne est seulement marquée (date_suppression) et masquée par
+l'API, une Tache est enregistrée et la réponse 202 donne son adresse
+(``GET /jobs/<id>``). La purge supprime ensuite les dépendants par lots de
+JOBS_BATCH_SIZE lignes, une transaction par lot, puis la ligne elle-même.
+
+Exécution via JOBS_WORKER :
+    thread : un thread de l'application traite les tâches (par défaut). Sous la
+        pile ASGI avec un pilote asynchrone, les tâches s'exécutent plutôt dans
+        la boucle d'évènements des requêtes, dont elles partagent les connexions ;
+    external : les tâches attendent ``flask --app src.app blog run-jobs``
+        (processus séparé ou tâche planifiée).
+"""
+
+import asyncio
+import queue
+import threading
+
+from flask import current_app, jsonify, request, url_for
+from sqlalchemy import func, select, update
+from sqlalchemy.util import await_only, greenlet_spawn
+from sqlalchemy.util.concurrency import in_greenlet
+
+from src.bulk import cascade_delete
+from src.cache import cache
+from src.feed import feed
+from src.models import db, run_sync, Categorie, Tache, Utilisateur
+from src.stats import refresh
+
+# Tables dont la suppression peut être différée
+MODELS = {model.__tablename__: model for model in (Utilisateur, Categorie)}
+
+
+def wants_async() -> bool:
+    """Indique si le client (ou la configuration) demande une suppression différée."""
+    prefer = request.headers.get("Prefer", "")
+    return current_app.config.get("DELETE_ASYNC", False) or "respond-async" in prefer
+
+
+def schedule_delete(obj):
+    """
+    Marque obj comme supprimé, enregistre la tâche de purge et retourne la
+    réponse 202 qui la décrit.
+    """
+    obj.date_suppression = func.now()
+    tache = Tache(operation="suppression", cible=obj.__tablename__, cible_id=obj.id)
+    db.session.add(tache)
+    db.session.commit()
+    jobs.submit(tache.id)
+    response = jsonify(tache.to_dict())
+    response.status_code = 202
+    response.headers["Location"] = url_for("jobs.get_job", job_id=tache.id)
+    response.headers["Preference-Applied"] = "respond-async"
+    return response
+
+
+def schedule_refresh():
+    """
+    Enregistre et soumet une tâche de calcul des statistiques, sauf si une autre
+    attend déjà ; retourne la Tache créée, ou None.
+    """
+    pending = db.session.scalar(
+        select(Tache.id)
+        .where(
+            Tache.operation == "rafraichissement",
+            Tache.statut.in_(("en_attente", "en_cours")),
+        )
+        .limit(1)
+    )
+    if pending is not None:
+        return None
+    tache = Tache(operation="rafraichissement", cible="statistiques", cible_id=0)
+    db.session.add(tache)
+    db.session.commit()
+    jobs.submit(tache.id)
+    return tache
+
+
+def purge(tache: Tache, batch_size: int) -> None:
+    """
+    Supprime la cible de tache et ses dépendants par lots de batch_size lignes
+    (DELETE ensemblistes), en validant chaque lot.
+    """
+    model = MODELS[tache.cible]
+    for relationship in model.__mapper__.relationships:
+        if not relationship.cascade.delete:
+            continue
+        child = relationship.mapper.class_
+        (foreign_key,) = relationship.remote_side
+        while True:
+            ids = db.session.scalars(
+                select(child.id)
+                .where(foreign_key == tache.cible_id)
+                .order_by(child.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            tables = cascade_delete(child, child.id.in_(ids))
+            tache.lignes += len(ids)
+            db.session.commit()
+            cache.invalidate(*tables)
+            feed.invalidate(child.__tablename__)
+    tables = cascade_delete(model, model.id == tache.cible_id)
+    db.session.commit()
+    cache.invalidate(*tables)
+    feed.invalidate(model.__tablename__)
+
+
+def run_job(job_id: int, statuts=("en_attente",)) -> bool:
+    """
+    Exécute la tâche job_id si son statut figure dans statuts ; retourne False si
+    elle est déjà prise (par un autre worker) ou inexistante.
+    """
+    claimed = db.session.execute(
+        update(Tache)
+        .where(Tache.id == job_id, Tache.statut.in_(statuts))
+        .values(statut="en_cours")
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return False
+    tache = db.session.get(Tache, job_id)
+    try:
+        if tache.operation == "rafraichissement":
+            refresh()
+        else:
+            purge(tache, current_app.config["JOBS_BATCH_SIZE"])
+        tache.statut = "terminee"
+    except Exception as e:
+        current_app.logger.exception("Échec de la tâche %s", job_id)
+        db.session.rollback()
+        tache.statut = "echec"
+        tache.erreur = str(e)
+    tache.date_fin = func.now()
+    db.session.commit()
+    return True
+
+
+def run_pending(resume: bool = False) -> list:
+    """
+    Exécute les tâches en attente (et, si resume, celles interrompues en cours
+    de route) ; retourne leurs identifiants.
+    """
+    statuts = ("en_attente", "en_cours") if resume else ("en_attente",)
+    ids = db.session.scalars(
+        select(Tache.id).where(Tache.statut.in_(statuts)).order_by(Tache.id)
+    ).all()
+    return [job_id for job_id in ids if run_job(job_id, statuts)]
+
+
+class JobWorker:
+    """
+    File des tâches d'une application, traitée par un thread démarré à la demande,
+    ou par la boucle d'évènements de la requête avec un pilote asynchrone.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.queue = queue.Queue()
+        self._thread = None
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: int) -> None:
+        if in_greenlet() and db.engine.dialect.is_async:
+            # Requête ASGI : les connexions du pilote sont attachées à cette boucle
+            task = asyncio.get_running_loop().create_task(
+                greenlet_spawn(self._execute, job_id)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="blog-jobs", daemon=True
+                )
+                self._thread.start()
+        self.queue.put(job_id)
+
+    def join(self) -> None:
+        """Attend que les tâches soumises soient terminées."""
+        self.queue.join()
+        if self._tasks:
+            await_only(asyncio.wait(list(self._tasks)))
+
+    def _execute(self, job_id: int) -> None:
+        try:
+            with self.app.app_context():
+                try:
+                    run_sync(run_job, job_id)
+                finally:
+                    db.session.remove()
+        except Exception:
+            self.app.logger.exception("Tâche %s abandonnée", job_id)
+
+    def _run(self) -> None:
+        while True:
+            job_id = self.queue.get()
+            try:
+                self._execute(job_id)
+            finally:
+                self.queue.task_done()
+
+
+class JobQueue:
+    """
+    Extension Flask des tâches de fond.
+
+    S'initialise comme le cache : ``jobs.init_app(app)`` dans create_app(), puis
+    ``jobs.submit(tache.id)`` après avoir enregistré une Tache.
+    """
+
+    def init_app(self, app) -> None:
+        """Choisit le mode d'exécution d'après la configuration de l'application."""
+        app.config.setdefault("DELETE_ASYNC", False)
+        app.config.setdefault("JOBS_WORKER", "thread")
+        app.config.setdefault("JOBS_BATCH_SIZE", 1000)
+
+        kind = app.config["JOBS_WORKER"]
+        if kind == "thread":
+            worker = JobWorker(app)
+        elif kind == "external":
+            worker = None
+        else:
+            raise ValueError(f"JOBS_WORKER inconnu : {kind}")
+        app.extensions["jobs"] = worker
+
+    @property
+    def worker(self):
+        """Worker de l'application courante (None : exécution externe)."""
+        return current_app.extensions["jobs"]
+
+    def submit(self, job_id: int) -> None:
+        """Confie la tâche au worker de l'application, s'il y en a un."""
+        if self.worker is not None:
+            self.worker.submit(job_id)
+
+
+jobs = JobQueue()
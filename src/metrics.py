@@ -0,0 +1,152 @@
+"""
+Métriques de l'application, exposées au format texte de Prometheus sur
+``GET /metrics``.
+
+Les compteurs et histogrammes sont tenus en mémoire du processus (un jeu par
+worker) ; les jauges sont calculées à la lecture par une fonction de rappel.
+"""
+
+import threading
+
+from flask import Blueprint, Response
+
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bornes par défaut des histogrammes, en secondes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REGISTRY = []
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", r"\\").replace('"', r"\""))
+        for k, v in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Métrique nommée, enregistrée dans REGISTRY à sa création."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self) -> list:
+        """Retourne les échantillons : liste de (suffixe, labels, valeur)."""
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_labels(labels)} {_number(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Compteur monotone, éventuellement ventilé par labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        super().__init__(name, help)
+        self.values = {}
+
+    def inc(self, amount=1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self.lock:
+            return [("_total", dict(key), value) for key, value in self.values.items()]
+
+
+class Histogram(Metric):
+    """Distribution de valeurs (durées en secondes), par tranches cumulées."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # Par jeu de labels : [effectif de chaque tranche..., nombre, somme]
+        self.values = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def count(self, **labels) -> int:
+        """Nombre d'observations pour labels."""
+        with self.lock:
+            state = self.values.get(tuple(sorted(labels.items())))
+            return state[-2] if state else 0
+
+    def samples(self) -> list:
+        samples = []
+        with self.lock:
+            for key, state in self.values.items():
+                labels = dict(key)
+                for bound, count in zip(self.buckets, state):
+                    samples.append(("_bucket", {**labels, "le": _number(bound)}, count))
+                samples.append(("_bucket", {**labels, "le": "+Inf"}, state[-2]))
+                samples.append(("_count", labels, state[-2]))
+                samples.append(("_sum", labels, state[-1]))
+        return samples
+
+
+class Gauge(Metric):
+    """
+    Jauge calculée à la lecture : callback() retourne une valeur, ou une liste
+    de couples (labels, valeur), ou None si la mesure est indisponible.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback) -> None:
+        super().__init__(name, help)
+        self.callback = callback
+
+    def samples(self) -> list:
+        value = self.callback()
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            value = [({}, value)]
+        return [("", labels, v) for labels, v in value]
+
+
+def render() -> str:
+    """Retourne toutes les métriques au format texte de Prometheus."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Expose les métriques du processus (format Prometheus)."""
+    return Response(render(), mimetype=PROMETHEUS_MIMETYPE)
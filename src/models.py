@@ -2,15 +2,167 @@
 Définition des modèles de données pour le projet.
 
 Ce module définit les entités Utilisateur, Categorie, Article et Commentaire,
-leurs relations et leur méthode de sérialisation.
+leurs relations et leur méthode de sérialisation, ainsi que les tâches de fond
+(Tache) et les vues de statistiques (Rafraichissement).
 """
 
+import asyncio
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import MANYTOONE, declared_attr
+from sqlalchemy.util import greenlet_spawn
+from sqlalchemy.util.concurrency import in_greenlet
+
+from src.replicas import RoutingSession
+
+# Les lectures des requêtes GET peuvent être routées vers un réplica (src/replicas.py).
+# La session ne vit que le temps d'une requête : les entités restent chargées après
+# le commit, si bien que la réponse est construite sans les relire.
+db = SQLAlchemy(session_options={"class_": RoutingSession, "expire_on_commit": False})
+
+# Type des horodatages. Sous SQLite, CURRENT_TIMESTAMP stocke "AAAA-MM-JJ HH:MM:SS" :
+# on aligne le format des paramètres liés pour que les comparaisons (curseurs de
+# pagination notamment) portent sur des chaînes de même forme.
+Horodatage = db.TIMESTAMP(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
+def cascade_key(target: str, name: str):
+    """
+    Clé étrangère dont les lignes dépendantes sont supprimées (et renumérotées)
+    par la base avec la ligne référencée, comme dans docs/script_sql.sql.
+    """
+    return db.ForeignKey(target, name=name, ondelete="CASCADE", onupdate="CASCADE")
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """
+    SQLite ne vérifie les clés étrangères, et n'applique leurs cascades, qu'une
+    fois activées sur chaque connexion (pysqlite comme aiosqlite).
+    """
+    module = type(dbapi_connection).__module__
+    if module.startswith(("sqlite3", "sqlalchemy.dialects.sqlite")):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def run_sync(fn, *args, **kwargs):
+    """
+    Appelle fn, qui accède à la base, depuis du code synchrone (commande, thread).
+
+    Avec un pilote asynchrone (aiosqlite, asyncpg), les accès à la base doivent
+    passer par un greenlet (greenlet_spawn) : hors d'un tel greenlet, fn est
+    exécutée dans une boucle d'évènements créée pour l'appel, puis la session et
+    les connexions ouvertes, attachées à cette boucle, sont fermées.
+    """
+    if not db.engine.dialect.is_async or in_greenlet():
+        return fn(*args, **kwargs)
+
+    def call():
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+
+    return asyncio.run(greenlet_spawn(call))
+
+
+class Versionne:
+    """
+    Colonnes de suivi des modifications, communes à tous les modèles.
 
-db = SQLAlchemy()
+    Attributs:
+        version : Numéro de version, incrémenté par SQLAlchemy à chaque UPDATE
+            (verrouillage optimiste, base des ETag).
+        date_modification : Date de la dernière modification (Last-Modified).
+    """
 
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+    date_modification = db.Column(
+        Horodatage, server_default=db.func.now(), onupdate=db.func.now()
+    )
 
-class Utilisateur(db.Model):
+    # eager_defaults : les valeurs calculées par la base (dates, compteurs) sont
+    # lues par INSERT/UPDATE ... RETURNING, dans la même requête que l'écriture.
+    @declared_attr
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.__table__.c.version, "eager_defaults": True}
+
+
+class Supprimable:
+    """
+    Suppression différée (voir src/jobs.py) : la ligne est d'abord marquée, puis
+    purgée avec ses dépendants par une tâche de fond. Une ligne marquée est
+    masquée par l'API.
+
+    Attributs:
+        date_suppression : Date de la demande de suppression, ou None.
+    """
+
+    date_suppression = db.Column(Horodatage)
+
+
+def actif(obj):
+    """Retourne obj, ou None s'il n'existe pas ou attend sa suppression."""
+    if obj is None or getattr(obj, "date_suppression", None) is not None:
+        return None
+    return obj
+
+
+def parents_actifs(model) -> list:
+    """
+    Clauses WHERE écartant les lignes de model dont un parent, direct ou
+    indirect, attend sa suppression : les articles d'un auteur ou d'une catégorie
+    marqués, et les commentaires de ces articles, restent masqués jusqu'à la purge.
+    """
+    clauses = []
+    for relationship in model.__mapper__.relationships:
+        if relationship.direction is not MANYTOONE:
+            continue
+        parent = relationship.mapper.class_
+        conditions = parents_actifs(parent)
+        if issubclass(parent, Supprimable):
+            conditions.append(parent.date_suppression.is_(None))
+        if conditions:
+            (foreign_key,) = relationship.local_columns
+            clauses.append(
+                db.select(parent.id)
+                .where(parent.id == foreign_key, *conditions)
+                .correlate_except(parent)
+                .exists()
+            )
+    return clauses
+
+
+def references_exist(*references) -> tuple:
+    """
+    Indique, pour chaque couple (modèle, id), si la ligne existe et n'attend pas sa
+    suppression, ni aucun de ses parents ; toutes les références sont vérifiées
+    par une seule requête.
+    """
+    columns = []
+    for model, pk in references:
+        conditions = [model.id == pk, *parents_actifs(model)]
+        if issubclass(model, Supprimable):
+            conditions.append(model.date_suppression.is_(None))
+        columns.append(db.select(model.id).where(*conditions).exists())
+    if not columns:
+        return ()
+    return tuple(db.session.execute(db.select(*columns)).one())
+
+
+class Utilisateur(Versionne, Supprimable, db.Model):
     """
     Modèle Utilisateur.
 
@@ -18,19 +170,28 @@ class Utilisateur(db.Model):
         id : Identifiant unique.
         nom : Nom de l'utilisateur.
         email : Email unique de l'utilisateur.
+        nb_articles : Nombre d'articles de l'utilisateur (voir src/counters.py).
     """
 
     __tablename__ = "utilisateurs"
     id = db.Column(db.Integer, primary_key=True)
     nom = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(150), nullable=False, unique=True)
+    nb_articles = db.Column(db.Integer, nullable=False, server_default="0")
 
     # Relations
+    # Dépendants supprimés par la base (ON DELETE CASCADE), sans chargement
     articles = db.relationship(
-        "Article", back_populates="utilisateur", cascade="all, delete-orphan"
+        "Article",
+        back_populates="utilisateur",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     commentaires = db.relationship(
-        "Commentaire", back_populates="utilisateur", cascade="all, delete-orphan"
+        "Commentaire",
+        back_populates="utilisateur",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __init__(self, nom: str, email: str) -> None:
@@ -40,10 +201,15 @@ class Utilisateur(db.Model):
 
     def to_dict(self) -> dict:
         """Retourne une représentation dictionnaire de l'utilisateur."""
-        return {"id": self.id, "nom": self.nom, "email": self.email}
+        return {
+            "id": self.id,
+            "nom": self.nom,
+            "email": self.email,
+            "nb_articles": self.nb_articles,
+        }
 
 
-class Categorie(db.Model):
+class Categorie(Versionne, Supprimable, db.Model):
     """
     Modèle Categorie.
 
@@ -51,16 +217,21 @@ class Categorie(db.Model):
         id : Identifiant unique.
         nom : Nom unique de la catégorie.
         description : Description facultative.
+        nb_articles : Nombre d'articles de la catégorie (voir src/counters.py).
     """
 
     __tablename__ = "categories"
     id = db.Column(db.Integer, primary_key=True)
     nom = db.Column(db.String(100), nullable=False, unique=True)
     description = db.Column(db.Text)
+    nb_articles = db.Column(db.Integer, nullable=False, server_default="0")
 
-    # Relation: une catégorie contient plusieurs articles
+    # Relation: une catégorie contient plusieurs articles (supprimés par la base)
     articles = db.relationship(
-        "Article", back_populates="categorie", cascade="all, delete-orphan"
+        "Article",
+        back_populates="categorie",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __init__(self, nom: str, description: str = "") -> None:
@@ -70,10 +241,15 @@ class Categorie(db.Model):
 
     def to_dict(self) -> dict:
         """Retourne une représentation dictionnaire de la catégorie."""
-        return {"id": self.id, "nom": self.nom, "description": self.description}
+        return {
+            "id": self.id,
+            "nom": self.nom,
+            "description": self.description,
+            "nb_articles": self.nb_articles,
+        }
 
 
-class Article(db.Model):
+class Article(Versionne, db.Model):
     """
     Modèle Article.
 
@@ -84,23 +260,48 @@ class Article(db.Model):
         date_publication : Date de publication (définie par défaut).
         categorie_id : Clé étrangère vers Categorie.
         auteur_id : Clé étrangère vers Utilisateur.
+        nb_commentaires : Nombre de commentaires (voir src/counters.py).
     """
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # Liste globale triée par (date_publication, id) et pagination par curseur
+        db.Index("ix_articles_date_publication_id", "date_publication", "id"),
+        # Articles d'une catégorie par date ; couvre aussi la clé étrangère seule
+        db.Index(
+            "ix_articles_categorie_id_date_publication",
+            "categorie_id",
+            "date_publication",
+        ),
+        # Articles d'un auteur par date ; couvre aussi la clé étrangère seule
+        db.Index(
+            "ix_articles_auteur_id_date_publication", "auteur_id", "date_publication"
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     titre = db.Column(db.String(255), nullable=False)
     contenu = db.Column(db.Text)
-    date_publication = db.Column(
-        db.TIMESTAMP(timezone=True), server_default=db.func.now()
+    date_publication = db.Column(Horodatage, server_default=db.func.now())
+    categorie_id = db.Column(
+        db.Integer,
+        cascade_key("categories.id", "fk_articles_categories"),
+        nullable=False,
+    )
+    auteur_id = db.Column(
+        db.Integer,
+        cascade_key("utilisateurs.id", "fk_articles_utilisateurs"),
+        nullable=False,
     )
-    categorie_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=False)
-    auteur_id = db.Column(db.Integer, db.ForeignKey("utilisateurs.id"), nullable=False)
+    nb_commentaires = db.Column(db.Integer, nullable=False, server_default="0")
 
     # Relations
     categorie = db.relationship("Categorie", back_populates="articles")
     utilisateur = db.relationship("Utilisateur", back_populates="articles")
     commentaires = db.relationship(
-        "Commentaire", back_populates="article", cascade="all, delete-orphan"
+        "Commentaire",
+        back_populates="article",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __init__(
@@ -123,10 +324,11 @@ class Article(db.Model):
             ),
             "categorie_id": self.categorie_id,
             "auteur_id": self.auteur_id,
+            "nb_commentaires": self.nb_commentaires,
         }
 
 
-class Commentaire(db.Model):
+class Commentaire(Versionne, db.Model):
     """
     Modèle Commentaire.
 
@@ -139,13 +341,29 @@ class Commentaire(db.Model):
     """
 
     __tablename__ = "commentaires"
+    __table_args__ = (
+        db.Index("ix_commentaires_date_commentaire_id", "date_commentaire", "id"),
+        # Commentaires d'un article par date ; couvre aussi la clé étrangère seule
+        db.Index(
+            "ix_commentaires_article_id_date_commentaire",
+            "article_id",
+            "date_commentaire",
+        ),
+        db.Index("ix_commentaires_auteur_id", "auteur_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     contenu = db.Column(db.Text, nullable=False)
-    date_commentaire = db.Column(
-        db.TIMESTAMP(timezone=True), server_default=db.func.now()
+    date_commentaire = db.Column(Horodatage, server_default=db.func.now())
+    article_id = db.Column(
+        db.Integer,
+        cascade_key("articles.id", "fk_commentaires_articles"),
+        nullable=False,
+    )
+    auteur_id = db.Column(
+        db.Integer,
+        cascade_key("utilisateurs.id", "fk_commentaires_utilisateurs"),
+        nullable=False,
     )
-    article_id = db.Column(db.Integer, db.ForeignKey("articles.id"), nullable=False)
-    auteur_id = db.Column(db.Integer, db.ForeignKey("utilisateurs.id"), nullable=False)
 
     # Relations
     article = db.relationship("Article", back_populates="commentaires")
@@ -168,3 +386,300 @@ class Commentaire(db.Model):
             "article_id": self.article_id,
             "auteur_id": self.auteur_id,
         }
+
+
+class Tache(db.Model):
+    """
+    Modèle Tache : opération longue exécutée en arrière-plan (voir src/jobs.py).
+
+    Attributs:
+        id : Identifiant unique.
+        operation : Nature de la tâche (« suppression » ou « rafraichissement »).
+        cible : Table de la ligne visée (« statistiques » pour un calcul).
+        cible_id : Identifiant de la ligne visée (0 pour un calcul).
+        statut : en_attente, en_cours, terminee ou echec.
+        lignes : Dépendants directs supprimés jusqu'ici.
+        erreur : Message d'erreur en cas d'échec.
+        date_creation : Date de création de la tâche.
+        date_fin : Date de fin (succès ou échec).
+    """
+
+    __tablename__ = "taches"
+    id = db.Column(db.Integer, primary_key=True)
+    operation = db.Column(db.String(50), nullable=False)
+    cible = db.Column(db.String(50), nullable=False)
+    cible_id = db.Column(db.Integer, nullable=False)
+    statut = db.Column(db.String(20), nullable=False, server_default="en_attente")
+    lignes = db.Column(db.Integer, nullable=False, server_default="0")
+    erreur = db.Column(db.Text)
+    date_creation = db.Column(Horodatage, server_default=db.func.now())
+    date_fin = db.Column(Horodatage)
+
+    def to_dict(self) -> dict:
+        """Retourne une représentation dictionnaire de la tâche."""
+        return {
+            "id": self.id,
+            "operation": self.operation,
+            "cible": self.cible,
+            "cible_id": self.cible_id,
+            "statut": self.statut,
+            "lignes": self.lignes,
+            "erreur": self.erreur,
+            "date_creation": (
+                self.date_creation.isoformat() if self.date_creation else None
+            ),
+            "date_fin": self.date_fin.isoformat() if self.date_fin else None,
+        }
+
+
+class Rafraichissement(db.Model):
+    """
+    Modèle Rafraichissement : dernier calcul d'une vue de statistiques (voir
+    src/stats.py).
+
+    Attributs:
+        vue : Nom de la vue matérialisée (ou table de synthèse).
+        date_rafraichissement : Date du dernier rafraîchissement.
+        duree_ms : Durée du dernier rafraîchissement, en millisecondes.
+    """
+
+    __tablename__ = "stats_rafraichissements"
+    vue = db.Column(db.String(50), primary_key=True)
+    date_rafraichissement = db.Column(Horodatage)
+    duree_ms = db.Column(db.Integer)
+
+
+# Recherche plein texte sur Article.titre / Article.contenu (voir src/search.py).
+# Ces objets n'étant pas mappés, ils sont créés avec la table articles :
+# - PostgreSQL : colonne tsvector générée, indexée en GIN ;
+# - SQLite : table virtuelle FTS5 à contenu externe (et ses tables internes
+#   articles_fts_*), tenue à jour par triggers.
+# L'autogénération des migrations les ignore (voir include_object).
+FTS_CONFIG = "french"
+
+ARTICLES_FTS_POSTGRESQL = [
+    f"""
+    ALTER TABLE articles ADD COLUMN recherche tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{FTS_CONFIG}', coalesce(titre, '')), 'A')
+        || setweight(to_tsvector('{FTS_CONFIG}', coalesce(contenu, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_articles_recherche ON articles USING GIN (recherche)",
+]
+
+ARTICLES_FTS_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        titre, contenu, content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF titre, contenu
+    ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, titre, contenu)
+        VALUES ('delete', old.id, old.titre, old.contenu);
+        INSERT INTO articles_fts (rowid, titre, contenu)
+        VALUES (new.id, new.titre, new.contenu);
+    END
+    """,
+]
+
+for statement in ARTICLES_FTS_POSTGRESQL:
+    db.event.listen(
+        Article.__table__,
+        "after_create",
+        db.DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in ARTICLES_FTS_SQLITE:
+    db.event.listen(
+        Article.__table__,
+        "after_create",
+        db.DDL(statement).execute_if(dialect="sqlite"),
+    )
+db.event.listen(
+    Article.__table__,
+    "before_drop",
+    db.DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"),
+)
+
+# Objets créés par les DDL de ce module, absents des modèles
+UNMAPPED_TABLES = {"articles_fts"}
+UNMAPPED_COLUMNS = {("articles", "recherche")}
+UNMAPPED_INDEXES = {"ix_articles_recherche"}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """
+    Filtre de l'autogénération Alembic (migrations/env.py) : ``flask db migrate``
+    et ``flask db check`` ignorent les objets non mappés créés par les DDL de ce
+    module, dont ils proposeraient sinon la suppression.
+    """
+    if type_ == "table":
+        # Une table virtuelle FTS5 s'accompagne de tables internes « <nom>_* »
+        return not any(
+            name == table or name.startswith(f"{table}_") for table in UNMAPPED_TABLES
+        )
+    if type_ == "column":
+        return (obj.table.name, name) not in UNMAPPED_COLUMNS
+    if type_ == "index":
+        return name not in UNMAPPED_INDEXES
+    return True
+
+
+# Statistiques agrégées (voir src/stats.py), recalculées périodiquement et non à
+# chaque lecture :
+# - PostgreSQL : vues matérialisées, avec un index unique pour permettre
+#   REFRESH MATERIALIZED VIEW CONCURRENTLY ;
+# - SQLite : tables de synthèse, vidées et remplies dans une transaction.
+# Non mappées, elles sont ignorées par l'autogénération (voir include_object).
+# {mois_article} et {mois_commentaire} sont remplacés par l'expression « AAAA-MM »
+# du SGBD (STATS_MONTH), {articles} et {commentaires} par les lignes visibles
+# (STATS_ARTICLES, STATS_COMMENTAIRES).
+STATS_QUERIES = {
+    "stats_categories": """
+        SELECT c.id AS categorie_id,
+               COUNT(a.id) AS nb_articles,
+               COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires,
+               MAX(a.date_publication) AS derniere_publication
+        FROM categories c LEFT JOIN {articles} a ON a.categorie_id = c.id
+        GROUP BY c.id
+    """,
+    "stats_utilisateurs": """
+        SELECT u.id AS utilisateur_id,
+               COUNT(a.id) AS nb_articles,
+               COALESCE(SUM(a.nb_commentaires), 0) AS nb_commentaires_recus
+        FROM utilisateurs u LEFT JOIN {articles} a ON a.auteur_id = u.id
+        GROUP BY u.id
+    """,
+    "stats_activite": """
+        SELECT utilisateur_id, mois,
+               SUM(nb_articles) AS nb_articles,
+               SUM(nb_commentaires) AS nb_commentaires
+        FROM (
+            SELECT auteur_id AS utilisateur_id, {mois_article} AS mois,
+                   1 AS nb_articles, 0 AS nb_commentaires
+            FROM {articles} a WHERE date_publication IS NOT NULL
+            UNION ALL
+            SELECT auteur_id, {mois_commentaire}, 0, 1
+            FROM {commentaires} cm WHERE date_commentaire IS NOT NULL
+        ) activite
+        GROUP BY utilisateur_id, mois
+    """,
+}
+
+# Lignes comptées, comme par les routes (parents_actifs) : un article dont la
+# catégorie ou l'auteur attend sa suppression est écarté, ainsi que ses
+# commentaires et ceux d'un auteur marqué.
+STATS_ARTICLES = """(
+    SELECT sa.* FROM articles sa
+    JOIN categories sac ON sac.id = sa.categorie_id
+    JOIN utilisateurs sau ON sau.id = sa.auteur_id
+    WHERE sac.date_suppression IS NULL AND sau.date_suppression IS NULL
+)"""
+STATS_COMMENTAIRES = """(
+    SELECT sc.* FROM commentaires sc
+    JOIN {articles} sca ON sca.id = sc.article_id
+    JOIN utilisateurs scu ON scu.id = sc.auteur_id
+    WHERE scu.date_suppression IS NULL
+)"""
+
+STATS_KEYS = {
+    "stats_categories": "categorie_id",
+    "stats_utilisateurs": "utilisateur_id",
+    "stats_activite": "utilisateur_id, mois",
+}
+
+STATS_MONTH = {
+    "postgresql": "to_char({}, 'YYYY-MM')",
+    "sqlite": "strftime('%Y-%m', {})",
+}
+
+STATS_SQLITE_TABLES = {
+    "stats_categories": """
+        CREATE TABLE IF NOT EXISTS stats_categories (
+            categorie_id INTEGER PRIMARY KEY,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires INTEGER NOT NULL,
+            derniere_publication DATETIME
+        )
+    """,
+    "stats_utilisateurs": """
+        CREATE TABLE IF NOT EXISTS stats_utilisateurs (
+            utilisateur_id INTEGER PRIMARY KEY,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires_recus INTEGER NOT NULL
+        )
+    """,
+    "stats_activite": """
+        CREATE TABLE IF NOT EXISTS stats_activite (
+            utilisateur_id INTEGER NOT NULL,
+            mois VARCHAR(7) NOT NULL,
+            nb_articles INTEGER NOT NULL,
+            nb_commentaires INTEGER NOT NULL,
+            PRIMARY KEY (utilisateur_id, mois)
+        )
+    """,
+}
+
+
+def stats_query(name: str, dialect: str) -> str:
+    """Requête de la vue de statistiques name pour le SGBD dialect."""
+    month = STATS_MONTH[dialect]
+    return STATS_QUERIES[name].format(
+        mois_article=month.format("date_publication"),
+        mois_commentaire=month.format("date_commentaire"),
+        articles=STATS_ARTICLES,
+        commentaires=STATS_COMMENTAIRES.format(articles=STATS_ARTICLES),
+    )
+
+
+for name in STATS_QUERIES:
+    db.event.listen(
+        db.metadata,
+        "after_create",
+        db.DDL(
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS "
+            f"{stats_query(name, 'postgresql')}"
+        ).execute_if(dialect="postgresql"),
+    )
+    db.event.listen(
+        db.metadata,
+        "after_create",
+        db.DDL(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{name} ON {name} ({STATS_KEYS[name]})"
+        ).execute_if(dialect="postgresql"),
+    )
+    db.event.listen(
+        db.metadata,
+        "after_create",
+        db.DDL(STATS_SQLITE_TABLES[name]).execute_if(dialect="sqlite"),
+    )
+    db.event.listen(
+        db.metadata,
+        "before_drop",
+        db.DDL(f"DROP MATERIALIZED VIEW IF EXISTS {name}").execute_if(
+            dialect="postgresql"
+        ),
+    )
+    db.event.listen(
+        db.metadata,
+        "before_drop",
+        db.DDL(f"DROP TABLE IF EXISTS {name}").execute_if(dialect="sqlite"),
+    )
+
+# Vues matérialisées, tables de synthèse et index ignorés par les migrations
+UNMAPPED_TABLES.update(STATS_QUERIES)
+UNMAPPED_INDEXES.update(f"ix_{name}" for name in STATS_QUERIES)
@@ -0,0 +1,121 @@
+"""
+Pagination par curseur (keyset) pour les routes de liste.
+
+Les listes sont triées sur une clé unique (par exemple ``(date_publication, id)``)
+et la page suivante est sélectionnée par une condition ``WHERE (date, id) < (...)``
+sur les valeurs de la dernière ligne renvoyée, encodées dans un curseur opaque.
+Contrairement à OFFSET, le coût d'une page ne dépend pas de sa profondeur.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import abort, current_app, request
+from sqlalchemy import and_, literal, or_, tuple_
+
+from src.conditional import conditional_json, entity_etag
+from src.models import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(values: list) -> str:
+    """Encode les valeurs de la clé de tri en un curseur opaque."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list) -> list:
+    """
+    Décode un curseur produit par encode_cursor() pour la clé de tri keys,
+    ou renvoie une erreur 400 si le curseur est invalide.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(keys):
+            raise ValueError(cursor)
+        values = []
+        for (column, _), value in zip(keys, payload):
+            if value is not None and column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            values.append(value)
+    except (binascii.Error, ValueError, TypeError):
+        abort(400, description="Curseur de pagination invalide.")
+    return values
+
+
+def get_limit() -> int:
+    """Lit le paramètre limit de la requête, borné par PAGINATION_MAX_LIMIT."""
+    default = current_app.config.get("PAGINATION_DEFAULT_LIMIT", DEFAULT_LIMIT)
+    maximum = current_app.config.get("PAGINATION_MAX_LIMIT", MAX_LIMIT)
+    limit = request.args.get("limit", default, type=int)
+    if limit < 1:
+        abort(400, description="Le paramètre limit doit être positif.")
+    return min(limit, maximum)
+
+
+def keyset_condition(keys: list, values: list):
+    """
+    Construit la condition « strictement après values » pour la clé de tri keys,
+    une liste de couples (colonne, descendant).
+    """
+    params = [literal(value, column.type) for (column, _), value in zip(keys, values)]
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # Comparaison de tuples : exploitable directement par un index composite.
+        left = tuple_(*[column for column, _ in keys])
+        right = tuple_(*params)
+        return left < right if directions.pop() else left > right
+
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [keys[j][0] == params[j] for j in range(i)]
+        step = column < params[i] if descending else column > params[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def paginate(stmt, keys: list, wrap=None):
+    """
+    Exécute stmt page par page selon la clé de tri keys.
+
+    Retourne un couple (éléments, curseur suivant) ; le curseur vaut None
+    lorsque la dernière page est atteinte. Si stmt sélectionne des colonnes
+    plutôt qu'une entité, wrap convertit chaque ligne (voir src.filtering).
+    """
+    limit = get_limit()
+    cursor = request.args.get("cursor")
+    if cursor:
+        stmt = stmt.where(keyset_condition(keys, decode_cursor(cursor, keys)))
+    order = [
+        column.desc() if descending else column.asc() for column, descending in keys
+    ]
+    result = db.session.execute(stmt.order_by(*order).limit(limit + 1))
+    items = result.scalars().all() if wrap is None else [wrap(row) for row in result]
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in keys])
+    return items, next_cursor
+
+
+def page_response(items: list, next_cursor):
+    """
+    Construit la réponse JSON d'une page de résultats, avec un ETag calculé
+    sur les versions des éléments (304 si la page n'a pas changé).
+    """
+    etag = entity_etag(*items, extra=next_cursor or "")
+    return conditional_json(
+        lambda: {
+            "items": [item.to_dict() for item in items],
+            "next_cursor": next_cursor,
+        },
+        etag,
+    )
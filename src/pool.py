@@ -0,0 +1,171 @@
+"""
+Configuration du pool de connexions.
+
+Clés de configuration, lues dans les variables d'environnement de même nom par
+src/config.py (ignorées sous SQLite) :
+    DB_POOL_MODE : ``queue`` (pool local, par défaut) ou ``null`` (une connexion
+        par transaction, à utiliser derrière PgBouncer en mode transaction).
+    DB_POOL_SIZE : connexions gardées ouvertes (5).
+    DB_MAX_OVERFLOW : connexions supplémentaires autorisées en pointe (10).
+    DB_POOL_TIMEOUT : attente maximale d'une connexion libre, en secondes (30).
+    DB_POOL_RECYCLE : âge maximal d'une connexion, en secondes (1800, -1 : jamais).
+    DB_POOL_PRE_PING : vérifie la connexion avant usage (true), utile après une
+        bascule du serveur.
+
+Le temps d'attente d'une connexion est exporté par l'histogramme
+``db_pool_checkout_wait_seconds`` (voir src/metrics.py) et suivi par chaque pool
+(WaitTracker) pour le contrôle d'admission (voir src/admission.py).
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from src.metrics import Counter, Gauge, Histogram
+from src.models import db
+
+POOL_MODES = ("queue", "null")
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Attente d'une connexion libre dans le pool.",
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Demandes de connexion abandonnées après DB_POOL_TIMEOUT.",
+)
+
+
+class WaitTracker:
+    """
+    Attentes d'une connexion du pool : celles en cours et celles terminées depuis
+    moins de window secondes.
+    """
+
+    def __init__(self, window: float = 1.0) -> None:
+        self.window = window
+        self._tokens = itertools.count()
+        self._waiting = {}
+        self._recent = deque()
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> int:
+        """Note le début d'une attente ; retourne son jeton."""
+        token = next(self._tokens)
+        with self._lock:
+            self._waiting[token] = time.monotonic()
+        return token
+
+    def finish(self, token: int) -> None:
+        """Note la fin de l'attente token (connexion obtenue ou abandon)."""
+        now = time.monotonic()
+        with self._lock:
+            wait = now - self._waiting.pop(token)
+            self._recent.append((now, wait))
+            self._total += wait
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._total -= self._recent.popleft()[1]
+
+    def current(self) -> float:
+        """
+        Attente actuelle (secondes) : la plus longue des attentes en cours, ou la
+        moyenne des attentes récentes si elle est plus grande.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            longest = max((now - s for s in self._waiting.values()), default=0.0)
+            average = self._total / len(self._recent) if self._recent else 0.0
+        return max(longest, average)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool qui mesure le temps d'attente de chaque connexion."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.waits = WaitTracker()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        token = self.waits.start()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            self.waits.finish(token)
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """
+    Variante pour les pilotes asynchrones (point d'entrée ASGI) : l'attente
+    d'une connexion rend la main à la boucle d'évènements.
+    """
+
+
+def engine_options(url: str, config) -> dict:
+    """
+    Retourne SQLALCHEMY_ENGINE_OPTIONS pour la base url, d'après les clés DB_POOL_*
+    de config (app.config).
+
+    Lève ValueError si une valeur est invalide.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        # Flask-SQLAlchemy choisit déjà le pool adapté (StaticPool en mémoire).
+        return {}
+
+    mode = str(config.get("DB_POOL_MODE", "queue")).lower()
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE doit valoir {' ou '.join(POOL_MODES)}.")
+    if mode == "null":
+        # Le pooleur externe garde les connexions : rien à conserver ni vérifier.
+        return {"poolclass": NullPool}
+
+    pre_ping = config.get("DB_POOL_PRE_PING", True)
+    if isinstance(pre_ping, str):
+        pre_ping = pre_ping.lower() in TRUE_VALUES
+    try:
+        return {
+            "poolclass": (
+                TimedAsyncQueuePool if url.get_dialect().is_async else TimedQueuePool
+            ),
+            "pool_size": int(config.get("DB_POOL_SIZE", 5)),
+            "max_overflow": int(config.get("DB_MAX_OVERFLOW", 10)),
+            "pool_timeout": float(config.get("DB_POOL_TIMEOUT", 30)),
+            "pool_recycle": int(config.get("DB_POOL_RECYCLE", 1800)),
+            "pool_pre_ping": bool(pre_ping),
+        }
+    except ValueError as e:
+        raise ValueError(f"Configuration du pool invalide : {e}") from None
+
+
+def _pool_status():
+    """Occupation du pool de l'application courante (None hors QueuePool)."""
+    if not current_app:
+        return None
+    pool = db.engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return [
+        ({"state": "checked_out"}, pool.checkedout()),
+        ({"state": "idle"}, pool.checkedin()),
+        ({"state": "overflow"}, max(pool.overflow(), 0)),
+    ]
+
+
+Gauge("db_pool_connections", "Connexions du pool, par état.", _pool_status)
@@ -0,0 +1,252 @@
+"""
+Limitation de débit par client (seau à jetons).
+
+Chaque client dispose, pour chaque quota, d'un seau de ``limite`` jetons qui se
+remplit en continu de ``limite`` jetons par période ; une requête consomme un
+jeton, et reçoit ``429 Too Many Requests`` (avec ``Retry-After``) si le seau est
+vide. Les rafales jusqu'à ``limite`` requêtes sont donc admises, le débit moyen
+ne dépassant pas le quota.
+
+Quotas (``limite/période``, période : second, minute, hour ou day) :
+    RATELIMIT_DEFAULT : quota de toute requête (``600/minute``) ;
+    RATELIMIT_QUOTAS : quotas propres à un blueprint (``articles``), ou aux
+        écritures d'un blueprint (``articles:write`` : POST, PUT, PATCH, DELETE),
+        chacun avec son seau.
+
+Le client est identifié par son adresse IP, ou par l'en-tête
+RATELIMIT_KEY_HEADER (clé d'API) s'il est configuré et présent. Derrière des
+proxys, RATELIMIT_TRUSTED_PROXIES doit en indiquer le nombre : l'adresse est alors
+lue dans X-Forwarded-For (ProxyFix, voir create_app()), faute de quoi tous les
+clients partagent le seau du proxy. L'API ne
+vérifiant pas les clés, cet en-tête n'est à configurer que derrière une
+passerelle qui les authentifie : un client pourrait sinon changer de clé à
+chaque requête.
+
+Backends disponibles via RATELIMIT_TYPE :
+    null : pas de limitation ;
+    memory : seaux en mémoire du processus (par défaut), au plus
+        RATELIMIT_MAX_KEYS (les moins récents sont oubliés). Chaque worker a ses
+        seaux : le débit total admis est multiplié par le nombre de workers ;
+    redis : seaux partagés sur un serveur compatible Redis
+        (RATELIMIT_REDIS_URL), mis à jour par un script Lua atomique.
+
+Un backend indisponible laisse passer les requêtes (journal d'avertissement).
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, jsonify, request
+
+from src.metrics import Counter
+from src.replicas import SAFE_METHODS
+from src.resp import RedisClient, RedisError
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Blueprints jamais limités
+EXEMPT_BLUEPRINTS = ("metrics",)
+
+RATE_LIMITED = Counter(
+    "http_requests_rate_limited",
+    "Requêtes refusées (429) par la limitation de débit, par quota.",
+)
+
+# KEYS[1] : seau ; ARGV : capacité, jetons par seconde, date (secondes), coût.
+# Le seau est stocké « jetons:date » et expire une fois plein.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local tokens, updated = capacity, now
+local state = redis.call('GET', KEYS[1])
+if state then
+    local sep = string.find(state, ':', 1, true)
+    tokens = tonumber(string.sub(state, 1, sep - 1))
+    updated = tonumber(string.sub(state, sep + 1))
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+local ttl = math.ceil((capacity - tokens) / rate) + 1
+redis.call('SET', KEYS[1], tostring(tokens) .. ':' .. tostring(now), 'EX', ttl)
+return {allowed, tostring(tokens)}
+"""
+
+
+def parse_quota(quota: str) -> tuple:
+    """
+    Retourne (capacité, jetons par seconde) du quota « limite/période ».
+
+    Lève ValueError si le quota est invalide.
+    """
+    try:
+        limit, period = quota.split("/")
+        limit = int(limit)
+        seconds = PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f"Quota invalide : {quota!r}") from None
+    if limit <= 0:
+        raise ValueError(f"Quota invalide : {quota!r}")
+    return limit, limit / seconds
+
+
+def refill(tokens: float, updated: float, now: float, capacity: int, rate: float):
+    """Jetons d'un seau laissé à tokens à la date updated, à la date now."""
+    return min(capacity, tokens + max(now - updated, 0) * rate)
+
+
+class MemoryBuckets:
+    """
+    Seaux en mémoire du processus, thread-safe.
+
+    Attributs:
+        max_keys : Nombre maximal de seaux avant oubli du moins récent.
+    """
+
+    def __init__(self, max_keys: int = 10000) -> None:
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float, cost: int = 1) -> tuple:
+        """Prélève cost jetons ; retourne (accordé, jetons restants)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisBuckets:
+    """Seaux partagés sur un serveur compatible Redis."""
+
+    def __init__(self, client: RedisClient, prefix: str = "blog:ratelimit:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def take(self, key: str, capacity: int, rate: float, cost: int = 1) -> tuple:
+        allowed, tokens = self.client.execute(
+            "EVAL",
+            TOKEN_BUCKET_SCRIPT,
+            1,
+            self.prefix + key,
+            capacity,
+            repr(rate),
+            repr(time.time()),
+            cost,
+        )
+        return bool(allowed), float(tokens)
+
+
+class RateLimiter:
+    """
+    Extension Flask de limitation de débit.
+
+    S'initialise comme le cache : ``limiter.init_app(app)`` dans create_app().
+    Avec RATELIMIT_TYPE=null, aucune requête n'est contrôlée.
+    """
+
+    def init_app(self, app) -> None:
+        """Choisit le backend et lit les quotas d'après la configuration."""
+        app.config.setdefault("RATELIMIT_TYPE", "memory")
+        app.config.setdefault("RATELIMIT_DEFAULT", "600/minute")
+        app.config.setdefault("RATELIMIT_QUOTAS", {})
+        app.config.setdefault("RATELIMIT_KEY_HEADER", "")
+        app.config.setdefault("RATELIMIT_MAX_KEYS", 10000)
+        app.config.setdefault("RATELIMIT_REDIS_URL", "redis://localhost:6379/0")
+
+        kind = app.config["RATELIMIT_TYPE"]
+        if kind == "null":
+            return
+        if kind == "memory":
+            backend = MemoryBuckets(app.config["RATELIMIT_MAX_KEYS"])
+        elif kind == "redis":
+            backend = RedisBuckets(
+                RedisClient.from_url(app.config["RATELIMIT_REDIS_URL"])
+            )
+        else:
+            raise ValueError(f"RATELIMIT_TYPE inconnu : {kind}")
+        quotas = {
+            name: parse_quota(quota)
+            for name, quota in app.config["RATELIMIT_QUOTAS"].items()
+        }
+        if app.config["RATELIMIT_DEFAULT"]:
+            quotas["default"] = parse_quota(app.config["RATELIMIT_DEFAULT"])
+        app.extensions["rate_limiter"] = (backend, quotas)
+        app.before_request(self.check)
+        app.after_request(self.add_headers)
+
+    def client_key(self) -> str:
+        """Identifiant du client : clé d'API (hachée) ou adresse IP."""
+        header = current_app.config["RATELIMIT_KEY_HEADER"]
+        api_key = request.headers.get(header) if header else None
+        if api_key:
+            return "cle:" + hashlib.sha256(api_key.encode()).hexdigest()[:32]
+        return f"ip:{request.remote_addr or 'inconnue'}"
+
+    def quota(self, quotas: dict):
+        """Nom et valeur du quota de la requête courante, ou None."""
+        blueprint = request.blueprint or ""
+        names = [blueprint, "default"]
+        if request.method not in SAFE_METHODS:
+            names.insert(0, f"{blueprint}:write")
+        for name in names:
+            if name in quotas:
+                return name, quotas[name]
+        return None
+
+    def check(self):
+        """Consomme un jeton du client, ou refuse la requête (429)."""
+        if request.blueprint in EXEMPT_BLUEPRINTS:
+            return None
+        backend, quotas = current_app.extensions["rate_limiter"]
+        quota = self.quota(quotas)
+        if quota is None:
+            return None
+        name, (capacity, rate) = quota
+        try:
+            allowed, tokens = backend.take(
+                f"{self.client_key()}:{name}", capacity, rate
+            )
+        except (OSError, RedisError):
+            current_app.logger.warning(
+                "Limitation de débit indisponible", exc_info=True
+            )
+            return None
+        g.rate_limit = (capacity, tokens)
+        if allowed:
+            return None
+        RATE_LIMITED.inc(quota=name)
+        response = jsonify({"error": "Trop de requêtes, réessayez plus tard."})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(math.ceil((1 - tokens) / rate))
+        return response
+
+    def add_headers(self, response):
+        """Indique au client son quota et les requêtes qu'il lui reste."""
+        state = g.pop("rate_limit", None)
+        if state is not None:
+            capacity, tokens = state
+            response.headers["RateLimit-Limit"] = str(capacity)
+            response.headers["RateLimit-Remaining"] = str(int(tokens))
+        return response
+
+
+limiter = RateLimiter()
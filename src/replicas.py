@@ -0,0 +1,171 @@
+"""
+Routage des lectures vers les réplicas en lecture seule.
+
+Les réplicas sont déclarés par ``DATABASE_REPLICA_URLS`` (URLs séparées par des
+virgules) ; chacun a son moteur, nommé ``replica_<n>``, hors des binds de
+Flask-SQLAlchemy (create_all() et les migrations ne les touchent pas). Pour
+chaque requête GET/HEAD, un réplica est choisi à tour de rôle parmi ceux en
+bonne santé et toutes les lectures de la requête lui sont envoyées ; les
+écritures et les autres méthodes restent sur la base principale.
+
+- Santé : un réplica est vérifié (``SELECT 1``) au plus toutes les
+  ``REPLICA_HEALTH_INTERVAL`` secondes ; en cas d'échec ou de déconnexion, il
+  est écarté pendant ``REPLICA_RETRY_AFTER`` secondes. Sans réplica disponible,
+  les lectures vont à la base principale. Sous la pile ASGI, la vérification
+  d'un réplica au pilote synchrone s'exécute dans un thread (src/asgi.py).
+- Lecture de ses propres écritures : après un POST/PUT/PATCH/DELETE réussi, le
+  client reçoit un cookie qui envoie ses lectures à la base principale pendant
+  ``REPLICA_STICKY_SECONDS`` secondes (retard de réplication).
+"""
+
+import threading
+import time
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, exc
+
+from src.asgi import offload
+
+REPLICA_NAME_PREFIX = "replica_"
+STICKY_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def current_replica():
+    """Nom du réplica choisi pour la requête courante, ou None."""
+    return g.get("db_replica") if has_app_context() else None
+
+
+def pinned_to_primary() -> bool:
+    """Indique si la requête lit la principale après une écriture du client."""
+    return g.get("db_primary_pinned", False) if has_app_context() else False
+
+
+class RoutingSession(Session):
+    """Session qui envoie les lectures au réplica choisi pour la requête."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, "is_dml", False):
+            key = current_replica()
+            if key is not None:
+                return current_app.extensions["read_replicas"].engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaSet:
+    """Sélection à tour de rôle des réplicas en bonne santé."""
+
+    def __init__(self, engines: dict, health_interval: float, retry_after: float):
+        self.engines = engines
+        self.keys = sorted(engines)
+        self.health_interval = health_interval
+        self.retry_after = retry_after
+        self.down_until = {}
+        self.checked_at = {}
+        self.turn = 0
+        self.lock = threading.Lock()
+        for key, engine in engines.items():
+            event.listen(engine, "handle_error", self._on_error(key))
+
+    def _on_error(self, key):
+        def handle_error(context):
+            if context.is_disconnect:
+                self.mark_down(key)
+
+        return handle_error
+
+    def mark_down(self, key: str) -> None:
+        """Écarte le réplica key pendant retry_after secondes."""
+        with self.lock:
+            self.down_until[key] = time.monotonic() + self.retry_after
+            self.checked_at.pop(key, None)
+
+    def ping(self, key: str) -> bool:
+        """Vérifie que le réplica key répond."""
+        engine = self.engines[key]
+        # Un pilote asynchrone rend déjà la main à la boucle d'évènements
+        if engine.dialect.is_async:
+            return self._ping(engine)
+        return offload(self._ping, engine)
+
+    def _ping(self, engine) -> bool:
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+        except exc.SQLAlchemyError:
+            return False
+        return True
+
+    def choose(self):
+        """Retourne le nom du prochain réplica disponible, ou None."""
+        with self.lock:
+            start = self.turn
+            self.turn = (self.turn + 1) % max(len(self.keys), 1)
+        for i in range(len(self.keys)):
+            key = self.keys[(start + i) % len(self.keys)]
+            now = time.monotonic()
+            if self.down_until.get(key, 0) > now:
+                continue
+            if now - self.checked_at.get(key, float("-inf")) >= self.health_interval:
+                if not self.ping(key):
+                    self.mark_down(key)
+                    continue
+                self.checked_at[key] = now
+            return key
+        return None
+
+
+class ReadReplicas:
+    """Extension Flask : routage des requêtes et cookie de lecture sur la principale."""
+
+    def init_app(self, app) -> None:
+        """
+        Crée les moteurs de SQLALCHEMY_REPLICAS ({nom: {"url": ..., options}})
+        et installe le routage si au moins un réplica est configuré.
+        """
+        replicas = app.config.get("SQLALCHEMY_REPLICAS") or {}
+        if not replicas:
+            return
+        engines = {}
+        for key, options in replicas.items():
+            options = dict(options)
+            engines[key] = create_engine(options.pop("url"), **options)
+        app.extensions["read_replicas"] = ReplicaSet(
+            engines,
+            health_interval=app.config["REPLICA_HEALTH_INTERVAL"],
+            retry_after=app.config["REPLICA_RETRY_AFTER"],
+        )
+        app.before_request(self.route_request)
+        app.after_request(self.stick_to_primary)
+
+    def route_request(self) -> None:
+        """Choisit le réplica servant la requête (None : base principale)."""
+        g.db_replica = None
+        g.db_primary_pinned = False
+        if request.method not in SAFE_METHODS:
+            return
+        try:
+            primary_until = float(request.cookies.get(STICKY_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        if primary_until > time.time():
+            g.db_primary_pinned = True
+            return
+        g.db_replica = current_app.extensions["read_replicas"].choose()
+
+    def stick_to_primary(self, response):
+        """Après une écriture réussie, envoie les lectures du client à la principale."""
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            seconds = current_app.config["REPLICA_STICKY_SECONDS"]
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + seconds),
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+replicas = ReadReplicas()
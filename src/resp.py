@@ -0,0 +1,141 @@
+"""
+Client minimal pour le protocole Redis (RESP2).
+
+Utilisé par les composants qui peuvent partager leur état entre plusieurs
+workers (cache de réponses, etc.). Il ne dépend que de la bibliothèque standard
+et parle à tout serveur compatible Redis, y compris un substitut local en test.
+Ses sockets sont bloquantes : sous la pile ASGI, chaque commande s'exécute dans
+un thread (voir offload() dans src/asgi.py).
+"""
+
+import socket
+import threading
+from urllib.parse import urlparse
+
+from src.asgi import offload
+
+
+class RedisError(Exception):
+    """Erreur renvoyée par le serveur (réponse « - »)."""
+
+
+class RedisClient:
+    """
+    Connexion unique et thread-safe vers un serveur compatible Redis.
+
+    Attributs:
+        host, port : Adresse du serveur.
+        db : Numéro de base sélectionné à la connexion.
+        password : Mot de passe (AUTH) facultatif.
+        timeout : Délai maximal (secondes) d'une opération réseau.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: str = None,
+        timeout: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._file = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisClient":
+        """Crée un client à partir d'une URL redis://[:motdepasse@]hôte:port/base."""
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=db,
+            password=parsed.password,
+            **kwargs,
+        )
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), self.timeout)
+        self._file = self._sock.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def close(self) -> None:
+        """Ferme la connexion ; la suivante est rouverte à la demande."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+        self._sock = self._file = None
+
+    def _call(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Connexion fermée par le serveur Redis.")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Réponse inattendue : {line!r}")
+
+    def execute(self, *args):
+        """Envoie une commande et retourne la réponse décodée du serveur."""
+        return offload(self._execute, *args)
+
+    def _execute(self, *args):
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._call(*args)
+            except (OSError, ConnectionError):
+                # Connexion rompue : on la referme pour qu'elle soit rouverte.
+                self._close()
+                raise
+
+    def get(self, key: str):
+        return self.execute("GET", key)
+
+    def set(self, key: str, value, ex: int = None):
+        if ex:
+            return self.execute("SET", key, value, "EX", int(ex))
+        return self.execute("SET", key, value)
+
+    def incr(self, key: str) -> int:
+        return self.execute("INCR", key)
+
+    def delete(self, *keys) -> int:
+        return self.execute("DEL", *keys)
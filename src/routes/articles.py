@@ -2,38 +2,199 @@
 Routes pour la gestion des articles.
 
 Fournit les endpoints CRUD pour l'entité Article.
-Utilise db.session.get() et un helper get_or_404() pour la compatibilité SQLAlchemy 2.0.
+Utilise un helper get_or_404() (requêtes select() de SQLAlchemy 2.0).
 """
 
 from flask import Blueprint, request, jsonify, abort
-from src.models import db, Article, Categorie, Utilisateur
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from src.models import (
+    db,
+    parents_actifs,
+    references_exist,
+    Article,
+    Categorie,
+    Commentaire,
+    Utilisateur,
+)
+from src.cache import cache
+from src.feed import feed
+from src.conditional import (
+    check_if_match,
+    conditional_json,
+    entity_etag,
+    set_validators,
+)
+from src import counters
+from src.bulk import (
+    BulkResource,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    cascade_delete,
+)
+from src.filtering import ListQuery
+from src.pagination import paginate, page_response
+from src.routes.commentaires import COMMENTAIRE_QUERY
+from src.search import search_articles
+from src.streaming import stream_ndjson, wants_stream
 
 articles_bp = Blueprint("articles", __name__, url_prefix="/articles")
 
+# Message d'erreur d'une référence invalide, par champ
+REFERENCE_ERRORS = {
+    "categorie_id": "Catégorie invalide.",
+    "auteur_id": "Utilisateur invalide.",
+}
 
-def get_or_404(model, pk):
+# Clé de tri unique utilisée par la pagination par curseur
+ARTICLE_KEYS = [(Article.date_publication, True), (Article.id, True)]
+
+# Filtres, tri et champs des listes d'articles (voir src.filtering). Les tris
+# proposés, seuls ou combinés à un filtre, sont servis par les index d'Article.
+ARTICLE_QUERY = ListQuery(
+    Article,
+    fields=[
+        "id",
+        "titre",
+        "contenu",
+        "date_publication",
+        "categorie_id",
+        "auteur_id",
+        "nb_commentaires",
+    ],
+    default_sort=ARTICLE_KEYS,
+    filters=["categorie_id", "auteur_id", "nb_commentaires"],
+    date="date_publication",
+    sortable=["date_publication", "id"],
+)
+
+# Relations incluables via ?include=, avec leur stratégie de chargement :
+# selectinload pour la collection (une requête IN), joinedload pour les
+# relations many-to-one (jointure dans la requête principale).
+INCLUDES = {
+    "commentaires": selectinload(
+        Article.commentaires.and_(*parents_actifs(Commentaire))
+    ),
+    "categorie": joinedload(Article.categorie),
+    "utilisateur": joinedload(Article.utilisateur),
+}
+
+# Opérations groupées : /articles/bulk
+ARTICLE_BULK = BulkResource(
+    Article,
+    fields=["titre", "contenu", "categorie_id", "auteur_id"],
+    required=["titre", "contenu", "categorie_id", "auteur_id"],
+    required_message="Titre, contenu, catégorie et auteur sont requis.",
+    foreign_keys={
+        "categorie_id": (Categorie, "Catégorie invalide."),
+        "auteur_id": (Utilisateur, "Utilisateur invalide."),
+    },
+)
+
+
+def parse_includes() -> list:
+    """Lit le paramètre ?include= et renvoie 400 si une relation est inconnue."""
+    includes = [name for name in request.args.get("include", "").split(",") if name]
+    unknown = set(includes) - INCLUDES.keys()
+    if unknown:
+        abort(400, description=f"Relations inconnues : {', '.join(sorted(unknown))}.")
+    return includes
+
+
+def included_tables() -> list:
+    """Tables lues par les relations demandées (espaces de noms du cache)."""
+    relationships = Article.__mapper__.relationships
+    return [relationships[name].target.name for name in parse_includes()]
+
+
+def get_or_404(model, pk, options=None):
     """
-    Retourne l'instance du modèle correspondant à la clé primaire pk,
-    ou renvoie une erreur 404 si non trouvée.
+    Retourne l'instance du modèle correspondant à la clé primaire pk, ou renvoie
+    une erreur 404 si elle n'existe pas ou si un parent attend sa suppression.
     """
-    obj = db.session.get(model, pk)
+    stmt = select(model).where(model.id == pk, *parents_actifs(model))
+    obj = db.session.scalars(stmt.options(*(options or ()))).first()
     if obj is None:
         abort(404, description=f"{model.__name__} with id {pk} not found.")
     return obj
 
 
 @articles_bp.route("", methods=["GET"])
+@cache.cached("articles")
 def get_articles():
-    """Retourne la liste complète des articles."""
-    articles = db.session.query(Article).all()
-    return jsonify([article.to_dict() for article in articles]), 200
+    """
+    Retourne les articles, du plus récent au plus ancien, page par page
+    (ou en flux NDJSON, voir src.streaming).
+    """
+    stmt, keys, wrap = ARTICLE_QUERY.apply(select(Article))
+    if wants_stream():
+        return stream_ndjson(stmt.order_by(Article.id), wrap)
+    articles, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(articles, next_cursor)
+
+
+@articles_bp.route("/search", methods=["GET"])
+@cache.cached("articles")
+def search():
+    """
+    Recherche plein texte dans le titre et le contenu des articles (?q=).
+
+    Les résultats sont classés par pertinence puis paginés par curseur.
+    """
+    text = request.args.get("q", "").strip()
+    if not text:
+        abort(400, description="Le paramètre q est requis.")
+    articles, next_cursor = search_articles(text)
+    return page_response(articles, next_cursor)
 
 
 @articles_bp.route("/<int:article_id>", methods=["GET"])
+@cache.cached("articles", included_tables)
 def get_article(article_id: int):
-    """Retourne un article par son identifiant."""
-    article = get_or_404(Article, article_id)
-    return jsonify(article.to_dict()), 200
+    """
+    Retourne un article par son identifiant.
+
+    Le paramètre ?include=commentaires,categorie,utilisateur ajoute les
+    relations demandées, chargées en même temps que l'article (pas de N+1).
+    """
+    includes = parse_includes()
+    article = get_or_404(
+        Article, article_id, options=[INCLUDES[name] for name in includes]
+    )
+    related = []
+    if "commentaires" in includes:
+        related.extend(article.commentaires)
+    if "categorie" in includes:
+        related.append(article.categorie)
+    if "utilisateur" in includes:
+        related.append(article.utilisateur)
+
+    def build():
+        data = article.to_dict()
+        if "commentaires" in includes:
+            data["commentaires"] = [c.to_dict() for c in article.commentaires]
+        if "categorie" in includes:
+            data["categorie"] = article.categorie.to_dict()
+        if "utilisateur" in includes:
+            data["utilisateur"] = article.utilisateur.to_dict()
+        return data
+
+    # Avec des relations, seul l'ETag reflète aussi les suppressions.
+    last_modified = None if includes else article.date_modification
+    return conditional_json(build, entity_etag(article, *related), last_modified)
+
+
+@articles_bp.route("/<int:article_id>/commentaires", methods=["GET"])
+@cache.cached("articles", "commentaires")
+def get_article_commentaires(article_id: int):
+    """Retourne les commentaires d'un article, du plus récent au plus ancien."""
+    get_or_404(Article, article_id)
+    stmt, keys, wrap = COMMENTAIRE_QUERY.apply(
+        select(Commentaire).where(Commentaire.article_id == article_id)
+    )
+    commentaires, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(commentaires, next_cursor)
 
 
 @articles_bp.route("", methods=["POST"])
@@ -43,9 +204,11 @@ def create_article():
     if not data or not data.get("titre") or not data.get("contenu"):
         return jsonify({"error": "Titre et contenu sont requis."}), 400
 
-    categorie = db.session.get(Categorie, data.get("categorie_id"))
-    utilisateur = db.session.get(Utilisateur, data.get("auteur_id"))
-    if not categorie or not utilisateur:
+    if not all(
+        references_exist(
+            (Categorie, data.get("categorie_id")), (Utilisateur, data.get("auteur_id"))
+        )
+    ):
         return jsonify({"error": "Catégorie ou utilisateur invalide."}), 400
 
     new_article = Article(
@@ -55,7 +218,10 @@ def create_article():
         auteur_id=data.get("auteur_id"),
     )
     db.session.add(new_article)
+    tables = counters.inserted(Article, [new_article])
     db.session.commit()
+    cache.invalidate("articles", *tables)
+    feed.article_saved(new_article)
     return jsonify(new_article.to_dict()), 201
 
 
@@ -63,29 +229,62 @@ def create_article():
 def update_article(article_id: int):
     """Met à jour un article existant."""
     article = get_or_404(Article, article_id)
+    check_if_match(article)
     data = request.get_json()
+    before = {"categorie_id": article.categorie_id, "auteur_id": article.auteur_id}
     if "titre" in data:
         article.titre = data["titre"]
     if "contenu" in data:
         article.contenu = data["contenu"]
-    if "categorie_id" in data:
-        categorie = db.session.get(Categorie, data["categorie_id"])
-        if not categorie:
-            return jsonify({"error": "Catégorie invalide."}), 400
-        article.categorie_id = data["categorie_id"]
-    if "auteur_id" in data:
-        utilisateur = db.session.get(Utilisateur, data["auteur_id"])
-        if not utilisateur:
-            return jsonify({"error": "Utilisateur invalide."}), 400
-        article.auteur_id = data["auteur_id"]
+    # Les références modifiées sont vérifiées ensemble, en une seule requête
+    references = {
+        name: (model, data[name])
+        for name, model in (("categorie_id", Categorie), ("auteur_id", Utilisateur))
+        if name in data
+    }
+    found = references_exist(*references.values())
+    for name, exists in zip(references, found):
+        if not exists:
+            return jsonify({"error": REFERENCE_ERRORS[name]}), 400
+        setattr(article, name, data[name])
+    tables = counters.updated(Article, [before], [article])
     db.session.commit()
-    return jsonify(article.to_dict()), 200
+    cache.invalidate("articles", *tables)
+    feed.article_saved(article, before["categorie_id"])
+    response = jsonify(article.to_dict())
+    return (
+        set_validators(response, entity_etag(article), article.date_modification),
+        200,
+    )
 
 
 @articles_bp.route("/<int:article_id>", methods=["DELETE"])
 def delete_article(article_id: int):
     """Supprime un article par son identifiant."""
     article = get_or_404(Article, article_id)
-    db.session.delete(article)
+    check_if_match(article)
+    categorie_id = article.categorie_id
+    # Les dépendants sont supprimés en cascade
+    tables = cascade_delete(Article, Article.id == article_id)
     db.session.commit()
+    cache.invalidate(*tables)
+    feed.article_deleted(categorie_id, article_id)
     return jsonify({"message": "Article supprimé."}), 200
+
+
+@articles_bp.route("/bulk", methods=["POST"])
+def bulk_create_articles():
+    """Crée plusieurs articles en une transaction (voir src.bulk)."""
+    return bulk_create(ARTICLE_BULK)
+
+
+@articles_bp.route("/bulk", methods=["PATCH"])
+def bulk_update_articles():
+    """Met à jour plusieurs articles, identifiés par leur id, en une transaction."""
+    return bulk_update(ARTICLE_BULK)
+
+
+@articles_bp.route("/bulk", methods=["DELETE"])
+def bulk_delete_articles():
+    """Supprime plusieurs articles (et leurs dépendants) en une transaction."""
+    return bulk_delete(ARTICLE_BULK)
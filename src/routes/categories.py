@@ -5,31 +5,84 @@ Fournit les endpoints CRUD pour l'entité Categorie.
 """
 
 from flask import Blueprint, request, jsonify, abort
-from src.models import db, Categorie
+from sqlalchemy import select
+from src.models import db, actif, Categorie
+from src.cache import cache
+from src.feed import feed
+from src.jobs import schedule_delete, wants_async
+from src.conditional import (
+    check_if_match,
+    conditional_json,
+    entity_etag,
+    set_validators,
+)
+from src.bulk import (
+    BulkResource,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    cascade_delete,
+)
+from src.filtering import ListQuery
+from src.pagination import paginate, page_response
+from src.streaming import stream_ndjson, wants_stream
 
 categories_bp = Blueprint("categories", __name__, url_prefix="/categories")
 
+# Clé de tri unique utilisée par la pagination par curseur
+CATEGORIE_KEYS = [(Categorie.id, False)]
+
+# Filtres, tri et champs des listes de catégories (voir src.filtering)
+CATEGORIE_QUERY = ListQuery(
+    Categorie,
+    fields=["id", "nom", "description", "nb_articles"],
+    default_sort=CATEGORIE_KEYS,
+    filters=["nom"],
+    sortable=["id", "nom"],
+)
+
+# Opérations groupées : /categories/bulk
+CATEGORIE_BULK = BulkResource(
+    Categorie,
+    fields=["nom", "description"],
+    required=["nom"],
+    required_message="Le nom de la catégorie est requis.",
+    unique=["nom"],
+)
+
 
 def get_or_404(model, pk):
     """Retourne l'instance du modèle ou renvoie 404 si non trouvée."""
-    obj = db.session.get(model, pk)
+    obj = actif(db.session.get(model, pk))
     if obj is None:
         abort(404, description=f"{model.__name__} with id {pk} not found.")
     return obj
 
 
 @categories_bp.route("", methods=["GET"])
+@cache.cached("categories")
 def get_categories():
-    """Retourne la liste complète des catégories."""
-    categories = db.session.query(Categorie).all()
-    return jsonify([categorie.to_dict() for categorie in categories]), 200
+    """
+    Retourne les catégories par identifiant croissant, page par page
+    (ou en flux NDJSON, voir src.streaming).
+    """
+    stmt, keys, wrap = CATEGORIE_QUERY.apply(
+        select(Categorie).where(Categorie.date_suppression.is_(None))
+    )
+    if wants_stream():
+        return stream_ndjson(stmt.order_by(Categorie.id), wrap)
+    categories, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(categories, next_cursor)
 
 
 @categories_bp.route("/<int:categorie_id>", methods=["GET"])
+@cache.cached("categories")
 def get_category(categorie_id: int):
     """Retourne une catégorie par son identifiant."""
     categorie = get_or_404(Categorie, categorie_id)
-    return jsonify(categorie.to_dict()), 200
+    return conditional_json(
+        categorie.to_dict, entity_etag(categorie), categorie.date_modification
+    )
 
 
 @categories_bp.route("", methods=["POST"])
@@ -41,6 +94,8 @@ def create_category():
     new_category = Categorie(nom=data.get("nom"), description=data.get("description"))
     db.session.add(new_category)
     db.session.commit()
+    cache.invalidate("categories")
+    feed.invalidate("categories")
     return jsonify(new_category.to_dict()), 201
 
 
@@ -48,19 +103,58 @@ def create_category():
 def update_category(categorie_id: int):
     """Met à jour une catégorie existante."""
     categorie = get_or_404(Categorie, categorie_id)
+    check_if_match(categorie)
     data = request.get_json()
     if "nom" in data:
         categorie.nom = data["nom"]
     if "description" in data:
         categorie.description = data["description"]
     db.session.commit()
-    return jsonify(categorie.to_dict()), 200
+    cache.invalidate("categories")
+    feed.invalidate("categories")
+    response = jsonify(categorie.to_dict())
+    return (
+        set_validators(response, entity_etag(categorie), categorie.date_modification),
+        200,
+    )
 
 
 @categories_bp.route("/<int:categorie_id>", methods=["DELETE"])
 def delete_category(categorie_id: int):
-    """Supprime une catégorie par son identifiant."""
+    """
+    Supprime une catégorie par son identifiant (en arrière-plan avec l'en-tête
+    Prefer: respond-async, voir src.jobs).
+    """
     categorie = get_or_404(Categorie, categorie_id)
-    db.session.delete(categorie)
+    check_if_match(categorie)
+    if wants_async():
+        # Purge en arrière-plan, la ressource est masquée dès maintenant
+        response = schedule_delete(categorie)
+        # Ses articles et leurs commentaires sont masqués avec elle
+        cache.invalidate("categories", "articles", "commentaires")
+        feed.invalidate("categories")
+        return response
+    # Les dépendants sont supprimés en cascade
+    tables = cascade_delete(Categorie, Categorie.id == categorie_id)
     db.session.commit()
+    cache.invalidate(*tables)
+    feed.invalidate("categories")
     return jsonify({"message": "Catégorie supprimée."}), 200
+
+
+@categories_bp.route("/bulk", methods=["POST"])
+def bulk_create_categories():
+    """Crée plusieurs categories en une transaction (voir src.bulk)."""
+    return bulk_create(CATEGORIE_BULK)
+
+
+@categories_bp.route("/bulk", methods=["PATCH"])
+def bulk_update_categories():
+    """Met à jour plusieurs categories, identifiés par leur id, en une transaction."""
+    return bulk_update(CATEGORIE_BULK)
+
+
+@categories_bp.route("/bulk", methods=["DELETE"])
+def bulk_delete_categories():
+    """Supprime plusieurs categories (et leurs dépendants) en une transaction."""
+    return bulk_delete(CATEGORIE_BULK)
@@ -5,31 +5,97 @@ Fournit les endpoints CRUD pour l'entité Commentaire.
 """
 
 from flask import Blueprint, request, jsonify, abort
-from src.models import db, Commentaire, Article, Utilisateur
+from sqlalchemy import select
+from src.models import (
+    db,
+    parents_actifs,
+    references_exist,
+    Commentaire,
+    Article,
+    Utilisateur,
+)
+from src.cache import cache
+from src.conditional import (
+    check_if_match,
+    conditional_json,
+    entity_etag,
+    set_validators,
+)
+from src import counters
+from src.bulk import (
+    BulkResource,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    cascade_delete,
+)
+from src.filtering import ListQuery
+from src.pagination import paginate, page_response
+from src.streaming import stream_ndjson, wants_stream
 
 commentaires_bp = Blueprint("commentaires", __name__, url_prefix="/commentaires")
 
+# Clé de tri unique utilisée par la pagination par curseur
+COMMENTAIRE_KEYS = [(Commentaire.date_commentaire, True), (Commentaire.id, True)]
+
+# Filtres, tri et champs des listes de commentaires (voir src.filtering)
+COMMENTAIRE_QUERY = ListQuery(
+    Commentaire,
+    fields=["id", "contenu", "date_commentaire", "article_id", "auteur_id"],
+    default_sort=COMMENTAIRE_KEYS,
+    filters=["article_id", "auteur_id"],
+    date="date_commentaire",
+    sortable=["date_commentaire", "id"],
+)
+
+# Opérations groupées : /commentaires/bulk
+COMMENTAIRE_BULK = BulkResource(
+    Commentaire,
+    fields=["contenu", "article_id", "auteur_id"],
+    required=["contenu", "article_id", "auteur_id"],
+    required_message="Le contenu, l'article et l'auteur sont requis.",
+    foreign_keys={
+        "article_id": (Article, "Article invalide."),
+        "auteur_id": (Utilisateur, "Utilisateur invalide."),
+    },
+)
+
 
 def get_or_404(model, pk):
-    """Retourne l'instance du modèle ou renvoie 404 si non trouvée."""
-    obj = db.session.get(model, pk)
+    """
+    Retourne l'instance du modèle ou renvoie 404 si elle n'existe pas ou si un
+    parent attend sa suppression.
+    """
+    obj = db.session.scalars(
+        select(model).where(model.id == pk, *parents_actifs(model))
+    ).first()
     if obj is None:
         abort(404, description=f"{model.__name__} with id {pk} not found.")
     return obj
 
 
 @commentaires_bp.route("", methods=["GET"])
+@cache.cached("commentaires")
 def get_commentaires():
-    """Retourne la liste complète des commentaires."""
-    commentaires = db.session.query(Commentaire).all()
-    return jsonify([commentaire.to_dict() for commentaire in commentaires]), 200
+    """
+    Retourne les commentaires, du plus récent au plus ancien, page par page
+    (ou en flux NDJSON, voir src.streaming).
+    """
+    stmt, keys, wrap = COMMENTAIRE_QUERY.apply(select(Commentaire))
+    if wants_stream():
+        return stream_ndjson(stmt.order_by(Commentaire.id), wrap)
+    commentaires, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(commentaires, next_cursor)
 
 
 @commentaires_bp.route("/<int:commentaire_id>", methods=["GET"])
+@cache.cached("commentaires")
 def get_commentaire(commentaire_id: int):
     """Retourne un commentaire par son identifiant."""
     commentaire = get_or_404(Commentaire, commentaire_id)
-    return jsonify(commentaire.to_dict()), 200
+    return conditional_json(
+        commentaire.to_dict, entity_etag(commentaire), commentaire.date_modification
+    )
 
 
 @commentaires_bp.route("", methods=["POST"])
@@ -39,9 +105,11 @@ def create_commentaire():
     if not data or not data.get("contenu"):
         return jsonify({"error": "Le contenu du commentaire est requis."}), 400
 
-    article = db.session.get(Article, data.get("article_id"))
-    utilisateur = db.session.get(Utilisateur, data.get("auteur_id"))
-    if not article or not utilisateur:
+    if not all(
+        references_exist(
+            (Article, data.get("article_id")), (Utilisateur, data.get("auteur_id"))
+        )
+    ):
         return jsonify({"error": "Article ou utilisateur invalide."}), 400
 
     new_commentaire = Commentaire(
@@ -50,7 +118,9 @@ def create_commentaire():
         auteur_id=data.get("auteur_id"),
     )
     db.session.add(new_commentaire)
+    tables = counters.inserted(Commentaire, [new_commentaire])
     db.session.commit()
+    cache.invalidate("commentaires", *tables)
     return jsonify(new_commentaire.to_dict()), 201
 
 
@@ -58,17 +128,45 @@ def create_commentaire():
 def update_commentaire(commentaire_id: int):
     """Met à jour un commentaire existant."""
     commentaire = get_or_404(Commentaire, commentaire_id)
+    check_if_match(commentaire)
     data = request.get_json()
     if "contenu" in data:
         commentaire.contenu = data["contenu"]
     db.session.commit()
-    return jsonify(commentaire.to_dict()), 200
+    cache.invalidate("commentaires")
+    response = jsonify(commentaire.to_dict())
+    return (
+        set_validators(
+            response, entity_etag(commentaire), commentaire.date_modification
+        ),
+        200,
+    )
 
 
 @commentaires_bp.route("/<int:commentaire_id>", methods=["DELETE"])
 def delete_commentaire(commentaire_id: int):
     """Supprime un commentaire par son identifiant."""
     commentaire = get_or_404(Commentaire, commentaire_id)
-    db.session.delete(commentaire)
+    check_if_match(commentaire)
+    tables = cascade_delete(Commentaire, Commentaire.id == commentaire_id)
     db.session.commit()
+    cache.invalidate(*tables)
     return jsonify({"message": "Commentaire supprimé."}), 200
+
+
+@commentaires_bp.route("/bulk", methods=["POST"])
+def bulk_create_commentaires():
+    """Crée plusieurs commentaires en une transaction (voir src.bulk)."""
+    return bulk_create(COMMENTAIRE_BULK)
+
+
+@commentaires_bp.route("/bulk", methods=["PATCH"])
+def bulk_update_commentaires():
+    """Met à jour plusieurs commentaires, identifiés par leur id, en une transaction."""
+    return bulk_update(COMMENTAIRE_BULK)
+
+
+@commentaires_bp.route("/bulk", methods=["DELETE"])
+def bulk_delete_commentaires():
+    """Supprime plusieurs commentaires (et leurs dépendants) en une transaction."""
+    return bulk_delete(COMMENTAIRE_BULK)
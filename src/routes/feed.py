@@ -0,0 +1,27 @@
+"""
+Routes du fil des derniers articles (voir src.feed).
+
+Fournit le fil de chaque catégorie et celui de toutes les catégories à la fois,
+servis depuis le fil en mémoire (ou Redis) sans lecture en base lorsqu'il est
+chargé.
+"""
+
+from flask import Blueprint, abort, jsonify
+from src.feed import feed
+
+feed_bp = Blueprint("feed", __name__)
+
+
+@feed_bp.route("/feed", methods=["GET"])
+def get_feed():
+    """Retourne, pour chaque catégorie, ses articles les plus récents."""
+    return jsonify({"categories": feed.all()})
+
+
+@feed_bp.route("/categories/<int:categorie_id>/feed", methods=["GET"])
+def get_category_feed(categorie_id: int):
+    """Retourne les articles les plus récents d'une catégorie."""
+    articles = feed.categorie(categorie_id)
+    if articles is None:
+        abort(404, description=f"Categorie with id {categorie_id} not found.")
+    return jsonify({"items": articles})
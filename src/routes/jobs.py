@@ -0,0 +1,20 @@
+"""
+Routes des tâches de fond (voir src.jobs).
+
+Fournit l'état d'une tâche, dont l'adresse est renvoyée par les suppressions
+différées (réponse 202).
+"""
+
+from flask import Blueprint, jsonify, abort
+from src.models import db, Tache
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+
+@jobs_bp.route("/<int:job_id>", methods=["GET"])
+def get_job(job_id: int):
+    """Retourne l'état d'une tâche (statut, lignes supprimées, erreur)."""
+    tache = db.session.get(Tache, job_id)
+    if tache is None:
+        abort(404, description=f"Tache with id {job_id} not found.")
+    return jsonify(tache.to_dict())
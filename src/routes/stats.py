@@ -0,0 +1,88 @@
+"""
+Routes des statistiques agrégées (voir src.stats).
+
+Fournit les chiffres de chaque catégorie et l'activité d'un utilisateur, lus dans
+les vues de statistiques avec leur fraîcheur. Tant que les vues n'ont pas été
+calculées, les réponses sont vides (chiffres à null).
+"""
+
+from flask import Blueprint, abort, jsonify
+from sqlalchemy import func, select
+from src.models import db, Categorie, Utilisateur
+from src.stats import stats, stats_activite, stats_categories, stats_utilisateurs
+
+stats_bp = Blueprint("stats", __name__, url_prefix="/stats")
+
+
+@stats_bp.route("/categories", methods=["GET"])
+def get_category_stats():
+    """Articles, commentaires et dernière publication de chaque catégorie."""
+    fraicheur = stats.fraicheur("stats_categories")
+    if not fraicheur["calculee"]:
+        return jsonify({"items": [], "fraicheur": fraicheur})
+    sc = stats_categories
+    rows = db.session.execute(
+        select(
+            Categorie.id,
+            Categorie.nom,
+            func.coalesce(sc.c.nb_articles, 0).label("nb_articles"),
+            func.coalesce(sc.c.nb_commentaires, 0).label("nb_commentaires"),
+            sc.c.derniere_publication,
+        )
+        .outerjoin(sc, sc.c.categorie_id == Categorie.id)
+        .where(Categorie.date_suppression.is_(None))
+        .order_by(Categorie.id)
+    )
+    items = [
+        {
+            "id": row.id,
+            "nom": row.nom,
+            "nb_articles": row.nb_articles,
+            "nb_commentaires": row.nb_commentaires,
+            "derniere_publication": (
+                row.derniere_publication.isoformat()
+                if row.derniere_publication
+                else None
+            ),
+        }
+        for row in rows
+    ]
+    return jsonify({"items": items, "fraicheur": fraicheur})
+
+
+@stats_bp.route("/utilisateurs/<int:utilisateur_id>", methods=["GET"])
+def get_user_stats(utilisateur_id: int):
+    """Articles, commentaires reçus et activité par mois d'un utilisateur."""
+    fraicheur = stats.fraicheur("stats_utilisateurs", "stats_activite")
+    stmt = select(Utilisateur.id, Utilisateur.nom).where(
+        Utilisateur.id == utilisateur_id,
+        Utilisateur.date_suppression.is_(None),
+    )
+    su = stats_utilisateurs
+    if fraicheur["calculee"]:
+        stmt = stmt.add_columns(
+            func.coalesce(su.c.nb_articles, 0).label("nb_articles"),
+            func.coalesce(su.c.nb_commentaires_recus, 0).label("nb_commentaires_recus"),
+        ).outerjoin(su, su.c.utilisateur_id == Utilisateur.id)
+    row = db.session.execute(stmt).one_or_none()
+    if row is None:
+        abort(404, description=f"Utilisateur with id {utilisateur_id} not found.")
+    body = {"id": row.id, "nom": row.nom, "fraicheur": fraicheur}
+    if not fraicheur["calculee"]:
+        return jsonify(
+            {**body, "nb_articles": None, "nb_commentaires_recus": None, "activite": []}
+        )
+    sa = stats_activite
+    activite = db.session.execute(
+        select(sa.c.mois, sa.c.nb_articles, sa.c.nb_commentaires)
+        .where(sa.c.utilisateur_id == utilisateur_id)
+        .order_by(sa.c.mois)
+    )
+    return jsonify(
+        {
+            **body,
+            "nb_articles": row.nb_articles,
+            "nb_commentaires_recus": row.nb_commentaires_recus,
+            "activite": [dict(mois._mapping) for mois in activite],
+        }
+    )
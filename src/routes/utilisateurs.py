@@ -5,31 +5,97 @@ Fournit les endpoints CRUD pour l'entité Utilisateur.
 """
 
 from flask import Blueprint, request, jsonify, abort
-from src.models import db, Utilisateur
+from sqlalchemy import select
+from src.models import db, actif, Article, Utilisateur
+from src.cache import cache
+from src.feed import feed
+from src.jobs import schedule_delete, wants_async
+from src.conditional import (
+    check_if_match,
+    conditional_json,
+    entity_etag,
+    set_validators,
+)
+from src.bulk import (
+    BulkResource,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    cascade_delete,
+)
+from src.filtering import ListQuery
+from src.pagination import paginate, page_response
+from src.routes.articles import ARTICLE_QUERY
+from src.streaming import stream_ndjson, wants_stream
 
 utilisateurs_bp = Blueprint("utilisateurs", __name__, url_prefix="/utilisateurs")
 
+# Clé de tri unique utilisée par la pagination par curseur
+UTILISATEUR_KEYS = [(Utilisateur.id, False)]
+
+# Filtres, tri et champs des listes d'utilisateurs (voir src.filtering)
+UTILISATEUR_QUERY = ListQuery(
+    Utilisateur,
+    fields=["id", "nom", "email", "nb_articles"],
+    default_sort=UTILISATEUR_KEYS,
+    filters=["email"],
+    sortable=["id", "email"],
+)
+
+# Opérations groupées : /utilisateurs/bulk
+UTILISATEUR_BULK = BulkResource(
+    Utilisateur,
+    fields=["nom", "email"],
+    required=["nom", "email"],
+    required_message="Le nom et l'email sont requis.",
+    unique=["email"],
+)
+
 
 def get_or_404(model, pk):
     """Retourne l'instance du modèle ou renvoie 404 si non trouvée."""
-    obj = db.session.get(model, pk)
+    obj = actif(db.session.get(model, pk))
     if obj is None:
         abort(404, description=f"{model.__name__} with id {pk} not found.")
     return obj
 
 
 @utilisateurs_bp.route("", methods=["GET"])
+@cache.cached("utilisateurs")
 def get_utilisateurs():
-    """Retourne la liste complète des utilisateurs."""
-    utilisateurs = db.session.query(Utilisateur).all()
-    return jsonify([utilisateur.to_dict() for utilisateur in utilisateurs]), 200
+    """
+    Retourne les utilisateurs par identifiant croissant, page par page
+    (ou en flux NDJSON, voir src.streaming).
+    """
+    stmt, keys, wrap = UTILISATEUR_QUERY.apply(
+        select(Utilisateur).where(Utilisateur.date_suppression.is_(None))
+    )
+    if wants_stream():
+        return stream_ndjson(stmt.order_by(Utilisateur.id), wrap)
+    utilisateurs, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(utilisateurs, next_cursor)
 
 
 @utilisateurs_bp.route("/<int:utilisateur_id>", methods=["GET"])
+@cache.cached("utilisateurs")
 def get_utilisateur(utilisateur_id: int):
     """Retourne un utilisateur par son identifiant."""
     utilisateur = get_or_404(Utilisateur, utilisateur_id)
-    return jsonify(utilisateur.to_dict()), 200
+    return conditional_json(
+        utilisateur.to_dict, entity_etag(utilisateur), utilisateur.date_modification
+    )
+
+
+@utilisateurs_bp.route("/<int:utilisateur_id>/articles", methods=["GET"])
+@cache.cached("utilisateurs", "articles")
+def get_utilisateur_articles(utilisateur_id: int):
+    """Retourne les articles d'un utilisateur, du plus récent au plus ancien."""
+    get_or_404(Utilisateur, utilisateur_id)
+    stmt, keys, wrap = ARTICLE_QUERY.apply(
+        select(Article).where(Article.auteur_id == utilisateur_id)
+    )
+    articles, next_cursor = paginate(stmt, keys, wrap)
+    return page_response(articles, next_cursor)
 
 
 @utilisateurs_bp.route("", methods=["POST"])
@@ -41,6 +107,7 @@ def create_utilisateur():
     new_utilisateur = Utilisateur(nom=data.get("nom"), email=data.get("email"))
     db.session.add(new_utilisateur)
     db.session.commit()
+    cache.invalidate("utilisateurs")
     return jsonify(new_utilisateur.to_dict()), 201
 
 
@@ -48,19 +115,60 @@ def create_utilisateur():
 def update_utilisateur(utilisateur_id: int):
     """Met à jour un utilisateur existant."""
     utilisateur = get_or_404(Utilisateur, utilisateur_id)
+    check_if_match(utilisateur)
     data = request.get_json()
     if "nom" in data:
         utilisateur.nom = data["nom"]
     if "email" in data:
         utilisateur.email = data["email"]
     db.session.commit()
-    return jsonify(utilisateur.to_dict()), 200
+    cache.invalidate("utilisateurs")
+    response = jsonify(utilisateur.to_dict())
+    return (
+        set_validators(
+            response, entity_etag(utilisateur), utilisateur.date_modification
+        ),
+        200,
+    )
 
 
 @utilisateurs_bp.route("/<int:utilisateur_id>", methods=["DELETE"])
 def delete_utilisateur(utilisateur_id: int):
-    """Supprime un utilisateur par son identifiant."""
+    """
+    Supprime un utilisateur par son identifiant (en arrière-plan avec l'en-tête
+    Prefer: respond-async, voir src.jobs).
+    """
     utilisateur = get_or_404(Utilisateur, utilisateur_id)
-    db.session.delete(utilisateur)
+    check_if_match(utilisateur)
+    if wants_async():
+        # Purge en arrière-plan, la ressource est masquée dès maintenant
+        response = schedule_delete(utilisateur)
+        # Ses articles et commentaires, et ceux écrits sur ses articles, sont
+        # masqués avec lui
+        cache.invalidate("utilisateurs", "articles", "commentaires")
+        feed.invalidate("utilisateurs")
+        return response
+    # Les dépendants sont supprimés en cascade
+    tables = cascade_delete(Utilisateur, Utilisateur.id == utilisateur_id)
     db.session.commit()
+    cache.invalidate(*tables)
+    feed.invalidate("utilisateurs")
     return jsonify({"message": "Utilisateur supprimé."}), 200
+
+
+@utilisateurs_bp.route("/bulk", methods=["POST"])
+def bulk_create_utilisateurs():
+    """Crée plusieurs utilisateurs en une transaction (voir src.bulk)."""
+    return bulk_create(UTILISATEUR_BULK)
+
+
+@utilisateurs_bp.route("/bulk", methods=["PATCH"])
+def bulk_update_utilisateurs():
+    """Met à jour plusieurs utilisateurs, identifiés par leur id, en une transaction."""
+    return bulk_update(UTILISATEUR_BULK)
+
+
+@utilisateurs_bp.route("/bulk", methods=["DELETE"])
+def bulk_delete_utilisateurs():
+    """Supprime plusieurs utilisateurs (et leurs dépendants) en une transaction."""
+    return bulk_delete(UTILISATEUR_BULK)
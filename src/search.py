@@ -0,0 +1,75 @@
+"""
+Recherche plein texte dans les articles.
+
+Sous PostgreSQL, la requête interroge la colonne ``articles.recherche``
+(tsvector généré, index GIN) avec ``websearch_to_tsquery`` et classe par
+``ts_rank_cd``. Sous SQLite, elle passe par la table virtuelle FTS5
+``articles_fts`` classée par ``bm25``. Dans les deux cas, les résultats sont
+paginés par curseur sur (score, id).
+"""
+
+import re
+
+from flask import abort, request
+from sqlalchemy import Float, column, func, literal_column, select, table
+
+from src.models import FTS_CONFIG, Article, db, parents_actifs
+from src.pagination import decode_cursor, encode_cursor, get_limit, keyset_condition
+
+articles_fts = table("articles_fts", column("rowid"))
+
+
+def fts5_query(text: str) -> str:
+    """Traduit une saisie libre en requête FTS5 sûre : tous les mots, entre guillemets."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+def search_statement(text: str, dialect: str):
+    """Retourne (requête, expression du score) pour le SGBD dialect."""
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery(FTS_CONFIG, text)
+        vector = literal_column("articles.recherche")
+        score = func.ts_rank_cd(vector, query, type_=Float)
+        stmt = select(Article).where(vector.op("@@")(query))
+    elif dialect == "sqlite":
+        match = fts5_query(text)
+        if not match:
+            abort(400, description="La recherche doit contenir au moins un mot.")
+        # bm25 est négatif (plus petit = plus pertinent) ; le titre pèse 10 fois plus.
+        score = -func.bm25(literal_column("articles_fts"), 10.0, 1.0, type_=Float)
+        stmt = (
+            select(Article)
+            .join(articles_fts, articles_fts.c.rowid == Article.id)
+            .where(literal_column("articles_fts").op("MATCH")(match))
+        )
+    else:
+        abort(501, description=f"Recherche non disponible pour {dialect}.")
+    return stmt, score
+
+
+def search_articles(text: str):
+    """
+    Exécute la recherche pour la requête courante (paramètres limit et cursor).
+
+    Retourne un couple (articles, curseur suivant).
+    """
+    dialect = db.session.get_bind(mapper=Article.__mapper__).dialect.name
+    stmt, score = search_statement(text, dialect)
+    stmt = stmt.where(*parents_actifs(Article))
+    keys = [(score, True), (Article.id, True)]
+
+    limit = get_limit()
+    cursor = request.args.get("cursor")
+    if cursor:
+        stmt = stmt.where(keyset_condition(keys, decode_cursor(cursor, keys)))
+    stmt = stmt.add_columns(score.label("score")).order_by(
+        score.desc(), Article.id.desc()
+    )
+    rows = db.session.execute(stmt.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        article, last_score = rows[-1]
+        next_cursor = encode_cursor([last_score, article.id])
+    return [article for article, _ in rows], next_cursor
@@ -0,0 +1,68 @@
+"""
+Encodage JSON des réponses.
+
+FastJSONProvider remplace le fournisseur JSON de Flask : il encode avec orjson
+lorsqu'il est installé (encodage en C, dates ISO 8601 natives), sinon avec le
+module json de la bibliothèque standard. Dans les deux cas, les dates sont écrites
+en ISO 8601 comme par les méthodes to_dict() des modèles : les routes de liste
+peuvent ainsi encoder directement les colonnes lues en base (voir src.filtering),
+sans construire d'entités ni convertir les dates ligne par ligne.
+"""
+
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _iso_default(obj):
+    """Sérialise les dates en ISO 8601 (Flask les écrit au format HTTP)."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return _default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Fournisseur JSON de l'application : orjson si disponible, sinon json."""
+
+    default = staticmethod(_iso_default)
+    # Encodage par orjson ; False force le module json.
+    use_orjson = orjson is not None
+    # Réponses en UTF-8, comme avec orjson.
+    ensure_ascii = False
+
+    def _pretty(self) -> bool:
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumpb(self, obj, pretty: bool = False) -> bytes:
+        """Encode obj en JSON (octets UTF-8), indenté si pretty."""
+        if not self.use_orjson:
+            if pretty:
+                return super().dumps(obj, indent=2).encode()
+            return super().dumps(obj, separators=(",", ":")).encode()
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not self.use_orjson or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumpb(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumpb(obj, pretty=self._pretty()) + b"\n", mimetype=self.mimetype
+        )
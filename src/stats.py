@@ -0,0 +1,209 @@
+"""
+Statistiques agrégées : articles et commentaires par catégorie, activité d'un
+utilisateur par mois.
+
+Les agrégats ne sont pas recalculés à chaque lecture : ils sont lus dans des vues
+matérialisées (PostgreSQL) ou des tables de synthèse (SQLite) définies dans
+src/models.py, et rafraîchis :
+    - par une tâche de fond (voir src/jobs.py) après STATS_REFRESH_WRITES
+      requêtes d'écriture réussies, comptées par processus (0 : jamais) ;
+    - par une tâche de fond également lorsqu'une lecture les trouve plus vieux
+      que STATS_MAX_AGE secondes (0 : jamais), la lecture servant les valeurs en
+      place ;
+    - par une tâche de fond encore à la première lecture, s'ils n'ont jamais été
+      calculés : la réponse est alors vide, marquée ``"calculee": false`` ;
+    - par ``flask --app src.app blog refresh-stats`` (tâche planifiée).
+
+Aucune lecture ne calcule donc elle-même les agrégats. Comme les routes, ils
+ignorent les lignes en attente de suppression (voir STATS_ARTICLES dans
+src/models.py). Chaque réponse indique la date du dernier calcul et son âge (clé
+``fraicheur``).
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, request
+from sqlalchemy import (
+    Integer,
+    String,
+    column,
+    func,
+    insert,
+    select,
+    table,
+    text,
+    update,
+)
+
+from src.models import STATS_QUERIES, Horodatage, Rafraichissement, db, stats_query
+from src.replicas import SAFE_METHODS
+
+stats_categories = table(
+    "stats_categories",
+    column("categorie_id", Integer),
+    column("nb_articles", Integer),
+    column("nb_commentaires", Integer),
+    column("derniere_publication", Horodatage),
+)
+stats_utilisateurs = table(
+    "stats_utilisateurs",
+    column("utilisateur_id", Integer),
+    column("nb_articles", Integer),
+    column("nb_commentaires_recus", Integer),
+)
+stats_activite = table(
+    "stats_activite",
+    column("utilisateur_id", Integer),
+    column("mois", String),
+    column("nb_articles", Integer),
+    column("nb_commentaires", Integer),
+)
+
+
+def refresh() -> None:
+    """
+    Recalcule les vues de statistiques sur la base principale et note la date de
+    chaque calcul. Les lectures concurrentes voient les anciennes valeurs jusqu'à
+    la fin du calcul (CONCURRENTLY sous PostgreSQL, transaction sous SQLite).
+    """
+    primary = {"bind": db.engine}
+    dialect = db.engine.dialect.name
+    # Une vue jamais calculée (créée WITH NO DATA par la migration) ne peut pas
+    # être rafraîchie CONCURRENTLY.
+    computed = set(
+        db.session.scalars(
+            select(Rafraichissement.vue).where(
+                Rafraichissement.date_rafraichissement.is_not(None)
+            ),
+            bind_arguments=primary,
+        )
+    )
+    for name in STATS_QUERIES:
+        start = time.perf_counter()
+        if dialect == "postgresql":
+            concurrently = "CONCURRENTLY " if name in computed else ""
+            db.session.execute(
+                text(f"REFRESH MATERIALIZED VIEW {concurrently}{name}"),
+                bind_arguments=primary,
+            )
+        else:
+            db.session.execute(text(f"DELETE FROM {name}"), bind_arguments=primary)
+            db.session.execute(
+                text(f"INSERT INTO {name} {stats_query(name, dialect)}"),
+                bind_arguments=primary,
+            )
+        values = {
+            "date_rafraichissement": func.now(),
+            "duree_ms": round((time.perf_counter() - start) * 1000),
+        }
+        updated = db.session.execute(
+            update(Rafraichissement)
+            .where(Rafraichissement.vue == name)
+            .values(**values)
+        ).rowcount
+        if not updated:
+            db.session.execute(insert(Rafraichissement).values(vue=name, **values))
+    db.session.commit()
+
+
+class WriteCounter:
+    """Compteur des écritures du processus depuis la dernière demande de calcul."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, threshold: int) -> bool:
+        """Compte une écriture ; retourne True (et repart de zéro) au seuil."""
+        with self._lock:
+            self.count += 1
+            if self.count < threshold:
+                return False
+            self.count = 0
+            return True
+
+
+class Statistics:
+    """
+    Extension Flask des statistiques.
+
+    S'initialise comme le cache : ``stats.init_app(app)`` dans create_app(). Les
+    routes de statistiques appellent ``stats.fraicheur(*vues)`` avant de lire les
+    vues.
+    """
+
+    def init_app(self, app) -> None:
+        """Lit la politique de rafraîchissement et compte les écritures."""
+        app.config.setdefault("STATS_REFRESH_WRITES", 1000)
+        app.config.setdefault("STATS_MAX_AGE", 300)
+        app.extensions["stats"] = WriteCounter()
+        app.after_request(self.count_write)
+
+    def count_write(self, response):
+        """Après STATS_REFRESH_WRITES écritures réussies, demande un calcul."""
+        threshold = current_app.config["STATS_REFRESH_WRITES"]
+        if (
+            threshold
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and current_app.extensions["stats"].add(threshold)
+        ):
+            self.schedule()
+        return response
+
+    def schedule(self) -> None:
+        """Confie le calcul aux tâches de fond, sans faire échouer la requête."""
+        from src.jobs import schedule_refresh
+
+        try:
+            schedule_refresh()
+        except Exception:
+            current_app.logger.warning(
+                "Calcul des statistiques non planifié", exc_info=True
+            )
+            db.session.rollback()
+
+    def fraicheur(self, *vues: str) -> dict:
+        """
+        Date et âge (secondes) du plus ancien calcul des vues. Demande un calcul si
+        elles n'ont jamais été calculées (``calculee`` faux : les vues ne doivent
+        pas être lues) ou si elles ont plus de STATS_MAX_AGE secondes.
+        """
+        stmt = select(Rafraichissement.date_rafraichissement).where(
+            Rafraichissement.vue.in_(vues)
+        )
+        dates = [date for date in db.session.scalars(stmt) if date is not None]
+        if len(dates) < len(vues):
+            # Jamais calculées (ou calcul pas encore visible sur un réplica) : une
+            # seule tâche est créée, quel que soit le nombre de lecteurs
+            self.schedule()
+            return {
+                "date_rafraichissement": None,
+                "age": None,
+                "perimee": True,
+                "calculee": False,
+            }
+        date = min(_utc(date) for date in dates)
+        age = (datetime.now(timezone.utc) - date).total_seconds()
+        max_age = current_app.config["STATS_MAX_AGE"]
+        perimee = bool(max_age) and age > max_age
+        if perimee:
+            self.schedule()
+        return {
+            "date_rafraichissement": date.isoformat(),
+            "age": round(max(age, 0), 3),
+            "perimee": perimee,
+            "calculee": True,
+        }
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite rend des dates naïves, en UTC (CURRENT_TIMESTAMP)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+stats = Statistics()
@@ -0,0 +1,45 @@
+"""
+Export en flux NDJSON des routes de liste.
+
+Le mode flux est activé par ``?stream=1`` ou par l'en-tête
+``Accept: application/x-ndjson``. Les lignes sont lues par lots via un curseur
+côté serveur (``yield_per``) et envoyées au fur et à mesure : la mémoire reste
+constante et le premier octet part sans attendre la fin de la requête.
+"""
+
+from flask import Response, current_app, request, stream_with_context
+
+from src.models import db
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_YIELD_PER = 1000
+
+
+def wants_stream() -> bool:
+    """Indique si le client demande un export en flux NDJSON."""
+    if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def stream_ndjson(stmt, wrap=None) -> Response:
+    """
+    Retourne une réponse NDJSON produite lot par lot à partir de stmt.
+
+    wrap convertit chaque ligne lorsque stmt sélectionne des colonnes
+    (voir src.filtering).
+    """
+    yield_per = current_app.config.get("STREAM_YIELD_PER", DEFAULT_YIELD_PER)
+    dumpb = current_app.json.dumpb
+
+    def generate():
+        # yield_per active les curseurs côté serveur (stream_results) sous PostgreSQL.
+        result = db.session.execute(stmt.execution_options(yield_per=yield_per))
+        if wrap is None:
+            result = result.scalars()
+        for partition in result.partitions():
+            objs = partition if wrap is None else map(wrap, partition)
+            yield b"".join(dumpb(obj.to_dict()) + b"\n" for obj in objs)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,102 @@
+"""
+Client de test qui fait passer les requêtes par le point d'entrée ASGI.
+
+Avec ``BLOG_TEST_STACK=asgi`` (voir conftest.py), ``app.test_client()`` retourne
+un AsgiTestClient : les tests existants s'exécutent alors sur la pile ASGI, avec
+le pilote asynchrone de DATABASE_URL (``sqlite+aiosqlite:///:memory:``).
+"""
+
+import asyncio
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from flask.testing import FlaskClient
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+from werkzeug.wsgi import get_current_url
+from werkzeug.test import run_wsgi_app
+
+from src.asgi import AsgiApp
+
+
+def asgi_scope(environ: dict) -> dict:
+    """Construit le scope ASGI d'un environnement WSGI de test."""
+    headers = []
+    for key, value in environ.items():
+        if key.startswith("HTTP_"):
+            name = key[5:].replace("_", "-").lower()
+        elif key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = key.replace("_", "-").lower()
+        else:
+            continue
+        if value:
+            headers.append((name.encode("latin-1"), value.encode("latin-1")))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": environ["SERVER_PROTOCOL"].split("/")[1],
+        "method": environ["REQUEST_METHOD"],
+        "scheme": environ["wsgi.url_scheme"],
+        "path": environ["PATH_INFO"].encode("latin-1").decode(),
+        "query_string": environ["QUERY_STRING"].encode("latin-1"),
+        "root_path": environ.get("SCRIPT_NAME", "").encode("latin-1").decode(),
+        "headers": headers,
+        "server": (environ["SERVER_NAME"], int(environ["SERVER_PORT"])),
+        "client": (environ.get("REMOTE_ADDR", ""), 0),
+    }
+
+
+def run_async(coroutine):
+    """
+    Exécute coroutine depuis du code synchrone. Dans un test exécuté en greenlet,
+    la boucle d'évènements est celle du test : les connexions du pilote
+    asynchrone y restent attachées.
+    """
+    return await_only(coroutine) if in_greenlet() else asyncio.run(coroutine)
+
+
+async def call_asgi(app, scope: dict, body: bytes) -> list:
+    """Exécute une requête HTTP sur app et retourne les messages envoyés."""
+    messages = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+class AsgiTestClient(FlaskClient):
+    """FlaskClient dont les requêtes traversent AsgiApp."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.asgi = AsgiApp(self.application)
+
+    def _asgi_as_wsgi(self, environ, start_response):
+        body = environ["wsgi.input"].read()
+        messages = run_async(call_asgi(self.asgi, asgi_scope(environ), body))
+        start, chunks = messages[0], messages[1:]
+        status = HTTPStatus(start["status"])
+        start_response(
+            f"{status.value} {status.phrase}",
+            [(k.decode("latin-1"), v.decode("latin-1")) for k, v in start["headers"]],
+        )
+        return [chunk["body"] for chunk in chunks if chunk["body"]]
+
+    def run_wsgi_app(self, environ, buffered=False):
+        self._add_cookies_to_wsgi(environ)
+        rv = run_wsgi_app(self._asgi_as_wsgi, environ, buffered=buffered)
+        url = urlsplit(get_current_url(environ))
+        self._update_cookies_from_response(
+            url.hostname or "localhost", url.path, rv[2].getlist("Set-Cookie")
+        )
+        return rv
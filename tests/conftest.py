@@ -0,0 +1,50 @@
+"""
+Choix de la pile testée.
+
+Par défaut, les tests appellent l'application WSGI. Avec ``BLOG_TEST_STACK=asgi``,
+les mêmes tests passent par le point d'entrée ASGI (src/asgi.py) :
+
+    BLOG_TEST_STACK=asgi python -m pytest
+
+La base de test est alors ``sqlite+aiosqlite:///:memory:`` (sauf TEST_DATABASE_URL).
+
+Chaque test s'exécute alors dans un greenlet d'une boucle d'évènements unique,
+pour que les accès directs à la base (préparation des données, commandes CLI)
+puissent eux aussi utiliser le pilote asynchrone.
+"""
+
+import asyncio
+import os
+import unittest
+
+from flask import Flask
+from sqlalchemy.util import greenlet_spawn
+
+if os.getenv("BLOG_TEST_STACK", "wsgi") == "asgi":
+    from asgi_client import AsgiTestClient
+
+    os.environ.setdefault("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+    Flask.test_client_class = AsgiTestClient
+
+    _loop = asyncio.new_event_loop()
+    _run = unittest.TestCase.run
+
+    def _run_in_greenlet(self, result=None):
+        return _loop.run_until_complete(greenlet_spawn(_run, self, result))
+
+    unittest.TestCase.run = _run_in_greenlet
+
+    def pytest_sessionfinish(session, exitstatus):
+        # Ferme les connexions du pilote asynchrone : leurs threads empêcheraient
+        # sinon le processus de se terminer.
+        from src.models import db
+        from testapp import app
+
+        def dispose():
+            for engine in db.engines.values():
+                engine.dispose()
+
+        with app.app_context():
+            _loop.run_until_complete(greenlet_spawn(dispose))
+        _loop.close()
@@ -0,0 +1,207 @@
+"""
+Substitut local d'un serveur Redis pour les tests.
+
+Parle le protocole RESP sur un port éphémère et implémente le sous-ensemble
+de commandes utilisé par l'application. Les données sont en mémoire.
+"""
+
+import math
+import socketserver
+import threading
+import time
+
+from src.ratelimit import TOKEN_BUCKET_SCRIPT, refill
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def write(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, bool):
+            self.wfile.write(b":%d\r\n" % int(value))
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, str):
+            self.wfile.write(b"+%s\r\n" % value.encode())
+        elif isinstance(value, Exception):
+            self.wfile.write(b"-ERR %s\r\n" % str(value).encode())
+        elif isinstance(value, list):
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self.write(item)
+        else:
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+
+    def handle(self):
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].decode().upper()
+            try:
+                reply = getattr(self.server.standin, f"cmd_{name}")(*args[1:])
+            except AttributeError:
+                reply = Exception(f"unknown command '{name}'")
+            self.write(reply)
+
+
+class RedisStandIn:
+    """Serveur compatible Redis minimal, démarré dans un thread."""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.standin = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RedisStandIn":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _alive(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and expires < time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    # Commandes ---------------------------------------------------------------
+
+    def cmd_PING(self, *args):
+        return "PONG"
+
+    def cmd_SELECT(self, db):
+        return "OK"
+
+    def cmd_GET(self, key):
+        with self.lock:
+            return self.data[key] if self._alive(key) else None
+
+    def cmd_SET(self, key, value, *options):
+        with self.lock:
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if options and options[0].upper() == b"EX":
+                self.expires[key] = time.monotonic() + int(options[1])
+            return "OK"
+
+    def cmd_INCR(self, key):
+        with self.lock:
+            value = int(self.data[key]) + 1 if self._alive(key) else 1
+            self.data[key] = str(value).encode()
+            return value
+
+    def cmd_DEL(self, *keys):
+        with self.lock:
+            return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def cmd_EXISTS(self, *keys):
+        with self.lock:
+            return sum(1 for key in keys if self._alive(key))
+
+    def cmd_EXPIRE(self, key, seconds):
+        with self.lock:
+            if not self._alive(key):
+                return 0
+            self.expires[key] = time.monotonic() + int(seconds)
+            return 1
+
+    # Ensembles triés : dictionnaire membre -> score
+
+    def _zset(self, key):
+        return self.data[key] if self._alive(key) else {}
+
+    def _ranked(self, key):
+        zset = self._zset(key)
+        return sorted(zset, key=lambda member: (zset[member], member))
+
+    @staticmethod
+    def _range(members, start, stop):
+        start, stop = int(start), int(stop)
+        if start < 0:
+            start += len(members)
+        if stop < 0:
+            stop += len(members)
+        return members[max(start, 0) : stop + 1]
+
+    def cmd_ZADD(self, key, *pairs):
+        with self.lock:
+            zset = self.data.setdefault(key, self._zset(key))
+            added = 0
+            for score, member in zip(pairs[::2], pairs[1::2]):
+                added += member not in zset
+                zset[member] = float(score)
+            return added
+
+    def cmd_ZCARD(self, key):
+        with self.lock:
+            return len(self._zset(key))
+
+    def cmd_ZREVRANGE(self, key, start, stop):
+        with self.lock:
+            return self._range(self._ranked(key)[::-1], start, stop)
+
+    def cmd_ZREM(self, key, *members):
+        with self.lock:
+            zset = self._zset(key)
+            removed = sum(1 for m in members if zset.pop(m, None) is not None)
+            if not zset:
+                self.data.pop(key, None)
+            return removed
+
+    def cmd_ZREMRANGEBYRANK(self, key, start, stop):
+        with self.lock:
+            zset = self._zset(key)
+            members = self._range(self._ranked(key), start, stop)
+            for member in members:
+                del zset[member]
+            return len(members)
+
+    # Scripts : seul celui de la limitation de débit est connu, exécuté par son
+    # équivalent Python
+
+    def cmd_EVAL(self, script, numkeys, key, *args):
+        if script.decode() != TOKEN_BUCKET_SCRIPT:
+            return Exception("unknown script")
+        capacity, rate, now, cost = (float(arg) for arg in args)
+        with self.lock:
+            tokens, updated = capacity, now
+            if self._alive(key):
+                tokens, updated = (float(part) for part in self.data[key].split(b":"))
+            tokens = refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.data[key] = f"{tokens!r}:{now!r}".encode()
+            ttl = math.ceil((capacity - tokens) / rate) + 1
+            self.expires[key] = time.monotonic() + ttl
+            return [int(allowed), repr(tokens).encode()]
+
+    def cmd_FLUSHALL(self):
+        with self.lock:
+            self.data.clear()
+            self.expires.clear()
+            return "OK"
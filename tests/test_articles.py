@@ -1,15 +1,18 @@
 # tests/test_articles.py
 import json
+import re
 import unittest
-from src.app import app, db
-from src.models import Utilisateur, Categorie, Article
+from datetime import datetime
+from unittest import mock
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import event, func, insert, select
+from src.models import db, include_object, Utilisateur, Categorie, Article, Commentaire
+from testapp import app
 
 
 class ArticlesTestCase(unittest.TestCase):
     def setUp(self):
-        app.config["TESTING"] = True
-        # Base en mémoire pour les tests
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         self.client = app.test_client()
         with app.app_context():
             db.drop_all()
@@ -70,6 +73,55 @@ class ArticlesTestCase(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn("error", data)
 
+    def test_write_statements(self):
+        def queries(response):
+            timing = response.headers["Server-Timing"]
+            return int(re.search(r'desc="(\d+) SQL"', timing).group(1))
+
+        payload = {
+            "titre": "Article Test",
+            "contenu": "Contenu de test",
+            "categorie_id": self.categorie_id,
+            "auteur_id": self.utilisateur_id,
+        }
+        # Vérification des références, INSERT ... RETURNING, deux compteurs
+        response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(queries(response), 4)
+        created = json.loads(response.data)
+        self.assertIsNotNone(created["date_publication"])
+        self.assertEqual(created["nb_commentaires"], 0)
+
+        # Lecture, vérification des références, UPDATE ... RETURNING
+        payload["titre"] = "Article Modifié"
+        response = self.client.put(f"/articles/{created['id']}", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries(response), 3)
+        self.assertIn("Last-Modified", response.headers)
+
+        payload["categorie_id"] = 9999
+        response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(queries(response), 1)
+
+    def test_foreign_key_error_is_a_bad_request(self):
+        # Référence supprimée entre la vérification et l'INSERT
+        payload = {
+            "titre": "Article Test",
+            "contenu": "Contenu de test",
+            "categorie_id": 9999,
+            "auteur_id": self.utilisateur_id,
+        }
+        with mock.patch(
+            "src.routes.articles.references_exist", return_value=(True, True)
+        ):
+            response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 400)
+        with app.app_context():
+            self.assertEqual(
+                db.session.scalar(select(func.count()).select_from(Article)), 0
+            )
+
     def test_get_articles_and_article_by_id(self):
         # Créer un article
         payload = {
@@ -88,7 +140,7 @@ class ArticlesTestCase(unittest.TestCase):
         get_resp = self.client.get("/articles")
         self.assertEqual(get_resp.status_code, 200)
         articles = json.loads(get_resp.data)
-        self.assertGreaterEqual(len(articles), 1)
+        self.assertGreaterEqual(len(articles["items"]), 1)
 
         # Récupérer l'article par son ID
         get_one_resp = self.client.get(f"/articles/{aid}")
@@ -142,11 +194,36 @@ class ArticlesTestCase(unittest.TestCase):
         get_resp = self.client.get(f"/articles/{aid}")
         self.assertEqual(get_resp.status_code, 404)
 
+    def test_delete_article_statements_do_not_grow_with_comments(self):
+        # Les commentaires sont supprimés par la base (ON DELETE CASCADE).
+        counts = []
+        for nb in (10, 10_000):
+            with app.app_context():
+                article = Article(
+                    "Très commenté", "Contenu", self.categorie_id, self.utilisateur_id
+                )
+                db.session.add(article)
+                db.session.flush()
+                row = {
+                    "contenu": "Commentaire",
+                    "article_id": article.id,
+                    "auteur_id": self.utilisateur_id,
+                }
+                db.session.execute(insert(Commentaire), [row] * nb)
+                db.session.commit()
+                aid = article.id
+            response = self.client.delete(f"/articles/{aid}")
+            self.assertEqual(response.status_code, 200)
+            timing = response.headers["Server-Timing"]
+            counts.append(int(re.search(r'desc="(\d+) SQL"', timing).group(1)))
+        self.assertEqual(counts[0], counts[1])
+        with app.app_context():
+            remaining = db.session.scalar(select(func.count()).select_from(Commentaire))
+        self.assertEqual(remaining, 0)
+
 
 class ArticlesExtraTestCase(unittest.TestCase):
     def setUp(self):
-        app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         self.client = app.test_client()
         with app.app_context():
             db.drop_all()
@@ -199,5 +276,492 @@ class ArticlesExtraTestCase(unittest.TestCase):
         self.assertEqual(updated_article["contenu"], "Initial Content")
 
 
+class ArticlesPaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Page User", "page@example.com")
+            categorie = Categorie("Page Catégorie", "Pagination")
+            db.session.add(utilisateur)
+            db.session.add(categorie)
+            db.session.commit()
+            # Plusieurs articles partagent la même date : l'id départage l'ordre.
+            for i in range(7):
+                db.session.add(
+                    Article(f"Article {i}", "Contenu", categorie.id, utilisateur.id)
+                )
+            db.session.commit()
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_walk_all_pages(self):
+        titres = []
+        url = "/articles?limit=3"
+        while True:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(response.data)
+            self.assertLessEqual(len(page["items"]), 3)
+            titres.extend(article["titre"] for article in page["items"])
+            if page["next_cursor"] is None:
+                break
+            url = f"/articles?limit=3&cursor={page['next_cursor']}"
+        # Du plus récent au plus ancien, sans doublon ni omission.
+        self.assertEqual(titres, [f"Article {i}" for i in reversed(range(7))])
+
+    def test_limit_is_capped(self):
+        app.config["PAGINATION_MAX_LIMIT"] = 2
+        try:
+            page = json.loads(self.client.get("/articles?limit=100").data)
+        finally:
+            app.config["PAGINATION_MAX_LIMIT"] = 200
+        self.assertEqual(len(page["items"]), 2)
+        self.assertIsNotNone(page["next_cursor"])
+
+
+class ArticlesNestedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Nested User", "nested@example.com")
+            categorie = Categorie("Nested Catégorie", "Relations")
+            db.session.add(utilisateur)
+            db.session.add(categorie)
+            db.session.commit()
+            article = Article(
+                "Avec commentaires", "Contenu", categorie.id, utilisateur.id
+            )
+            autre = Article(
+                "Sans commentaires", "Contenu", categorie.id, utilisateur.id
+            )
+            db.session.add_all([article, autre])
+            db.session.commit()
+            for i in range(3):
+                db.session.add(
+                    Commentaire(f"Commentaire {i}", article.id, utilisateur.id)
+                )
+            db.session.commit()
+            self.article_id = article.id
+            self.autre_id = autre.id
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def count_queries(self, url):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return response, len(statements)
+
+    def test_get_article_commentaires(self):
+        response = self.client.get(f"/articles/{self.article_id}/commentaires?limit=2")
+        self.assertEqual(response.status_code, 200)
+        page = json.loads(response.data)
+        self.assertEqual(len(page["items"]), 2)
+        self.assertIsNotNone(page["next_cursor"])
+        self.assertTrue(all(c["article_id"] == self.article_id for c in page["items"]))
+
+        vide = json.loads(
+            self.client.get(f"/articles/{self.autre_id}/commentaires").data
+        )
+        self.assertEqual(vide["items"], [])
+
+        response = self.client.get("/articles/9999/commentaires")
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_article_include(self):
+        response, nb_queries = self.count_queries(
+            f"/articles/{self.article_id}?include=commentaires,categorie,utilisateur"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data["commentaires"]), 3)
+        self.assertEqual(data["categorie"]["nom"], "Nested Catégorie")
+        self.assertEqual(data["utilisateur"]["nom"], "Nested User")
+        # Article + catégorie + utilisateur en une jointure, commentaires en un IN.
+        self.assertEqual(nb_queries, 2)
+
+    def test_get_article_include_unknown(self):
+        response = self.client.get(f"/articles/{self.article_id}?include=auteur")
+        self.assertEqual(response.status_code, 400)
+
+
+class ArticlesBulkTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Bulk User", "bulk@example.com")
+            categorie = Categorie("Bulk Catégorie", "Lots")
+            db.session.add(utilisateur)
+            db.session.add(categorie)
+            db.session.commit()
+            self.utilisateur_id = utilisateur.id
+            self.categorie_id = categorie.id
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def send(self, method, payload):
+        return getattr(self.client, method)(
+            "/articles/bulk", data=json.dumps(payload), content_type="application/json"
+        )
+
+    def article(self, titre, **overrides):
+        payload = {
+            "titre": titre,
+            "contenu": "Contenu",
+            "categorie_id": self.categorie_id,
+            "auteur_id": self.utilisateur_id,
+        }
+        payload.update(overrides)
+        return payload
+
+    def test_bulk_create(self):
+        response = self.send("post", [self.article(f"Lot {i}") for i in range(5)])
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(
+            [a["titre"] for a in data["created"]], [f"Lot {i}" for i in range(5)]
+        )
+        self.assertTrue(all(a["date_publication"] for a in data["created"]))
+        self.assertEqual(data["errors"], [])
+
+    def test_bulk_create_reports_errors_per_item(self):
+        payload = [
+            self.article("Valide"),
+            self.article("Catégorie inconnue", categorie_id=9999),
+            {"titre": "Incomplet"},
+            self.article("Auteur inconnu", auteur_id=9999),
+        ]
+        response = self.send("post", payload)
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual([a["titre"] for a in data["created"]], ["Valide"])
+        self.assertEqual([e["index"] for e in data["errors"]], [1, 2, 3])
+
+        response = self.send("post", [self.article("Invalide", auteur_id=9999)])
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update_and_delete(self):
+        created = json.loads(
+            self.send("post", [self.article(f"Lot {i}") for i in range(3)]).data
+        )["created"]
+        ids = [a["id"] for a in created]
+
+        response = self.send(
+            "patch",
+            [{"id": ids[0], "titre": "Modifié"}, {"id": 9999, "titre": "Absent"}],
+        )
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual(data["updated"][0]["titre"], "Modifié")
+        self.assertEqual(data["errors"][0]["index"], 1)
+
+        with app.app_context():
+            db.session.add(Commentaire("À supprimer", ids[1], self.utilisateur_id))
+            db.session.commit()
+        response = self.send("delete", {"ids": ids[:2]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["deleted"], ids[:2])
+        with app.app_context():
+            self.assertEqual(db.session.query(Article).count(), 1)
+            self.assertEqual(db.session.query(Commentaire).count(), 0)
+
+    def test_bulk_update_rejects_empty_values(self):
+        created = json.loads(
+            self.send("post", [self.article(f"Lot {i}") for i in range(3)]).data
+        )["created"]
+        ids = [a["id"] for a in created]
+
+        response = self.send(
+            "patch",
+            [
+                {"id": ids[0], "titre": None},
+                {"id": ids[1], "titre": "Modifié"},
+                {"id": ids[2], "contenu": ""},
+                {"id": ids[2], "categorie_id": None},
+            ],
+        )
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual([a["id"] for a in data["updated"]], [ids[1]])
+        self.assertEqual(
+            data["errors"],
+            [
+                {"index": 0, "error": "Valeur requise pour titre."},
+                {"index": 2, "error": "Valeur requise pour contenu."},
+                {"index": 3, "error": "Valeur requise pour categorie_id."},
+            ],
+        )
+        response = self.send("patch", [{"id": ids[0], "titre": None}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_keys_are_coerced(self):
+        payload = [
+            self.article("Chaîne numérique", categorie_id=str(self.categorie_id)),
+            self.article("Chaîne", categorie_id="abc"),
+            self.article("Booléen", auteur_id=True),
+            self.article("Hors limites", auteur_id=2**40),
+        ]
+        response = self.send("post", payload)
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual(data["created"][0]["categorie_id"], self.categorie_id)
+        self.assertEqual(
+            data["errors"],
+            [
+                {"index": 1, "error": "Catégorie invalide."},
+                {"index": 2, "error": "Utilisateur invalide."},
+                {"index": 3, "error": "Utilisateur invalide."},
+            ],
+        )
+        article_id = data["created"][0]["id"]
+
+        response = self.send(
+            "patch",
+            [{"id": str(article_id), "titre": "Modifié"}, {"id": "x", "titre": "?"}],
+        )
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual(data["updated"][0]["titre"], "Modifié")
+        self.assertEqual(
+            data["errors"], [{"index": 1, "error": "Identifiant invalide."}]
+        )
+
+        response = self.send("delete", {"ids": [False, str(article_id)]})
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual(data["deleted"], [article_id])
+        self.assertEqual(
+            data["errors"], [{"index": 0, "error": "Identifiant invalide."}]
+        )
+
+    def test_bulk_rejects_wrongly_typed_values(self):
+        payload = [
+            self.article("Valide"),
+            self.article({"a": 1}),
+            self.article("Liste", contenu=["Contenu"]),
+            self.article(42),
+        ]
+        response = self.send("post", payload)
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual([a["titre"] for a in data["created"]], ["Valide"])
+        self.assertEqual(
+            data["errors"],
+            [
+                {"index": 1, "error": "Valeur invalide pour titre."},
+                {"index": 2, "error": "Valeur invalide pour contenu."},
+                {"index": 3, "error": "Valeur invalide pour titre."},
+            ],
+        )
+        article_id = data["created"][0]["id"]
+        response = self.send("patch", [{"id": article_id, "titre": {"a": 1}}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.data)["errors"][0]["error"],
+            "Valeur invalide pour titre.",
+        )
+
+    def test_bulk_invalid_body(self):
+        self.assertEqual(self.send("post", {"titre": "pas une liste"}).status_code, 400)
+        self.assertEqual(self.send("delete", [1, 2]).status_code, 400)
+
+
+class ArticlesFilteringTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Filter User", "filter@example.com")
+            autre = Utilisateur("Other User", "other@example.com")
+            tech = Categorie("Tech", "Technique")
+            cuisine = Categorie("Cuisine", "Recettes")
+            db.session.add_all([utilisateur, autre, tech, cuisine])
+            db.session.commit()
+            rows = [
+                ("Ancien", tech.id, utilisateur.id, "2025-06-01 10:00:00"),
+                ("Récent", tech.id, autre.id, "2026-02-01 10:00:00"),
+                ("Recette", cuisine.id, utilisateur.id, "2026-03-01 10:00:00"),
+            ]
+            for titre, categorie_id, auteur_id, date in rows:
+                article = Article(titre, "Très long contenu", categorie_id, auteur_id)
+                article.date_publication = datetime.fromisoformat(date)
+                db.session.add(article)
+            db.session.commit()
+            self.tech_id = tech.id
+            self.utilisateur_id = utilisateur.id
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def titres(self, query):
+        response = self.client.get(f"/articles?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [article["titre"] for article in json.loads(response.data)["items"]]
+
+    def test_filters(self):
+        self.assertEqual(
+            self.titres(f"categorie_id={self.tech_id}"), ["Récent", "Ancien"]
+        )
+        self.assertEqual(
+            self.titres(f"categorie_id={self.tech_id}&auteur_id={self.utilisateur_id}"),
+            ["Ancien"],
+        )
+        self.assertEqual(self.titres("since=2026-01-01"), ["Recette", "Récent"])
+        self.assertEqual(self.titres("since=2026-01-01&until=2026-03-01"), ["Récent"])
+
+    def test_sort_and_pagination(self):
+        self.assertEqual(
+            self.titres("sort=date_publication"), ["Ancien", "Récent", "Recette"]
+        )
+        page = json.loads(self.client.get("/articles?sort=id&limit=2").data)
+        suite = json.loads(
+            self.client.get(
+                f"/articles?sort=id&limit=2&cursor={page['next_cursor']}"
+            ).data
+        )
+        self.assertEqual(
+            [a["titre"] for a in page["items"] + suite["items"]],
+            ["Ancien", "Récent", "Recette"],
+        )
+
+    def test_fields_projection(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = self.client.get("/articles?fields=id,titre&limit=1")
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        item = json.loads(response.data)["items"][0]
+        self.assertEqual(set(item), {"id", "titre"})
+        # Le contenu n'est ni lu en base ni envoyé.
+        self.assertNotIn("contenu", statements[-1])
+
+        full_etag = self.client.get("/articles?limit=1").headers["ETag"]
+        self.assertNotEqual(response.headers["ETag"], full_etag)
+
+    def test_invalid_parameters(self):
+        for query in [
+            "fields=id,inconnu",
+            "sort=titre",
+            "categorie_id=abc",
+            "since=hier",
+        ]:
+            self.assertEqual(self.client.get(f"/articles?{query}").status_code, 400)
+
+
+class ArticlesSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Search User", "search@example.com")
+            categorie = Categorie("Search Catégorie", "Recherche")
+            db.session.add(utilisateur)
+            db.session.add(categorie)
+            db.session.commit()
+            articles = [
+                Article(
+                    "Recette du café", "Moudre le grain.", categorie.id, utilisateur.id
+                ),
+                Article("Voyage", "Un café en terrasse.", categorie.id, utilisateur.id),
+                Article(
+                    "Jardinage", "Tailler les rosiers.", categorie.id, utilisateur.id
+                ),
+            ]
+            db.session.add_all(articles)
+            db.session.commit()
+            self.ids = [a.id for a in articles]
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def search(self, query, **params):
+        response = self.client.get(
+            "/articles/search", query_string={"q": query, **params}
+        )
+        return response, json.loads(response.data)
+
+    def test_ranked_by_relevance(self):
+        response, data = self.search("café")
+        self.assertEqual(response.status_code, 200)
+        # Le titre pèse plus que le contenu.
+        self.assertEqual([a["id"] for a in data["items"]], self.ids[:2])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_accents_and_punctuation_are_ignored(self):
+        _, data = self.search('CAFE "rosiers')
+        self.assertEqual(data["items"], [])
+        _, data = self.search("cafe")
+        self.assertEqual(len(data["items"]), 2)
+
+    def test_pagination(self):
+        _, first = self.search("café", limit=1)
+        self.assertEqual([a["id"] for a in first["items"]], self.ids[:1])
+        _, second = self.search("café", limit=1, cursor=first["next_cursor"])
+        self.assertEqual([a["id"] for a in second["items"]], self.ids[1:2])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.client.put(
+            f"/articles/{self.ids[2]}",
+            data=json.dumps({"titre": "Café au jardin"}),
+            content_type="application/json",
+        )
+        self.client.delete(f"/articles/{self.ids[0]}")
+        _, data = self.search("café")
+        self.assertEqual([a["id"] for a in data["items"]], [self.ids[2], self.ids[1]])
+
+    def test_missing_query(self):
+        self.assertEqual(self.client.get("/articles/search").status_code, 400)
+        self.assertEqual(self.search("  ")[0].status_code, 400)
+        self.assertEqual(self.search("?!")[0].status_code, 400)
+
+    def test_migrations_keep_search_objects(self):
+        with app.app_context(), db.engine.connect() as connection:
+            context = MigrationContext.configure(
+                connection, opts={"include_object": include_object}
+            )
+            diff = compare_metadata(context, db.metadata)
+        removed = [op[1].name for op in diff if op[0] == "remove_table"]
+        self.assertFalse([name for name in removed if name.startswith("articles")])
+
+
 if __name__ == "__main__":
     unittest.main()
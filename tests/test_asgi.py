@@ -0,0 +1,219 @@
+"""
+Tests unitaires du point d'entrée ASGI.
+
+Les mêmes requêtes sont envoyées à l'application WSGI et à l'application ASGI :
+les réponses doivent être identiques à l'octet près.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from flask.testing import FlaskClient
+from sqlalchemy.util import greenlet_spawn
+from src.app import create_app
+from src.config import load_config
+from src.asgi import AsgiApp, offload, wsgi_environ
+from src.models import db, Utilisateur, Categorie, Article
+from src.resp import RedisClient
+from testapp import app
+from asgi_client import AsgiTestClient, call_asgi, run_async
+from redis_standin import RedisStandIn
+
+HAS_AIOSQLITE = importlib.util.find_spec("aiosqlite") is not None
+
+
+class WsgiEnvironTestCase(unittest.TestCase):
+    def test_environ_from_scope(self):
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/articles/é",
+            "query_string": b"limit=2",
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", b"2"),
+                (b"x-trace", b"a"),
+                (b"x-trace", b"b"),
+            ],
+            "server": ("api.example.com", 8000),
+        }
+        environ = wsgi_environ(scope, b"{}")
+        self.assertEqual(environ["REQUEST_METHOD"], "POST")
+        self.assertEqual(environ["PATH_INFO"], "/articles/é".encode().decode("latin-1"))
+        self.assertEqual(environ["QUERY_STRING"], "limit=2")
+        self.assertEqual(environ["CONTENT_TYPE"], "application/json")
+        self.assertEqual(environ["CONTENT_LENGTH"], "2")
+        self.assertEqual(environ["HTTP_X_TRACE"], "a,b")
+        self.assertEqual(environ["SERVER_PORT"], "8000")
+        self.assertEqual(environ["wsgi.input"].read(), b"{}")
+
+    def test_lifespan(self):
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        run_async(AsgiApp(app)({"type": "lifespan"}, receive, send))
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+
+
+class AsgiParityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wsgi = FlaskClient(app)
+        self.asgi = AsgiTestClient(app)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Parité", "parite@example.com")
+            categorie = Categorie("Parité")
+            db.session.add_all([utilisateur, categorie])
+            db.session.flush()
+            for i in range(3):
+                db.session.add(
+                    Article(f"Titre {i}", "Contenu", categorie.id, utilisateur.id)
+                )
+            db.session.commit()
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def assertSameResponse(self, method, url, **kwargs):
+        expected = getattr(self.wsgi, method)(url, **kwargs)
+        actual = getattr(self.asgi, method)(url, **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.data, expected.data)
+        self.assertEqual(actual.headers.get("ETag"), expected.headers.get("ETag"))
+        self.assertEqual(actual.content_type, expected.content_type)
+        return actual
+
+    def test_reads_are_identical(self):
+        for url in (
+            "/articles",
+            "/articles?limit=1&sort=-id",
+            "/articles/1",
+            "/articles/999",
+            "/utilisateurs/1/articles",
+            "/articles/search?q=titre",
+        ):
+            with self.subTest(url=url):
+                self.assertSameResponse("get", url)
+
+    def test_stream_is_identical(self):
+        response = self.assertSameResponse(
+            "get", "/articles", headers={"Accept": "application/x-ndjson"}
+        )
+        self.assertEqual(len(response.data.splitlines()), 3)
+
+    def test_writes_are_identical(self):
+        expected = self.wsgi.post("/categories", json={"nom": "WSGI"})
+        actual = self.asgi.post("/categories", json={"nom": "ASGI"})
+        self.assertEqual(actual.status_code, expected.status_code)
+        # Seuls l'identifiant attribué et le nom diffèrent entre les deux créations.
+        self.assertEqual(
+            {**json.loads(actual.data), "id": None, "nom": None},
+            {**json.loads(expected.data), "id": None, "nom": None},
+        )
+        self.assertSameResponse(
+            "post", "/categories", data="{}", content_type="application/json"
+        )
+
+
+@unittest.skipUnless(HAS_AIOSQLITE, "aiosqlite n'est pas installé")
+class AsyncDriverTestCase(unittest.TestCase):
+    """Requêtes concurrentes sur le pilote asynchrone aiosqlite."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        config = load_config("testing")
+        config.SQLALCHEMY_DATABASE_URI = (
+            f"sqlite+aiosqlite:///{os.path.join(self.tmpdir, 'blog.db')}"
+        )
+        self.app = create_app(config)
+        self.asgi = AsgiApp(self.app)
+        self.in_greenlet(self.populate)
+
+    def tearDown(self):
+        def dispose():
+            db.session.remove()
+            db.engine.dispose()
+
+        self.in_greenlet(dispose)
+        shutil.rmtree(self.tmpdir)
+
+    def in_greenlet(self, fn):
+        with self.app.app_context():
+            return run_async(greenlet_spawn(fn))
+
+    def populate(self):
+        db.create_all()
+        db.session.add_all([Categorie(f"Catégorie {i}") for i in range(5)])
+        db.session.commit()
+
+    def get(self, path):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+        return call_asgi(self.asgi, scope, b"")
+
+    def test_concurrent_requests(self):
+        async def run():
+            return await asyncio.gather(
+                *(self.get(f"/categories/{i}") for i in range(1, 6))
+            )
+
+        results = run_async(run())
+        noms = []
+        for messages in results:
+            self.assertEqual(messages[0]["status"], 200)
+            body = b"".join(m["body"] for m in messages[1:])
+            noms.append(json.loads(body)["nom"])
+        self.assertEqual(noms, [f"Catégorie {i}" for i in range(5)])
+
+
+class OffloadTestCase(unittest.TestCase):
+    """Appels bloquants exécutés hors de la boucle d'évènements."""
+
+    def test_blocking_calls_run_concurrently(self):
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(greenlet_spawn(offload, time.sleep, 0.2) for _ in range(3))
+            )
+            return time.perf_counter() - start
+
+        self.assertLess(run_async(run()), 0.5)
+
+    def test_redis_client(self):
+        standin = RedisStandIn().start()
+        client = RedisClient.from_url(standin.url)
+        try:
+            run_async(greenlet_spawn(client.set, "cle", "valeur"))
+            self.assertEqual(run_async(greenlet_spawn(client.get, "cle")), b"valeur")
+            # La commande s'exécute dans un autre thread que la boucle
+            with mock.patch.object(
+                client, "_execute", side_effect=lambda *args: threading.get_ident()
+            ):
+                thread = run_async(greenlet_spawn(client.get, "cle"))
+            self.assertNotEqual(thread, threading.get_ident())
+        finally:
+            client.close()
+            standin.stop()
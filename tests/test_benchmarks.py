@@ -0,0 +1,96 @@
+"""
+Tests unitaires du générateur de données, du générateur de charge, du budget de
+démarrage et de la mesure de compression.
+"""
+
+import gzip
+import unittest
+from sqlalchemy import create_engine, func, select
+from benchmarks import bench_compression
+from benchmarks.datagen import generate
+from benchmarks.bench_startup import BUDGETS, DEFERRED, SCENARIOS, measure
+from benchmarks.loadgen import ClientTarget, build_report, compare, run
+from src.compression import CODECS
+from src.models import db, Article, Commentaire, Utilisateur
+from testapp import app
+
+
+class DatagenTestCase(unittest.TestCase):
+    def test_volumes_and_counters(self):
+        engine = create_engine("sqlite://")
+        done = {}
+        generate(engine, 20, 3, 50, 200, chunk=32, progress=done.__setitem__)
+        self.assertEqual(
+            done,
+            {"utilisateurs": 20, "categories": 3, "articles": 50, "commentaires": 200},
+        )
+        with engine.connect() as conn:
+            total = conn.scalar(select(func.sum(Article.__table__.c.nb_commentaires)))
+            self.assertEqual(total, 200)
+            total = conn.scalar(select(func.sum(Utilisateur.__table__.c.nb_articles)))
+            self.assertEqual(total, 50)
+        engine.dispose()
+
+
+class LoadgenTestCase(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            db.drop_all()
+            generate(db.engine, 5, 2, 10, 20)
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_run_and_report(self):
+        latencies, errors, elapsed = run(ClientTarget(app), users=1, duration=0.3)
+        report = build_report(latencies, errors, elapsed, {"users": 1})
+        self.assertGreater(report["total"]["requests"], 0)
+        self.assertEqual(report["total"]["errors"], 0)
+        total = report["total"]
+        self.assertLessEqual(total["p50"], total["p95"])
+        self.assertLessEqual(total["p95"], total["p99"])
+        with app.app_context():
+            created = db.session.scalar(select(func.count()).select_from(Commentaire))
+        self.assertEqual(created - 20, len(latencies["création commentaire"]))
+
+    def test_compare(self):
+        baseline = {
+            "total": {"throughput": 100.0, "p95": 10.0},
+            "scenarios": {"liste articles": {"throughput": 50.0, "p95": 5.0}},
+        }
+        report = {
+            "total": {"throughput": 95.0, "p95": 11.0},
+            "scenarios": {"liste articles": {"throughput": 30.0, "p95": 8.0}},
+        }
+        regressions = compare(report, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith("liste articles") for r in regressions))
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_import_does_not_build_the_app(self):
+        modules = measure(SCENARIOS["import src.app"], repeat=1)["modules"]
+        self.assertIn("src.app", modules)
+        self.assertNotIn("src.routes.articles", modules)
+        self.assertFalse(set(DEFERRED) & set(modules))
+
+    def test_create_app_budget(self):
+        name = "create_app()"
+        result = measure(SCENARIOS[name])
+        self.assertIn("src.routes.articles", result["modules"])
+        self.assertFalse(set(DEFERRED) & set(result["modules"]))
+        self.assertLessEqual(result["duration"], BUDGETS[name])
+
+
+class CompressionBenchTestCase(unittest.TestCase):
+    def test_measure(self):
+        data = '{"contenu": "Un contenu répétitif."}\n'.encode() * 500
+        self.assertTrue(set(CODECS) <= set(bench_compression.LEVELS))
+        fast, _ = bench_compression.measure("gzip", 1, data, repeat=1)
+        small, seconds = bench_compression.measure("gzip", 9, data, repeat=2)
+        self.assertLessEqual(small, fast)
+        self.assertLess(fast, len(data) / 10)
+        self.assertGreater(seconds, 0)
+        self.assertEqual(gzip.decompress(CODECS["gzip"].compress(data, 9)), data)
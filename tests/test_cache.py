@@ -0,0 +1,153 @@
+"""
+Tests unitaires du cache des réponses.
+
+Ce fichier teste le LRU en mémoire, le client RESP contre un substitut local de
+Redis et l'invalidation du cache par les routes d'écriture.
+"""
+
+import json
+import time
+import unittest
+from src.cache import LRUCache, RedisCache, cache
+from src.models import db, Utilisateur, Categorie
+from src.resp import RedisClient
+from testapp import app
+from redis_standin import RedisStandIn
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def test_eviction_and_ttl(self):
+        lru = LRUCache(max_entries=2)
+        lru.set("a", b"1", 60)
+        lru.set("b", b"2", 60)
+        lru.get("a")  # "a" devient la plus récente
+        lru.set("c", b"3", 60)
+        self.assertEqual(lru.get("a"), b"1")
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(len(lru), 2)
+
+        lru.set("d", b"4", 0)
+        time.sleep(0.01)
+        self.assertIsNone(lru.get("d"))
+
+    def test_generations(self):
+        lru = LRUCache()
+        self.assertEqual(lru.generation("articles"), 0)
+        lru.bump("articles")
+        self.assertEqual(lru.generation("articles"), 1)
+
+
+class RedisCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.standin = RedisStandIn().start()
+        self.client = RedisClient.from_url(self.standin.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.standin.stop()
+
+    def test_get_set_generation(self):
+        backend = RedisCache(self.client)
+        self.assertIsNone(backend.get("k"))
+        backend.set("k", b'mimetype\n{"a": 1}', 60)
+        self.assertEqual(backend.get("k"), b'mimetype\n{"a": 1}')
+        self.assertEqual(backend.generation("articles"), 0)
+        backend.bump("articles")
+        backend.bump("articles")
+        self.assertEqual(backend.generation("articles"), 2)
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    backend_type = "simple"
+
+    def setUp(self):
+        app.config["CACHE_TYPE"] = self.backend_type
+        self.configure_backend()
+        cache.init_app(app)
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Cache User", "cache@example.com")
+            categorie = Categorie("Cache Catégorie", "Avant")
+            db.session.add(utilisateur)
+            db.session.add(categorie)
+            db.session.commit()
+            self.utilisateur_id = utilisateur.id
+            self.categorie_id = categorie.id
+
+    def configure_backend(self):
+        pass
+
+    def tearDown(self):
+        app.config["CACHE_TYPE"] = "null"
+        cache.init_app(app)
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_hit_then_invalidated_by_update(self):
+        url = f"/categories/{self.categorie_id}"
+        first = self.client.get(url)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        second = self.client.get(url)
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+
+        self.client.put(
+            url,
+            data=json.dumps({"description": "Après"}),
+            content_type="application/json",
+        )
+        third = self.client.get(url)
+        self.assertEqual(third.headers["X-Cache"], "MISS")
+        self.assertEqual(json.loads(third.data)["description"], "Après")
+
+    def test_cached_response_honors_if_none_match(self):
+        url = f"/categories/{self.categorie_id}"
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get("/categories?limit=1")
+        response = self.client.get("/categories?limit=2")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+
+    def test_cascade_delete_invalidates_dependents(self):
+        payload = {
+            "titre": "Article",
+            "contenu": "Contenu",
+            "categorie_id": self.categorie_id,
+            "auteur_id": self.utilisateur_id,
+        }
+        self.client.post(
+            "/articles", data=json.dumps(payload), content_type="application/json"
+        )
+        self.assertEqual(len(json.loads(self.client.get("/articles").data)["items"]), 1)
+        self.client.delete(f"/categories/{self.categorie_id}")
+        response = self.client.get("/articles")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual(json.loads(response.data)["items"], [])
+
+    def test_errors_are_not_cached(self):
+        self.client.get("/categories/9999")
+        response = self.client.get("/categories/9999")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("X-Cache", response.headers)
+
+
+class RedisResponseCacheTestCase(ResponseCacheTestCase):
+    backend_type = "redis"
+
+    def configure_backend(self):
+        self.standin = RedisStandIn().start()
+        app.config["CACHE_REDIS_URL"] = self.standin.url
+
+    def tearDown(self):
+        super().tearDown()
+        self.standin.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
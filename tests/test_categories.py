@@ -6,14 +6,12 @@ Ce fichier teste la création, la récupération, la mise à jour et la suppress
 
 import json
 import unittest
-from src.app import app, db
-from src.models import Categorie
+from src.models import db, Categorie
+from testapp import app
 
 
 class CategoriesTestCase(unittest.TestCase):
     def setUp(self):
-        app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         self.client = app.test_client()
         with app.app_context():
             db.drop_all()
@@ -52,7 +50,8 @@ class CategoriesTestCase(unittest.TestCase):
         response = self.client.get("/categories")
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.data)
-        self.assertEqual(len(data), 2)
+        self.assertEqual(len(data["items"]), 2)
+        self.assertIsNone(data["next_cursor"])
 
     def test_get_category_not_found(self):
         response = self.client.get("/categories/9999")
@@ -89,6 +88,91 @@ class CategoriesTestCase(unittest.TestCase):
         get_resp = self.client.get(f"/categories/{cid}")
         self.assertEqual(get_resp.status_code, 404)
 
+    def test_conditional_get_category(self):
+        payload = {"nom": "Catégorie ETag", "description": "Version 1"}
+        cid = json.loads(
+            self.client.post(
+                "/categories", data=json.dumps(payload), content_type="application/json"
+            ).data
+        )["id"]
+
+        first = self.client.get(f"/categories/{cid}")
+        etag = first.headers["ETag"]
+        self.assertIn("Last-Modified", first.headers)
+
+        cached = self.client.get(f"/categories/{cid}", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b"")
+        since = self.client.get(
+            f"/categories/{cid}",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+        self.assertEqual(since.status_code, 304)
+
+        self.client.put(
+            f"/categories/{cid}",
+            data=json.dumps({"description": "Version 2"}),
+            content_type="application/json",
+        )
+        changed = self.client.get(f"/categories/{cid}", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    def test_conditional_get_categories_page(self):
+        self.client.post(
+            "/categories",
+            data=json.dumps({"nom": "Page"}),
+            content_type="application/json",
+        )
+        etag = self.client.get("/categories").headers["ETag"]
+        response = self.client.get("/categories", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(
+            "/categories",
+            data=json.dumps({"nom": "Nouvelle"}),
+            content_type="application/json",
+        )
+        response = self.client.get("/categories", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_match_on_update_and_delete(self):
+        cid = json.loads(
+            self.client.post(
+                "/categories",
+                data=json.dumps({"nom": "Concurrente"}),
+                content_type="application/json",
+            ).data
+        )["id"]
+        etag = self.client.get(f"/categories/{cid}").headers["ETag"]
+
+        first = self.client.put(
+            f"/categories/{cid}",
+            data=json.dumps({"description": "Premier"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        self.assertEqual(first.status_code, 200)
+        self.assertNotEqual(first.headers["ETag"], etag)
+
+        # Le second client utilise une version périmée.
+        second = self.client.put(
+            f"/categories/{cid}",
+            data=json.dumps({"description": "Second"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        self.assertEqual(second.status_code, 412)
+        stale_delete = self.client.delete(
+            f"/categories/{cid}", headers={"If-Match": etag}
+        )
+        self.assertEqual(stale_delete.status_code, 412)
+
+        delete_resp = self.client.delete(
+            f"/categories/{cid}", headers={"If-Match": first.headers["ETag"]}
+        )
+        self.assertEqual(delete_resp.status_code, 200)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,14 +6,12 @@ Ce fichier teste la création, la récupération, la mise à jour et la suppress
 
 import json
 import unittest
-from src.app import app, db
-from src.models import Utilisateur, Categorie, Article, Commentaire
+from src.models import db, Utilisateur, Categorie, Article, Commentaire
+from testapp import app
 
 
 class CommentairesTestCase(unittest.TestCase):
     def setUp(self):
-        app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         self.client = app.test_client()
         with app.app_context():
             db.drop_all()
@@ -90,7 +88,7 @@ class CommentairesTestCase(unittest.TestCase):
         get_resp = self.client.get("/commentaires")
         self.assertEqual(get_resp.status_code, 200)
         commentaires = json.loads(get_resp.data)
-        self.assertGreaterEqual(len(commentaires), 1)
+        self.assertGreaterEqual(len(commentaires["items"]), 1)
 
         get_one_resp = self.client.get(f"/commentaires/{cid}")
         self.assertEqual(get_one_resp.status_code, 200)
@@ -134,6 +132,30 @@ class CommentairesTestCase(unittest.TestCase):
         get_resp = self.client.get(f"/commentaires/{cid}")
         self.assertEqual(get_resp.status_code, 404)
 
+    def test_stream_commentaires_ndjson(self):
+        for i in range(3):
+            payload = {
+                "contenu": f"Commentaire {i}",
+                "article_id": self.article_id,
+                "auteur_id": self.utilisateur_id,
+            }
+            self.client.post(
+                "/commentaires",
+                data=json.dumps(payload),
+                content_type="application/json",
+            )
+        for url, headers in (
+            ("/commentaires?stream=1", {}),
+            ("/commentaires", {"Accept": "application/x-ndjson"}),
+        ):
+            response = self.client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/x-ndjson")
+            lignes = response.get_data(as_text=True).splitlines()
+            response.close()
+            contenus = [json.loads(ligne)["contenu"] for ligne in lignes]
+            self.assertEqual(contenus, [f"Commentaire {i}" for i in range(3)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests unitaires de la compression des réponses.
+
+Ce fichier teste la négociation d'Accept-Encoding, le seuil de taille, la
+compression morceau par morceau des flux NDJSON, les validateurs des réponses
+compressées et la conservation des corps compressés par le cache.
+"""
+
+import gzip
+import json
+import unittest
+import zlib
+from unittest import mock
+from src.app import create_app
+from src.cache import cache
+from src.compression import CODECS, Codec, GzipStream, compress_stream
+from src.config import load_config
+from src.models import db, Utilisateur, Categorie, Article
+from testapp import app
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Compression", "compression@example.com")
+            categorie = Categorie("Compression", "Catégorie")
+            db.session.add_all([utilisateur, categorie])
+            db.session.flush()
+            for i in range(20):
+                db.session.add(
+                    Article(
+                        f"Article {i}",
+                        "Un contenu répétitif. " * 50,
+                        categorie.id,
+                        utilisateur.id,
+                    )
+                )
+            db.session.commit()
+            self.categorie_id = categorie.id
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_negotiation(self):
+        identity = self.client.get("/articles")
+        self.assertNotIn("Content-Encoding", identity.headers)
+        self.assertEqual(identity.headers["Vary"], "Accept-Encoding")
+
+        response = self.client.get("/articles", headers=GZIP)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertLess(len(response.data), len(identity.data) / 5)
+        self.assertEqual(int(response.headers["Content-Length"]), len(response.data))
+        self.assertEqual(gzip.decompress(response.data), identity.data)
+
+        # Codage inconnu ignoré, gzip refusé explicitement
+        headers = {"Accept-Encoding": "compress, gzip;q=0.5"}
+        response = self.client.get("/articles", headers=headers)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        headers = {"Accept-Encoding": "gzip;q=0, identity"}
+        response = self.client.get("/articles", headers=headers)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_small_body_is_not_compressed(self):
+        response = self.client.get(f"/categories/{self.categorie_id}", headers=GZIP)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(json.loads(response.data)["nom"], "Compression")
+
+    def test_stream(self):
+        identity = self.client.get("/articles?stream=1")
+        response = self.client.get("/articles?stream=1", headers=GZIP)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        lines = gzip.decompress(response.data).splitlines()
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(lines, identity.data.splitlines())
+
+    def test_stream_chunks_are_flushed(self):
+        chunks = [b'{"id": 1}\n' * 100, b'{"id": 2}\n' * 100]
+        pieces = compress_stream(iter(chunks), GzipStream(6))
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        # Chaque morceau est décodable dès sa réception
+        for chunk in chunks:
+            self.assertEqual(decompressor.decompress(next(pieces)), chunk)
+        decompressor.decompress(b"".join(pieces))
+        self.assertTrue(decompressor.eof)
+
+    def test_validators(self):
+        url = "/articles"
+        response = self.client.get(url, headers=GZIP)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(self.client.get(url).headers["ETag"], etag[2:])
+        response = self.client.get(url, headers={**GZIP, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # L'ETag faible d'une réponse compressée reste utilisable avec If-Match
+        url = f"/categories/{self.categorie_id}"
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.put(
+            url,
+            json={"description": "Modifiée"},
+            headers={"If-Match": f"W/{etag}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.put(
+            url, json={"description": "Refusée"}, headers={"If-Match": f"W/{etag}"}
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_cached_bodies_are_compressed_once(self):
+        app.config["CACHE_TYPE"] = "simple"
+        cache.init_app(app)
+        gzip_codec = CODECS["gzip"]
+        compress = mock.Mock(side_effect=gzip_codec.compress)
+        try:
+            with mock.patch.dict(
+                CODECS, {"gzip": Codec(compress, gzip_codec.stream, gzip_codec.level)}
+            ):
+                first = self.client.get("/articles", headers=GZIP)
+                second = self.client.get("/articles", headers=GZIP)
+                identity = self.client.get("/articles")
+        finally:
+            app.config["CACHE_TYPE"] = "null"
+            cache.init_app(app)
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.headers["Content-Encoding"], "gzip")
+        self.assertEqual(second.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(second.data, first.data)
+        # Un corps par codage
+        self.assertEqual(identity.headers["X-Cache"], "MISS")
+        self.assertNotIn("Content-Encoding", identity.headers)
+        self.assertEqual(gzip.decompress(second.data), identity.data)
+
+
+class ConfigurationTestCase(unittest.TestCase):
+    def test_disabled_and_unknown(self):
+        config = load_config("testing")
+        config.COMPRESS_ALGORITHMS = []
+        self.assertEqual(create_app(config).extensions["compression"], {})
+        config.COMPRESS_ALGORITHMS = ["gzip", "lzma"]
+        with self.assertRaises(ValueError):
+            create_app(config)
+
+    def test_levels(self):
+        config = load_config("testing")
+        config.COMPRESS_LEVELS = {"gzip": "9"}
+        offers = create_app(config).extensions["compression"]
+        self.assertEqual(offers["gzip"], 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests unitaires des compteurs dénormalisés.
+
+Ce fichier vérifie que nb_commentaires et nb_articles suivent les créations,
+modifications et suppressions (y compris en cascade et par lots), et que la
+commande de réconciliation corrige une dérive.
+"""
+
+import json
+import unittest
+from sqlalchemy import update
+from src.models import db, Utilisateur, Categorie, Article
+from testapp import app
+
+
+class CountersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            auteur = Utilisateur("Auteur", "auteur@example.com")
+            lecteur = Utilisateur("Lecteur", "lecteur@example.com")
+            tech = Categorie("Tech", "Technique")
+            cuisine = Categorie("Cuisine", "Recettes")
+            db.session.add_all([auteur, lecteur, tech, cuisine])
+            db.session.commit()
+            self.auteur_id = auteur.id
+            self.lecteur_id = lecteur.id
+            self.tech_id = tech.id
+            self.cuisine_id = cuisine.id
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def post(self, url, payload):
+        response = self.client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+        return json.loads(response.data)
+
+    def create_article(self, auteur_id, categorie_id):
+        return self.post(
+            "/articles",
+            {
+                "titre": "Titre",
+                "contenu": "Contenu",
+                "categorie_id": categorie_id,
+                "auteur_id": auteur_id,
+            },
+        )["id"]
+
+    def comment(self, article_id, auteur_id):
+        return self.post(
+            "/commentaires",
+            {"contenu": "Bravo", "article_id": article_id, "auteur_id": auteur_id},
+        )["id"]
+
+    def get(self, url):
+        return json.loads(self.client.get(url).data)
+
+    def test_create_and_delete(self):
+        article_id = self.create_article(self.auteur_id, self.tech_id)
+        etag = self.client.get(f"/articles/{article_id}").headers["ETag"]
+        commentaire_id = self.comment(article_id, self.lecteur_id)
+        self.comment(article_id, self.lecteur_id)
+
+        response = self.client.get(f"/articles/{article_id}")
+        self.assertEqual(json.loads(response.data)["nb_commentaires"], 2)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 1)
+        self.assertEqual(self.get(f"/utilisateurs/{self.auteur_id}")["nb_articles"], 1)
+
+        self.client.delete(f"/commentaires/{commentaire_id}")
+        self.assertEqual(self.get(f"/articles/{article_id}")["nb_commentaires"], 1)
+        self.client.delete(f"/articles/{article_id}")
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 0)
+        self.assertEqual(self.get(f"/utilisateurs/{self.auteur_id}")["nb_articles"], 0)
+
+    def test_counts_do_not_break_if_match(self):
+        article_id = self.create_article(self.auteur_id, self.tech_id)
+        url = f"/articles/{article_id}"
+        etag = self.client.get(url).headers["ETag"]
+        self.comment(article_id, self.lecteur_id)
+
+        # La représentation a changé, mais pas la version modifiée par le client
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["nb_commentaires"], 1)
+        response = self.client.put(
+            url,
+            data=json.dumps({"titre": "Modifié"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.put(
+            url,
+            data=json.dumps({"titre": "Refusé"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_update_moves_counts(self):
+        article_id = self.create_article(self.auteur_id, self.tech_id)
+        self.client.put(
+            f"/articles/{article_id}",
+            data=json.dumps({"categorie_id": self.cuisine_id}),
+            content_type="application/json",
+        )
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 0)
+        self.assertEqual(self.get(f"/categories/{self.cuisine_id}")["nb_articles"], 1)
+
+    def test_cascade_delete(self):
+        article_auteur = self.create_article(self.auteur_id, self.tech_id)
+        article_lecteur = self.create_article(self.lecteur_id, self.tech_id)
+        self.comment(article_auteur, self.lecteur_id)
+        self.comment(article_auteur, self.auteur_id)
+
+        # Le lecteur, ses articles et ses commentaires disparaissent.
+        self.client.delete(f"/utilisateurs/{self.lecteur_id}")
+        self.assertEqual(
+            self.client.get(f"/articles/{article_lecteur}").status_code, 404
+        )
+        self.assertEqual(self.get(f"/articles/{article_auteur}")["nb_commentaires"], 1)
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 1)
+
+        self.client.delete(f"/categories/{self.tech_id}")
+        self.assertEqual(self.get(f"/utilisateurs/{self.auteur_id}")["nb_articles"], 0)
+
+    def test_bulk(self):
+        created = self.post(
+            "/articles/bulk",
+            [
+                {
+                    "titre": f"Lot {i}",
+                    "contenu": "Contenu",
+                    "categorie_id": self.tech_id,
+                    "auteur_id": self.auteur_id,
+                }
+                for i in range(3)
+            ],
+        )["created"]
+        ids = [article["id"] for article in created]
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 3)
+
+        self.client.patch(
+            "/articles/bulk",
+            data=json.dumps([{"id": ids[0], "categorie_id": self.cuisine_id}]),
+            content_type="application/json",
+        )
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 2)
+        self.assertEqual(self.get(f"/categories/{self.cuisine_id}")["nb_articles"], 1)
+
+        self.client.delete(
+            "/articles/bulk",
+            data=json.dumps({"ids": ids[1:]}),
+            content_type="application/json",
+        )
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 0)
+        self.assertEqual(self.get(f"/utilisateurs/{self.auteur_id}")["nb_articles"], 1)
+
+    def test_reconcile_counters(self):
+        article_id = self.create_article(self.auteur_id, self.tech_id)
+        self.comment(article_id, self.lecteur_id)
+        with app.app_context():
+            db.session.execute(update(Article).values(nb_commentaires=42))
+            db.session.execute(update(Categorie).values(nb_articles=0))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["blog", "reconcile-counters"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(
+            "articles.nb_commentaires : 1 ligne(s) corrigée(s)", result.output
+        )
+        self.assertIn(
+            "utilisateurs.nb_articles : 0 ligne(s) corrigée(s)", result.output
+        )
+        self.assertEqual(self.get(f"/articles/{article_id}")["nb_commentaires"], 1)
+        self.assertEqual(self.get(f"/categories/{self.tech_id}")["nb_articles"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
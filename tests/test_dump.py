@@ -0,0 +1,174 @@
+"""
+Tests unitaires de l'import et de l'export hors ligne (flask blog export/import).
+
+Ce fichier teste l'aller-retour CSV et NDJSON des quatre tables, l'ordre des clés
+étrangères, l'annulation d'un import en conflit et la conversion à la volée
+utilisée par COPY.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import func, select
+from src import counters
+from src.dump import TABLE_NAMES, CsvStream, csv_line
+from src.models import db, Utilisateur, Categorie, Article, Commentaire
+from testapp import app
+
+MODELS = [Utilisateur, Categorie, Article, Commentaire]
+
+
+class DumpTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.runner = app.test_cli_runner()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            auteur = Utilisateur("Auteur", "auteur@example.com")
+            lecteur = Utilisateur(
+                'Lecteur "guillemets", virgule', "lecteur@example.com"
+            )
+            categorie = Categorie("Import", "Ligne 1\nLigne 2")
+            vide = Categorie("Sans description", None)
+            db.session.add_all([auteur, lecteur, categorie, vide])
+            db.session.flush()
+            for i in range(5):
+                article = Article(f"Article {i}", "Contenu é", categorie.id, auteur.id)
+                article.date_publication = datetime(2026, 1, i + 1, 12, 30)
+                db.session.add(article)
+                db.session.flush()
+                db.session.add(Commentaire(f"Lu {i}", article.id, lecteur.id))
+            counters.reconcile()
+            db.session.commit()
+            self.snapshot = self.rows()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def rows(self) -> dict:
+        """Contenu des quatre tables, par identifiant."""
+        return {
+            model.__tablename__: [
+                tuple(row)
+                for row in db.session.execute(
+                    select(*model.__table__.columns).order_by(model.id)
+                )
+            ]
+            for model in MODELS
+        }
+
+    def invoke(self, *args):
+        return self.runner.invoke(args=["blog", *args])
+
+    def reset(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.create_all()
+
+    def roundtrip(self, fmt: str):
+        result = self.invoke("export", self.tmpdir, "--format", fmt, "--chunk", "2")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("articles : 5 ligne(s) exportée(s)", result.output)
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir)), sorted(f"{t}.{fmt}" for t in TABLE_NAMES)
+        )
+        self.reset()
+        result = self.invoke("import", self.tmpdir, "--format", fmt, "--chunk", "2")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("commentaires : 5 ligne(s) importée(s)", result.output)
+        with app.app_context():
+            self.assertEqual(self.rows(), self.snapshot)
+
+        # Les identifiants suivants restent libres
+        response = app.test_client().post("/categories", json={"nom": "Après"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)["id"], 3)
+
+    def test_csv_roundtrip(self):
+        self.roundtrip("csv")
+        with open(os.path.join(self.tmpdir, "categories.csv"), newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:3], ["id", "nom", "description"])
+        self.assertEqual(rows[1][2], "Ligne 1\nLigne 2")
+
+    def test_ndjson_roundtrip(self):
+        self.roundtrip("ndjson")
+        with open(os.path.join(self.tmpdir, "articles.ndjson")) as f:
+            first = json.loads(f.readline())
+        self.assertEqual(first["titre"], "Article 0")
+        self.assertTrue(first["date_publication"].startswith("2026-01-01"))
+
+    def test_foreign_key_order(self):
+        self.invoke("export", self.tmpdir)
+        self.reset()
+        # Tables demandées dans le désordre : importées parents d'abord
+        result = self.invoke(
+            "import",
+            self.tmpdir,
+            "--table",
+            "commentaires",
+            "--table",
+            "articles",
+            "--table",
+            "categories",
+            "--table",
+            "utilisateurs",
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        order = [line.split(" ")[0] for line in result.output.splitlines()]
+        self.assertEqual(order, TABLE_NAMES)
+
+    def test_conflict_rolls_back(self):
+        self.invoke("export", self.tmpdir)
+        with app.app_context():
+            db.session.execute(Commentaire.__table__.delete())
+            db.session.commit()
+        # Utilisateurs déjà présents : rien n'est importé
+        result = self.invoke("import", self.tmpdir)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Import annulé", result.output)
+        with app.app_context():
+            count = db.session.scalar(select(func.count()).select_from(Commentaire))
+            self.assertEqual(count, 0)
+
+    def test_partial_export(self):
+        result = self.invoke("export", self.tmpdir, "--table", "categories")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(os.listdir(self.tmpdir), ["categories.csv"])
+        result = self.invoke("export", self.tmpdir, "--table", "tags")
+        self.assertEqual(result.exit_code, 2)
+
+
+class CsvStreamTestCase(unittest.TestCase):
+    def test_reads_rows_in_pieces(self):
+        rows = [[1, "a,b", None], [2, 'dit "oui"', "é\nè"], [3, "", 4.5]]
+        stream = CsvStream(iter(rows))
+        pieces = []
+        while True:
+            piece = stream.read(5)
+            if not piece:
+                break
+            self.assertLessEqual(len(piece), 5)
+            pieces.append(piece)
+        data = "".join(pieces)
+        self.assertEqual(data, "".join(csv_line(row) for row in rows))
+        self.assertEqual(
+            list(csv.reader(io.StringIO(data, newline=""))),
+            [["1", "a,b", ""], ["2", 'dit "oui"', "é\nè"], ["3", "", "4.5"]],
+        )
+        # NULL sans guillemets, texte vide entre guillemets (COPY ... FORMAT csv)
+        self.assertEqual(csv_line([None, ""]), ',""\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
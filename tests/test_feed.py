@@ -0,0 +1,164 @@
+"""
+Tests unitaires du fil des derniers articles par catégorie.
+
+Ce fichier teste le chargement paresseux du fil, sa mise à jour par les routes
+d'un article sans lecture en base, et le même comportement sur le backend Redis
+(substitut local).
+"""
+
+import json
+import re
+import unittest
+from datetime import datetime, timedelta
+from src.feed import feed
+from src.models import db, Utilisateur, Categorie, Article
+from testapp import app
+from redis_standin import RedisStandIn
+
+
+class FeedTestCase(unittest.TestCase):
+    backend_type = "memory"
+
+    def setUp(self):
+        app.config["FEED_TYPE"] = self.backend_type
+        app.config["FEED_SIZE"] = 3
+        self.configure_backend()
+        feed.init_app(app)
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Fil", "fil@example.com")
+            premiere = Categorie("Première")
+            seconde = Categorie("Seconde")
+            db.session.add_all([utilisateur, premiere, seconde])
+            db.session.flush()
+            start = datetime(2026, 1, 1)
+            for i in range(4):
+                article = Article(
+                    f"Article {i}", "Contenu", premiere.id, utilisateur.id
+                )
+                article.date_publication = start + timedelta(days=i)
+                db.session.add(article)
+            db.session.commit()
+            self.utilisateur_id = utilisateur.id
+            self.premiere_id = premiere.id
+            self.seconde_id = seconde.id
+
+    def configure_backend(self):
+        pass
+
+    def tearDown(self):
+        app.config["FEED_TYPE"] = "memory"
+        app.config["FEED_SIZE"] = 20
+        feed.init_app(app)
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        queries = re.search(r'desc="(\d+) SQL"', response.headers["Server-Timing"])
+        return json.loads(response.data), int(queries.group(1))
+
+    def titles(self, categorie_id) -> list:
+        data, _ = self.get(f"/categories/{categorie_id}/feed")
+        return [item["titre"] for item in data["items"]]
+
+    def create(self, titre, categorie_id):
+        payload = {
+            "titre": titre,
+            "contenu": "Contenu",
+            "categorie_id": categorie_id,
+            "auteur_id": self.utilisateur_id,
+        }
+        response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 201)
+        return json.loads(response.data)["id"]
+
+    def test_lazy_load_then_no_queries(self):
+        data, queries = self.get(f"/categories/{self.premiere_id}/feed")
+        self.assertGreater(queries, 0)
+        self.assertEqual(
+            [item["titre"] for item in data["items"]],
+            ["Article 3", "Article 2", "Article 1"],
+        )
+        self.assertEqual(
+            set(data["items"][0]),
+            {"id", "titre", "date_publication", "categorie_id", "auteur_id"},
+        )
+        _, queries = self.get(f"/categories/{self.premiere_id}/feed")
+        self.assertEqual(queries, 0)
+
+    def test_all_categories(self):
+        data, _ = self.get("/feed")
+        self.assertEqual(
+            [(c["nom"], len(c["articles"])) for c in data["categories"]],
+            [("Première", 3), ("Seconde", 0)],
+        )
+        _, queries = self.get("/feed")
+        self.assertEqual(queries, 0)
+
+    def test_unknown_category(self):
+        response = self.client.get("/categories/9999/feed")
+        self.assertEqual(response.status_code, 404)
+
+    def test_create_update_delete_are_applied(self):
+        self.titles(self.premiere_id)
+        self.titles(self.seconde_id)
+
+        article_id = self.create("Nouveau", self.premiere_id)
+        self.assertEqual(
+            self.titles(self.premiere_id), ["Nouveau", "Article 3", "Article 2"]
+        )
+
+        self.client.put(f"/articles/{article_id}", json={"titre": "Renommé"})
+        self.assertEqual(
+            self.titles(self.premiere_id), ["Renommé", "Article 3", "Article 2"]
+        )
+
+        self.client.put(
+            f"/articles/{article_id}", json={"categorie_id": self.seconde_id}
+        )
+        self.assertEqual(self.titles(self.seconde_id), ["Renommé"])
+        # Le fil plein a perdu un article : il est relu en base.
+        self.assertEqual(
+            self.titles(self.premiere_id), ["Article 3", "Article 2", "Article 1"]
+        )
+
+        self.client.delete(f"/articles/{article_id}")
+        data, queries = self.get(f"/categories/{self.seconde_id}/feed")
+        self.assertEqual((data["items"], queries), ([], 0))
+
+    def test_bulk_write_resets_feed(self):
+        self.titles(self.premiere_id)
+        self.client.delete(f"/categories/{self.premiere_id}")
+        response = self.client.get(f"/categories/{self.premiere_id}/feed")
+        self.assertEqual(response.status_code, 404)
+
+        self.titles(self.seconde_id)
+        payload = {
+            "titre": "En masse",
+            "contenu": "Contenu",
+            "categorie_id": self.seconde_id,
+            "auteur_id": self.utilisateur_id,
+        }
+        self.client.post("/articles/bulk", json=[payload])
+        self.assertEqual(self.titles(self.seconde_id), ["En masse"])
+
+
+class RedisFeedTestCase(FeedTestCase):
+    backend_type = "redis"
+
+    def configure_backend(self):
+        self.standin = RedisStandIn().start()
+        app.config["FEED_REDIS_URL"] = self.standin.url
+
+    def tearDown(self):
+        super().tearDown()
+        self.standin.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
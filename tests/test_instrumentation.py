@@ -0,0 +1,84 @@
+"""
+Tests unitaires des mesures par requête (Server-Timing, histogrammes, seuil N+1).
+"""
+
+import re
+import unittest
+import warnings
+from src.instrumentation import (
+    REQUEST_LATENCY,
+    REQUEST_QUERIES,
+    TooManyQueriesWarning,
+)
+from src.models import db, Utilisateur, Categorie, Article, Commentaire
+from testapp import app
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Mesure", "mesure@example.com")
+            categorie = Categorie("Mesure")
+            db.session.add_all([utilisateur, categorie])
+            db.session.flush()
+            article = Article("Titre", "Contenu", categorie.id, utilisateur.id)
+            db.session.add(article)
+            db.session.flush()
+            for i in range(3):
+                db.session.add(Commentaire(f"Com {i}", article.id, utilisateur.id))
+            db.session.commit()
+            self.article_id = article.id
+
+    def tearDown(self):
+        app.config["QUERY_COUNT_WARNING"] = 0
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def query_count(self, response) -> int:
+        match = re.search(
+            r'db;dur=[\d.]+;desc="(\d+) SQL"', response.headers["Server-Timing"]
+        )
+        self.assertIsNotNone(match, response.headers["Server-Timing"])
+        return int(match.group(1))
+
+    def test_server_timing_header(self):
+        response = self.client.get(f"/articles/{self.article_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.query_count(response), 1)
+        self.assertRegex(response.headers["Server-Timing"], r"app;dur=[\d.]+$")
+
+    def test_histograms_by_endpoint(self):
+        labels = {"endpoint": "categories.get_categories"}
+        latency = REQUEST_LATENCY.count(method="GET", status=200, **labels)
+        queries = REQUEST_QUERIES.count(**labels)
+        self.client.get("/categories")
+        self.assertEqual(
+            REQUEST_LATENCY.count(method="GET", status=200, **labels), latency + 1
+        )
+        self.assertEqual(REQUEST_QUERIES.count(**labels), queries + 1)
+        body = self.client.get("/metrics").get_data(as_text=True)
+        self.assertIn(
+            'http_request_duration_seconds_count{endpoint="categories.get_categories"',
+            body,
+        )
+
+    def test_includes_do_not_query_per_row(self):
+        # Commentaires en une requête IN, catégorie et auteur par jointure.
+        app.config["QUERY_COUNT_WARNING"] = 2
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", TooManyQueriesWarning)
+            response = self.client.get(
+                f"/articles/{self.article_id}"
+                "?include=commentaires,categorie,utilisateur"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.query_count(response), 2)
+
+    def test_warning_above_threshold(self):
+        app.config["QUERY_COUNT_WARNING"] = 1
+        with self.assertWarns(TooManyQueriesWarning), self.assertLogs(app.logger):
+            self.client.get(f"/articles/{self.article_id}?include=commentaires")
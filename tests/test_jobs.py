@@ -0,0 +1,284 @@
+"""
+Tests unitaires des suppressions différées et des tâches de fond.
+
+Ce fichier teste le marquage immédiat (202, ressource masquée), la purge par lots
+avec mise à jour des compteurs, l'état des tâches, l'exécution par le thread
+de l'application et les commandes lancées avec un pilote asynchrone.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from sqlalchemy import func, select
+from src import counters
+from src.app import create_app
+from src.cache import cache
+from src.config import load_config
+from src.jobs import jobs, run_pending
+from src.models import db, run_sync, Utilisateur, Categorie, Article, Commentaire
+from src.models import Rafraichissement, Tache
+from testapp import app
+
+ASYNC = {"Prefer": "respond-async"}
+
+
+class JobsTestCase(unittest.TestCase):
+    def setUp(self):
+        app.config["JOBS_WORKER"] = "external"
+        app.config["JOBS_BATCH_SIZE"] = 2
+        jobs.init_app(app)
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            auteur = Utilisateur("Prolifique", "prolifique@example.com")
+            lecteur = Utilisateur("Lecteur", "lecteur@example.com")
+            categorie = Categorie("Tâches")
+            db.session.add_all([auteur, lecteur, categorie])
+            db.session.flush()
+            for i in range(5):
+                article = Article(f"Article {i}", "Contenu", categorie.id, auteur.id)
+                db.session.add(article)
+                db.session.flush()
+                db.session.add(Commentaire("Lu", article.id, lecteur.id))
+            counters.reconcile()
+            db.session.commit()
+            self.auteur_id = auteur.id
+            self.lecteur_id = lecteur.id
+            self.categorie_id = categorie.id
+
+    def tearDown(self):
+        app.config["JOBS_WORKER"] = "thread"
+        app.config["JOBS_BATCH_SIZE"] = 1000
+        jobs.init_app(app)
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def count(self, model) -> int:
+        with app.app_context():
+            return db.session.scalar(select(func.count()).select_from(model))
+
+    def test_soft_delete_then_purge(self):
+        response = self.client.delete(f"/utilisateurs/{self.auteur_id}", headers=ASYNC)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.headers["Preference-Applied"], "respond-async")
+        job = json.loads(response.data)
+        self.assertEqual(job["statut"], "en_attente")
+        self.assertEqual(response.headers["Location"], f"/jobs/{job['id']}")
+
+        # Masqué aussitôt, purgé plus tard
+        response = self.client.get(f"/utilisateurs/{self.auteur_id}")
+        self.assertEqual(response.status_code, 404)
+        items = json.loads(self.client.get("/utilisateurs").data)["items"]
+        self.assertEqual([item["id"] for item in items], [self.lecteur_id])
+        payload = {
+            "titre": "Trop tard",
+            "contenu": "Contenu",
+            "categorie_id": self.categorie_id,
+            "auteur_id": self.auteur_id,
+        }
+        response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.count(Article), 5)
+
+        with app.app_context():
+            self.assertEqual(run_pending(), [job["id"]])
+        self.assertEqual(self.count(Article), 0)
+        self.assertEqual(self.count(Commentaire), 0)
+        self.assertEqual(self.count(Utilisateur), 1)
+
+        job = json.loads(self.client.get(f"/jobs/{job['id']}").data)
+        self.assertEqual(job["statut"], "terminee")
+        self.assertEqual(job["lignes"], 5)
+        self.assertIsNotNone(job["date_fin"])
+        categorie = json.loads(self.client.get(f"/categories/{self.categorie_id}").data)
+        self.assertEqual(categorie["nb_articles"], 0)
+
+    def test_category_purge_keeps_counters(self):
+        response = self.client.delete(f"/categories/{self.categorie_id}", headers=ASYNC)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            self.client.get(f"/categories/{self.categorie_id}/feed").status_code, 404
+        )
+        with app.app_context():
+            run_pending()
+            self.assertEqual(db.session.get(Utilisateur, self.auteur_id).nb_articles, 0)
+        self.assertEqual(self.count(Categorie), 0)
+        self.assertEqual(self.count(Commentaire), 0)
+
+    def items(self, url: str) -> list:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data)["items"]
+
+    def test_marked_parents_hide_dependants(self):
+        app.config["CACHE_TYPE"] = "simple"
+        cache.init_app(app)
+        try:
+            articles = self.items("/articles")
+            self.assertEqual(len(articles), 5)
+            self.assertEqual(len(self.items("/commentaires")), 5)
+            article_id = articles[0]["id"]
+
+            response = self.client.delete(
+                f"/categories/{self.categorie_id}", headers=ASYNC
+            )
+            self.assertEqual(response.status_code, 202)
+            # Caches des listes dépendantes invalidés dès le marquage
+            self.assertEqual(self.items("/articles"), [])
+            self.assertEqual(self.items("/commentaires"), [])
+            self.assertEqual(self.items(f"/utilisateurs/{self.auteur_id}/articles"), [])
+            self.assertEqual(self.items("/articles/search?q=Contenu"), [])
+            for url in (
+                f"/articles/{article_id}",
+                f"/articles/{article_id}/commentaires",
+            ):
+                self.assertEqual(self.client.get(url).status_code, 404)
+            payload = {
+                "contenu": "Trop tard",
+                "article_id": article_id,
+                "auteur_id": self.lecteur_id,
+            }
+            self.assertEqual(
+                self.client.post("/commentaires", json=payload).status_code, 400
+            )
+            response = self.client.post("/commentaires/bulk", json=[payload])
+            self.assertEqual(json.loads(response.data)["errors"][0]["index"], 0)
+        finally:
+            app.config["CACHE_TYPE"] = "null"
+            cache.init_app(app)
+
+    def test_marked_author_hides_comments(self):
+        response = self.client.delete(f"/utilisateurs/{self.lecteur_id}", headers=ASYNC)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.items("/commentaires"), [])
+        article_id = self.items("/articles")[0]["id"]
+        response = self.client.get(f"/articles/{article_id}?include=commentaires")
+        self.assertEqual(json.loads(response.data)["commentaires"], [])
+
+    def test_job_not_found(self):
+        self.assertEqual(self.client.get("/jobs/9999").status_code, 404)
+
+    def test_synchronous_delete_is_unchanged(self):
+        response = self.client.delete(f"/utilisateurs/{self.auteur_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.count(Article), 0)
+
+    def test_thread_worker(self):
+        app.config["JOBS_WORKER"] = "thread"
+        jobs.init_app(app)
+        response = self.client.delete(f"/utilisateurs/{self.auteur_id}", headers=ASYNC)
+        app.extensions["jobs"].join()
+        job = json.loads(self.client.get(response.headers["Location"]).data)
+        self.assertEqual(job["statut"], "terminee")
+        self.assertEqual(self.count(Article), 0)
+
+    def test_thread_worker_refreshes_stats(self):
+        app.config["JOBS_WORKER"] = "thread"
+        jobs.init_app(app)
+        # Première lecture : calcul initial en arrière-plan
+        self.assertEqual(self.client.get("/stats/categories").status_code, 200)
+        app.extensions["jobs"].join()
+        app.config["STATS_REFRESH_WRITES"] = 1
+        try:
+            payload = {
+                "titre": "Nouveau",
+                "contenu": "Contenu",
+                "categorie_id": self.categorie_id,
+                "auteur_id": self.lecteur_id,
+            }
+            self.assertEqual(
+                self.client.post("/articles", json=payload).status_code, 201
+            )
+        finally:
+            app.config["STATS_REFRESH_WRITES"] = 0
+        app.extensions["jobs"].join()
+        with app.app_context():
+            statuts = db.session.scalars(
+                select(Tache.statut).where(Tache.operation == "rafraichissement")
+            ).all()
+        self.assertEqual(statuts, ["terminee", "terminee"])
+        items = json.loads(self.client.get("/stats/categories").data)["items"]
+        self.assertEqual(items[0]["nb_articles"], 6)
+
+
+class AsyncDriverCommandsTestCase(unittest.TestCase):
+    """Commandes lancées hors de toute boucle d'évènements, avec aiosqlite."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        config = load_config("testing")
+        path = os.path.join(self.tmpdir, "blog.db")
+        config.SQLALCHEMY_DATABASE_URI = f"sqlite+aiosqlite:///{path}"
+        config.JOBS_WORKER = "external"
+        self.app = create_app(config)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def outside_greenlet(self, fn):
+        """Exécute fn dans un thread, comme une commande lancée en console."""
+        outcome = {}
+
+        def target():
+            try:
+                outcome["value"] = fn()
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
+    def populate(self):
+        db.create_all()
+        utilisateur = Utilisateur("Supprimé", "supprime@example.com")
+        utilisateur.date_suppression = datetime(2026, 1, 1)
+        db.session.add(utilisateur)
+        db.session.flush()
+        tache = Tache(
+            operation="suppression", cible="utilisateurs", cible_id=utilisateur.id
+        )
+        tache.statut = "en_cours"
+        db.session.add(tache)
+        db.session.commit()
+
+    def state(self):
+        count = db.session.scalar(select(func.count()).select_from(Utilisateur))
+        statuts = db.session.scalars(select(Tache.statut)).all()
+        refreshed = db.session.scalars(
+            select(Rafraichissement.date_rafraichissement)
+        ).all()
+        return count, statuts, refreshed
+
+    def test_commands(self):
+        runner = self.app.test_cli_runner()
+
+        def scenario():
+            with self.app.app_context():
+                run_sync(self.populate)
+            ran = runner.invoke(args=["blog", "run-jobs", "--resume"])
+            stats = runner.invoke(args=["blog", "refresh-stats"])
+            with self.app.app_context():
+                return ran, stats, run_sync(self.state)
+
+        ran, stats, (count, statuts, refreshed) = self.outside_greenlet(scenario)
+        self.assertEqual(ran.exit_code, 0, ran.output)
+        self.assertIn("1 tâche(s) exécutée(s)", ran.output)
+        self.assertEqual(stats.exit_code, 0, stats.output)
+        self.assertEqual(count, 0)
+        self.assertEqual(statuts, ["terminee"])
+        self.assertTrue(refreshed)
+        self.assertTrue(all(date is not None for date in refreshed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Tests unitaires de la limitation de débit et du contrôle d'admission.
+
+Ce fichier teste les quotas, les seaux à jetons (en mémoire et sur le substitut
+de Redis), les réponses 429 par client et par blueprint, et les refus 503 en cas
+d'attente du pool ou de trop de requêtes en cours.
+"""
+
+import json
+import unittest
+from unittest import mock
+from src.admission import REQUESTS_SHED, admission
+from src.app import create_app
+from src.config import load_config
+from src.models import db
+from src.ratelimit import MemoryBuckets, RedisBuckets, parse_quota
+from src.resp import RedisClient
+from testapp import app
+from redis_standin import RedisStandIn
+
+
+class QuotaTestCase(unittest.TestCase):
+    def test_parse_quota(self):
+        self.assertEqual(parse_quota("120/minute"), (120, 2.0))
+        self.assertEqual(parse_quota("5/Second"), (5, 5.0))
+        for quota in ("beaucoup", "10/semaine", "0/minute", "-1/hour"):
+            with self.assertRaises(ValueError):
+                parse_quota(quota)
+
+
+class MemoryBucketsTestCase(unittest.TestCase):
+    def test_refill(self):
+        buckets = MemoryBuckets()
+        with mock.patch("src.ratelimit.time.monotonic", return_value=100.0):
+            self.assertEqual(buckets.take("a", 2, 1.0), (True, 1))
+            self.assertEqual(buckets.take("a", 2, 1.0), (True, 0))
+            self.assertEqual(buckets.take("a", 2, 1.0), (False, 0))
+            # Chaque client a son seau
+            self.assertTrue(buckets.take("b", 2, 1.0)[0])
+        with mock.patch("src.ratelimit.time.monotonic", return_value=100.5):
+            self.assertEqual(buckets.take("a", 2, 1.0), (False, 0.5))
+        with mock.patch("src.ratelimit.time.monotonic", return_value=160.0):
+            # Jamais plus que la capacité
+            self.assertEqual(buckets.take("a", 2, 1.0), (True, 1))
+
+    def test_max_keys(self):
+        buckets = MemoryBuckets(max_keys=2)
+        for key in ("a", "b", "a", "c"):
+            buckets.take(key, 1, 1.0)
+        self.assertEqual(len(buckets), 2)
+        # "b", le moins récent, a été oublié : son seau repart plein
+        self.assertTrue(buckets.take("b", 1, 0.001)[0])
+        self.assertFalse(buckets.take("c", 1, 0.001)[0])
+
+
+class RedisBucketsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.standin = RedisStandIn().start()
+        self.client = RedisClient.from_url(self.standin.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.standin.stop()
+
+    def test_shared_bucket(self):
+        first = RedisBuckets(self.client)
+        second = RedisBuckets(RedisClient.from_url(self.standin.url))
+        self.assertEqual(first.take("ip:1:default", 2, 0.001)[0], True)
+        self.assertEqual(second.take("ip:1:default", 2, 0.001)[0], True)
+        allowed, tokens = first.take("ip:1:default", 2, 0.001)
+        self.assertFalse(allowed)
+        self.assertLess(tokens, 1)
+        self.assertIn(b"blog:ratelimit:ip:1:default", self.standin.data)
+        second.client.close()
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def setUp(self):
+        config = load_config("testing")
+        config.RATELIMIT_TYPE = "memory"
+        config.RATELIMIT_DEFAULT = "3/minute"
+        config.RATELIMIT_QUOTAS = {"categories:write": "1/minute"}
+        config.RATELIMIT_KEY_HEADER = "X-API-Key"
+        self.app = create_app(config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def test_too_many_requests(self):
+        for remaining in (2, 1, 0):
+            response = self.client.get("/categories")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["RateLimit-Limit"], "3")
+            self.assertEqual(response.headers["RateLimit-Remaining"], str(remaining))
+        response = self.client.get("/utilisateurs")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("error", json.loads(response.data))
+        self.assertEqual(response.headers["Retry-After"], "20")
+
+        # Autre client, autre seau ; les métriques ne sont jamais limitées
+        other = {"X-API-Key": "cle-partenaire"}
+        self.assertEqual(self.client.get("/categories", headers=other).status_code, 200)
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    def test_write_quota(self):
+        response = self.client.post("/categories", json={"nom": "Une"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers["RateLimit-Limit"], "1")
+        response = self.client.post("/categories", json={"nom": "Deux"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "60")
+        # Les lectures ont leur propre seau
+        self.assertEqual(self.client.get("/categories").status_code, 200)
+
+    def test_unavailable_backend_lets_requests_through(self):
+        backend = self.app.extensions["rate_limiter"][0]
+        with mock.patch.object(backend, "take", side_effect=ConnectionError):
+            for _ in range(5):
+                self.assertEqual(self.client.get("/categories").status_code, 200)
+
+    def test_trusted_proxies(self):
+        def get(forwarded):
+            headers = {"X-Forwarded-For": forwarded}
+            return self.client.get("/categories", headers=headers).status_code
+
+        # Sans proxy de confiance, X-Forwarded-For est ignoré
+        self.assertEqual([get(f"10.0.0.{i}") for i in range(4)], [200, 200, 200, 429])
+
+        config = load_config("testing")
+        config.RATELIMIT_TYPE = "memory"
+        config.RATELIMIT_DEFAULT = "1/minute"
+        config.RATELIMIT_TRUSTED_PROXIES = 1
+        proxied = create_app(config)
+        self.client = proxied.test_client()
+        with proxied.app_context():
+            db.create_all()
+            try:
+                self.assertEqual([get("10.0.0.1"), get("10.0.0.2")], [200, 200])
+                self.assertEqual(get("10.0.0.1"), 429)
+                # Seule la dernière adresse, ajoutée par le proxy, est retenue
+                self.assertEqual(get("1.2.3.4, 10.0.0.2"), 429)
+            finally:
+                db.session.remove()
+                db.engine.dispose()
+
+    def test_invalid_configuration(self):
+        config = load_config("testing")
+        config.RATELIMIT_TYPE = "memory"
+        config.RATELIMIT_QUOTAS = {"articles": "vite"}
+        with self.assertRaises(ValueError):
+            create_app(config)
+
+
+class AdmissionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def tearDown(self):
+        app.config["ADMISSION_MAX_CONCURRENCY"] = 0
+        app.config["ADMISSION_MAX_POOL_WAIT"] = 0.5
+
+    def shed(self, reason: str) -> int:
+        return dict(
+            (labels["reason"], value) for _, labels, value in REQUESTS_SHED.samples()
+        ).get(reason, 0)
+
+    def test_pool_wait(self):
+        shed = self.shed("attente_pool")
+        with mock.patch.object(admission, "pool_wait", return_value=0.8):
+            response = self.client.get("/categories")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["Retry-After"], "1")
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+            app.config["ADMISSION_MAX_POOL_WAIT"] = 1.0
+            self.assertEqual(self.client.get("/inconnue").status_code, 404)
+        self.assertEqual(self.shed("attente_pool"), shed + 1)
+
+    def test_max_concurrency(self):
+        app.config["ADMISSION_MAX_CONCURRENCY"] = 1
+        in_flight = app.extensions["admission"]
+        # Une requête déjà en cours
+        self.assertTrue(in_flight.acquire(0))
+        try:
+            response = self.client.get("/inconnue")
+            self.assertEqual(response.status_code, 503)
+        finally:
+            in_flight.release()
+        self.assertEqual(self.client.get("/inconnue").status_code, 404)
+        # Les requêtes terminées, même en erreur, libèrent leur place
+        self.assertEqual(in_flight.count, 0)
+        body = self.client.get("/metrics").get_data(as_text=True)
+        self.assertIn("http_requests_in_flight 0", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests unitaires du routage des lectures vers les réplicas.
+
+Deux fichiers SQLite jouent la base principale et le réplica : chacun reçoit
+des données différentes, ce qui permet de savoir quelle base a servi la lecture.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.app import create_app
+from src.cache import cache
+from src.config import load_config
+from src.models import db, Categorie
+from src.replicas import REPLICA_NAME_PREFIX
+
+
+class ReplicaAppMixin:
+    replica_names = []
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        config = load_config("testing")
+        config.SQLALCHEMY_DATABASE_URI = (
+            f"sqlite:///{os.path.join(self.tmpdir, 'primary.db')}"
+        )
+        config.SQLALCHEMY_REPLICAS = {
+            f"{REPLICA_NAME_PREFIX}{i}": {
+                "url": f"sqlite:///{os.path.join(self.tmpdir, name)}"
+            }
+            for i, name in enumerate(self.replica_names)
+        }
+        self.app = create_app(config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            db.session.add(Categorie("Principale"))
+            db.session.commit()
+            for i, name in enumerate(self.replica_names):
+                if name.startswith("absent/"):
+                    continue
+                engine = self.app.extensions["read_replicas"].engines[f"replica_{i}"]
+                db.metadata.create_all(engine)
+                with engine.begin() as connection:
+                    connection.execute(
+                        Categorie.__table__.insert(), {"nom": f"Réplique {i}"}
+                    )
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in self.app.extensions["read_replicas"].engines.values():
+                engine.dispose()
+            db.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def noms(self, client=None):
+        response = (client or self.client).get("/categories")
+        self.assertEqual(response.status_code, 200)
+        return [c["nom"] for c in json.loads(response.data)["items"]]
+
+
+class ReplicasTestCase(ReplicaAppMixin, unittest.TestCase):
+    replica_names = ["replica_a.db"]
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.noms(), ["Réplique 0"])
+
+    def test_read_your_writes(self):
+        response = self.client.post(
+            "/categories",
+            data=json.dumps({"nom": "Nouvelle"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("db_primary_until", response.headers["Set-Cookie"])
+        # Le même client lit sur la principale, un autre sur le réplica.
+        self.assertEqual(self.noms(), ["Principale", "Nouvelle"])
+        self.assertEqual(self.noms(self.app.test_client()), ["Réplique 0"])
+
+    def test_cache_does_not_hide_own_writes(self):
+        self.app.config["CACHE_TYPE"] = "simple"
+        cache.init_app(self.app)
+        self.client.post("/categories", json={"nom": "Nouvelle"})
+        other = self.app.test_client()
+        response = other.get("/categories")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual(other.get("/categories").headers["X-Cache"], "HIT")
+
+        # Le client qui a écrit lit la principale, sans l'entrée du réplica
+        response = self.client.get("/categories")
+        self.assertNotIn("X-Cache", response.headers)
+        names = [c["nom"] for c in json.loads(response.data)["items"]]
+        self.assertEqual(names, ["Principale", "Nouvelle"])
+
+
+class RoundRobinTestCase(ReplicaAppMixin, unittest.TestCase):
+    replica_names = ["replica_a.db", "replica_b.db"]
+
+    def test_round_robin(self):
+        self.assertEqual(
+            [self.noms()[0] for _ in range(4)],
+            ["Réplique 0", "Réplique 1", "Réplique 0", "Réplique 1"],
+        )
+
+
+class FallbackTestCase(ReplicaAppMixin, unittest.TestCase):
+    # Répertoire inexistant : le réplica est injoignable.
+    replica_names = ["absent/replica.db"]
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        self.assertEqual(self.noms(), ["Principale"])
+        with self.app.app_context():
+            replica_set = self.app.extensions["read_replicas"]
+            self.assertIn("replica_0", replica_set.down_until)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests unitaires de l'encodage JSON et de la sérialisation des listes par colonnes.
+"""
+
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+from sqlalchemy import select
+from src.models import db, Utilisateur, Categorie, Article, Commentaire
+from testapp import app
+
+
+class FastJSONProviderTestCase(unittest.TestCase):
+    payload = {
+        "titre": "Été",
+        "date": datetime(2026, 3, 1, 12, 30, 5, tzinfo=timezone.utc),
+        "naive": datetime(2026, 3, 1, 12, 30, 5, 250000),
+        "a": 1,
+    }
+    expected = {
+        "titre": "Été",
+        "date": "2026-03-01T12:30:05+00:00",
+        "naive": "2026-03-01T12:30:05.250000",
+        "a": 1,
+    }
+
+    def check(self):
+        with app.app_context():
+            raw = app.json.dumpb(self.payload)
+            self.assertIn("Été".encode(), raw)
+            self.assertEqual(json.loads(raw), self.expected)
+            self.assertEqual(list(json.loads(raw)), sorted(self.expected))
+            self.assertEqual(
+                app.json.loads(app.json.dumps(self.payload)), self.expected
+            )
+            response = app.json.response(self.payload)
+            self.assertEqual(response.mimetype, "application/json")
+            self.assertTrue(response.get_data().endswith(b"}\n"))
+
+    def test_orjson(self):
+        self.check()
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(app.json, "use_orjson", False):
+            self.check()
+
+
+class ColumnSerializationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            utilisateur = Utilisateur("Sérialisation", "serial@example.com")
+            categorie = Categorie("Sérialisation", "Catégorie « test »")
+            db.session.add_all([utilisateur, categorie])
+            db.session.flush()
+            for i in range(3):
+                article = Article(
+                    f"Titre {i}", "Contenu é", categorie.id, utilisateur.id
+                )
+                article.date_publication = datetime(2026, 1, i + 1, 8, 0)
+                db.session.add(article)
+                db.session.flush()
+                db.session.add(
+                    Commentaire(f"Commentaire {i}", article.id, utilisateur.id)
+                )
+            db.session.commit()
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def entities(self, model, order):
+        with app.app_context():
+            objs = db.session.scalars(select(model).order_by(*order))
+            return [obj.to_dict() for obj in objs]
+
+    def test_lists_match_to_dict(self):
+        cases = [
+            (
+                "/articles",
+                Article,
+                [Article.date_publication.desc(), Article.id.desc()],
+            ),
+            (
+                "/commentaires",
+                Commentaire,
+                [Commentaire.date_commentaire.desc(), Commentaire.id.desc()],
+            ),
+            ("/utilisateurs", Utilisateur, [Utilisateur.id]),
+            ("/categories", Categorie, [Categorie.id]),
+        ]
+        for url, model, order in cases:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                items = json.loads(response.data)["items"]
+                self.assertEqual(items, self.entities(model, order))
+
+    def test_stream_matches_to_dict(self):
+        response = self.client.get("/articles?stream=1")
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(lines, self.entities(Article, [Article.id]))
+
+    def test_invalid_json_body(self):
+        response = self.client.post(
+            "/categories", data="{nom:", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
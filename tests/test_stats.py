@@ -0,0 +1,235 @@
+"""
+Tests unitaires des statistiques agrégées.
+
+Ce fichier teste le contenu des vues (par catégorie, par utilisateur et par mois),
+la fraîcheur renvoyée, le calcul différé après un nombre d'écritures ou au-delà
+de l'âge maximal, et la commande de rafraîchissement.
+"""
+
+import json
+import re
+import unittest
+from datetime import datetime
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import delete, func, select, update
+from src import counters
+from src.jobs import jobs, run_pending
+from src.stats import refresh
+from src.models import db, Utilisateur, Categorie, Article, Commentaire, Tache
+from src.models import include_object, Rafraichissement
+from testapp import app
+
+
+class StatsTestCase(unittest.TestCase):
+    def setUp(self):
+        app.config["JOBS_WORKER"] = "external"
+        jobs.init_app(app)
+        self.client = app.test_client()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            auteur = Utilisateur("Auteur", "auteur@example.com")
+            lecteur = Utilisateur("Lecteur", "lecteur@example.com")
+            sport = Categorie("Sport")
+            cuisine = Categorie("Cuisine")
+            vide = Categorie("Vide")
+            db.session.add_all([auteur, lecteur, sport, cuisine, vide])
+            db.session.flush()
+            dates = [datetime(2026, 1, 5), datetime(2026, 1, 20), datetime(2026, 3, 2)]
+            for i, date in enumerate(dates):
+                article = Article(f"Article {i}", "Contenu", sport.id, auteur.id)
+                article.date_publication = date
+                db.session.add(article)
+                db.session.flush()
+                commentaire = Commentaire("Lu", article.id, lecteur.id)
+                commentaire.date_commentaire = date
+                db.session.add(commentaire)
+            article = Article("Recette", "Contenu", cuisine.id, lecteur.id)
+            article.date_publication = datetime(2026, 2, 1)
+            db.session.add(article)
+            counters.reconcile()
+            db.session.commit()
+            refresh()
+            self.auteur_id = auteur.id
+            self.lecteur_id = lecteur.id
+            self.sport_id = sport.id
+            self.cuisine_id = cuisine.id
+
+    def tearDown(self):
+        app.config["JOBS_WORKER"] = "thread"
+        app.config["STATS_REFRESH_WRITES"] = 0
+        app.config["STATS_MAX_AGE"] = 300
+        jobs.init_app(app)
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        queries = re.search(r'desc="(\d+) SQL"', response.headers["Server-Timing"])
+        return json.loads(response.data), int(queries.group(1))
+
+    def create_article(self):
+        payload = {
+            "titre": "Nouveau",
+            "contenu": "Contenu",
+            "categorie_id": self.cuisine_id,
+            "auteur_id": self.auteur_id,
+        }
+        response = self.client.post("/articles", json=payload)
+        self.assertEqual(response.status_code, 201)
+
+    def categories(self) -> dict:
+        data, _ = self.get("/stats/categories")
+        return {item["nom"]: item for item in data["items"]}
+
+    def test_categories(self):
+        data, _ = self.get("/stats/categories")
+        self.assertIsNotNone(data["fraicheur"]["date_rafraichissement"])
+        self.assertFalse(data["fraicheur"]["perimee"])
+        items = {item["nom"]: item for item in data["items"]}
+        self.assertEqual(
+            {nom: (i["nb_articles"], i["nb_commentaires"]) for nom, i in items.items()},
+            {"Sport": (3, 3), "Cuisine": (1, 0), "Vide": (0, 0)},
+        )
+        self.assertTrue(items["Sport"]["derniere_publication"].startswith("2026-03-02"))
+        self.assertIsNone(items["Vide"]["derniere_publication"])
+
+        # Une fois calculées, les statistiques sont lues sans recalcul
+        _, queries = self.get("/stats/categories")
+        self.assertEqual(queries, 2)
+
+    def test_utilisateur(self):
+        data, queries = self.get(f"/stats/utilisateurs/{self.auteur_id}")
+        self.assertEqual(data["nb_articles"], 3)
+        self.assertEqual(data["nb_commentaires_recus"], 3)
+        self.assertEqual(
+            data["activite"],
+            [
+                {"mois": "2026-01", "nb_articles": 2, "nb_commentaires": 0},
+                {"mois": "2026-03", "nb_articles": 1, "nb_commentaires": 0},
+            ],
+        )
+        data, queries = self.get(f"/stats/utilisateurs/{self.lecteur_id}")
+        self.assertEqual(queries, 3)
+        self.assertEqual(data["nb_commentaires_recus"], 0)
+        self.assertEqual(
+            [
+                (m["mois"], m["nb_articles"], m["nb_commentaires"])
+                for m in data["activite"]
+            ],
+            [("2026-01", 0, 2), ("2026-02", 1, 0), ("2026-03", 0, 1)],
+        )
+
+    def test_first_read_schedules_refresh(self):
+        with app.app_context():
+            db.session.execute(delete(Rafraichissement))
+            db.session.commit()
+        for _ in range(2):
+            data, _ = self.get("/stats/categories")
+            self.assertEqual(data["items"], [])
+            self.assertFalse(data["fraicheur"]["calculee"])
+        data, _ = self.get(f"/stats/utilisateurs/{self.auteur_id}")
+        self.assertIsNone(data["nb_articles"])
+        self.assertEqual(data["activite"], [])
+        self.assertEqual(self.client.get("/stats/utilisateurs/9999").status_code, 404)
+        with app.app_context():
+            pending = db.session.scalar(
+                select(func.count()).where(Tache.operation == "rafraichissement")
+            )
+            self.assertEqual(pending, 1)
+            run_pending()
+        data, _ = self.get("/stats/categories")
+        self.assertTrue(data["fraicheur"]["calculee"])
+        self.assertEqual(self.categories()["Sport"]["nb_articles"], 3)
+
+    def test_marked_rows_are_not_counted(self):
+        # Auteur en attente de suppression : ses articles et commentaires sont
+        # masqués par les routes, et écartés des statistiques
+        with app.app_context():
+            db.session.execute(
+                update(Utilisateur)
+                .where(Utilisateur.id == self.lecteur_id)
+                .values(date_suppression=func.now())
+            )
+            db.session.commit()
+            refresh()
+        self.assertEqual(self.categories()["Cuisine"]["nb_articles"], 0)
+        data, _ = self.get(f"/stats/utilisateurs/{self.auteur_id}")
+        self.assertEqual(data["nb_articles"], 3)
+        self.assertEqual(
+            data["activite"],
+            [
+                {"mois": "2026-01", "nb_articles": 2, "nb_commentaires": 0},
+                {"mois": "2026-03", "nb_articles": 1, "nb_commentaires": 0},
+            ],
+        )
+
+    def test_unknown_user(self):
+        response = self.client.get("/stats/utilisateurs/9999")
+        self.assertEqual(response.status_code, 404)
+
+    def test_refreshed_after_writes(self):
+        app.config["STATS_REFRESH_WRITES"] = 2
+        self.assertEqual(self.categories()["Cuisine"]["nb_articles"], 1)
+
+        # Valeurs en place jusqu'au calcul suivant
+        self.create_article()
+        self.assertEqual(self.categories()["Cuisine"]["nb_articles"], 1)
+        self.create_article()
+        with app.app_context():
+            taches = db.session.scalars(
+                select(Tache).where(Tache.operation == "rafraichissement")
+            ).all()
+            self.assertEqual([t.statut for t in taches], ["en_attente"])
+            run_pending()
+        self.assertEqual(self.categories()["Cuisine"]["nb_articles"], 3)
+        job = json.loads(self.client.get(f"/jobs/{taches[0].id}").data)
+        self.assertEqual(job["statut"], "terminee")
+
+    def test_stale_read_schedules_refresh(self):
+        app.config["STATS_MAX_AGE"] = 60
+        self.categories()
+        self.create_article()
+        with app.app_context():
+            db.session.execute(
+                update(Rafraichissement).values(
+                    date_rafraichissement=datetime(2026, 1, 1)
+                )
+            )
+            db.session.commit()
+        data, _ = self.get("/stats/categories")
+        self.assertTrue(data["fraicheur"]["perimee"])
+        self.get("/stats/categories")
+        with app.app_context():
+            pending = db.session.scalar(
+                select(func.count()).where(Tache.operation == "rafraichissement")
+            )
+            self.assertEqual(pending, 1)
+            run_pending()
+        data, _ = self.get("/stats/categories")
+        self.assertFalse(data["fraicheur"]["perimee"])
+        cuisine = [i for i in data["items"] if i["nom"] == "Cuisine"][0]
+        self.assertEqual(cuisine["nb_articles"], 2)
+
+    def test_migrations_keep_stats_objects(self):
+        with app.app_context(), db.engine.connect() as connection:
+            context = MigrationContext.configure(
+                connection, opts={"include_object": include_object}
+            )
+            diff = compare_metadata(context, db.metadata)
+        removed = [op[1].name for op in diff if op[0] == "remove_table"]
+        self.assertFalse([name for name in removed if name.startswith("stats_")])
+
+    def test_refresh_command(self):
+        self.categories()
+        self.create_article()
+        result = app.test_cli_runner().invoke(args=["blog", "refresh-stats"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.categories()["Cuisine"]["nb_articles"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,14 +6,12 @@ Ce fichier teste la création, la récupération, la mise à jour et la suppress
 
 import json
 import unittest
-from src.app import app, db
-from src.models import Utilisateur
+from src.models import db, Utilisateur
+from testapp import app
 
 
 class UtilisateursTestCase(unittest.TestCase):
     def setUp(self):
-        app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         self.client = app.test_client()
         with app.app_context():
             db.drop_all()
@@ -56,7 +54,8 @@ class UtilisateursTestCase(unittest.TestCase):
         response = self.client.get("/utilisateurs")
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.data)
-        self.assertEqual(len(data), 2)
+        self.assertEqual(len(data["items"]), 2)
+        self.assertIsNone(data["next_cursor"])
 
     def test_get_utilisateur_not_found(self):
         response = self.client.get("/utilisateurs/9999")
@@ -93,6 +92,100 @@ class UtilisateursTestCase(unittest.TestCase):
         get_resp = self.client.get(f"/utilisateurs/{uid}")
         self.assertEqual(get_resp.status_code, 404)
 
+    def test_get_utilisateurs_pagination(self):
+        for i in range(5):
+            user = {"nom": f"User{i}", "email": f"page{i}@example.com"}
+            self.client.post(
+                "/utilisateurs", data=json.dumps(user), content_type="application/json"
+            )
+        first = json.loads(self.client.get("/utilisateurs?limit=2").data)
+        self.assertEqual([u["nom"] for u in first["items"]], ["User0", "User1"])
+        self.assertIsNotNone(first["next_cursor"])
+
+        second = json.loads(
+            self.client.get(f"/utilisateurs?limit=2&cursor={first['next_cursor']}").data
+        )
+        self.assertEqual([u["nom"] for u in second["items"]], ["User2", "User3"])
+
+        last = json.loads(
+            self.client.get(
+                f"/utilisateurs?limit=2&cursor={second['next_cursor']}"
+            ).data
+        )
+        self.assertEqual([u["nom"] for u in last["items"]], ["User4"])
+        self.assertIsNone(last["next_cursor"])
+
+    def test_get_utilisateurs_invalid_pagination(self):
+        response = self.client.get("/utilisateurs?cursor=pas-un-curseur")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/utilisateurs?limit=0")
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_utilisateur_articles(self):
+        auteur = json.loads(
+            self.client.post(
+                "/utilisateurs",
+                data=json.dumps({"nom": "Auteur", "email": "auteur@example.com"}),
+                content_type="application/json",
+            ).data
+        )
+        autre = json.loads(
+            self.client.post(
+                "/utilisateurs",
+                data=json.dumps({"nom": "Autre", "email": "autre@example.com"}),
+                content_type="application/json",
+            ).data
+        )
+        categorie = json.loads(
+            self.client.post(
+                "/categories",
+                data=json.dumps({"nom": "Catégorie"}),
+                content_type="application/json",
+            ).data
+        )
+        for auteur_id in (auteur["id"], auteur["id"], autre["id"]):
+            payload = {
+                "titre": "Titre",
+                "contenu": "Contenu",
+                "categorie_id": categorie["id"],
+                "auteur_id": auteur_id,
+            }
+            self.client.post(
+                "/articles", data=json.dumps(payload), content_type="application/json"
+            )
+
+        response = self.client.get(f"/utilisateurs/{auteur['id']}/articles")
+        self.assertEqual(response.status_code, 200)
+        page = json.loads(response.data)
+        self.assertEqual(len(page["items"]), 2)
+        self.assertTrue(all(a["auteur_id"] == auteur["id"] for a in page["items"]))
+
+        response = self.client.get("/utilisateurs/9999/articles")
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_create_utilisateurs_unique_email(self):
+        self.client.post(
+            "/utilisateurs",
+            data=json.dumps({"nom": "Existant", "email": "pris@example.com"}),
+            content_type="application/json",
+        )
+        payload = [
+            {"nom": "Nouveau", "email": "nouveau@example.com"},
+            {"nom": "Doublon base", "email": "pris@example.com"},
+            {"nom": "Doublon lot", "email": "nouveau@example.com"},
+            {"nom": "Nombre", "email": 42},
+        ]
+        response = self.client.post(
+            "/utilisateurs/bulk",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual([u["nom"] for u in data["created"]], ["Nouveau"])
+        self.assertEqual([e["index"] for e in data["errors"]], [1, 2, 3])
+        self.assertEqual(data["errors"][2]["error"], "Valeur invalide pour email.")
+
 
 if __name__ == "__main__":
     unittest.main()
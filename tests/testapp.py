@@ -0,0 +1,8 @@
+"""
+Application partagée par les tests, construite avec la configuration ``testing``
+(base SQLite en mémoire, ou TEST_DATABASE_URL ; voir src/config.py).
+"""
+
+from src.app import create_app
+
+app = create_app("testing")